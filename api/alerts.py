@@ -1,30 +1,43 @@
 """
 Module for inventory alerts.
 
-Provides functions to search for expired inventory items and items with low quantities.
+Provides functions to search for expired inventory items and items with low quantities,
+across all locations or for one station or vehicle.
 """
 
 from utils.decorators import roles_required
 import logging
 import utils.db_connection as db_connection
+from utils.db_rows import InventoryItem
 
 logger = logging.getLogger(__name__)
 
 
 @roles_required(["Admin", "Leadership", "General Responder"])
-def search_for_expiration(self):
-    """Searches for inventory items whose expiration date has passed.
+def search_for_expiration(self, location_id=None):
+    """Searches for stock lots whose expiration date has passed.
+
+    Reads a range of the lot expiration index, so only expired lots are visited.
+    For one location, its items are read through the location indexes and only
+    their expired lots are looked up.
+
+    Args:
+        location_id (int, optional): Only search the items of this location.
 
     Returns:
-        list: A list of tuples containing item name, quantity, and expiration date.
-              Returns an empty list if no expired items are found or an error occurs.
+        list: InventoryItem rows with item name, the quantity of the expired lot,
+              and its expiration date; an item with several expired lots appears
+              once per lot. Returns an empty list if no expired items are found or
+              an error occurs.
     """
 
     try:
+        location_filter = " AND i.location_id = %s" if location_id is not None else ""
         expired_inventory = db_connection.execute_query(
-            "SELECT item_name, quantity, expiration_date FROM inventory WHERE expiration_date IS NOT NULL AND expiration_date < CURDATE() ORDER BY expiration_date ASC",
-            None,
+            f"SELECT i.item_name, l.quantity, l.expiration_date FROM inventory_lots l JOIN inventory i ON i.item_id = l.item_id WHERE l.expiration_date < CURDATE(){location_filter} ORDER BY l.expiration_date ASC",
+            [location_id] if location_id is not None else None,
             False,
+            row_class=InventoryItem,
         )
 
         return expired_inventory if expired_inventory is not None else []
@@ -35,19 +48,27 @@ def search_for_expiration(self):
 
 
 @roles_required(["Admin", "Leadership", "General Responder"])
-def search_for_low_quantity(self):
+def search_for_low_quantity(self, location_id=None):
     """Searches for inventory items with quantity below their minimum threshold.
 
+    Reads the low_stock index, which holds only the items below their threshold,
+    so the search visits the low items and not the whole inventory.
+
+    Args:
+        location_id (int, optional): Only search the items of this location.
+
     Returns:
-        list: A list of tuples containing item name, current quantity, and minimum threshold.
+        list: InventoryItem rows with item name, current quantity, and minimum threshold.
               Returns an empty list if no such items are found or an error occurs.
     """
 
     try:
+        location_filter = " AND location_id = %s" if location_id is not None else ""
         low_inventory = db_connection.execute_query(
-            "SELECT item_name, quantity, min_threshold FROM inventory WHERE min_threshold IS NOT NULL AND quantity < min_threshold ORDER BY quantity ASC",
-            None,
+            f"SELECT item_name, quantity, min_threshold FROM inventory WHERE low_stock = 1{location_filter} ORDER BY quantity ASC",
+            [location_id] if location_id is not None else None,
             False,
+            row_class=InventoryItem,
         )
 
         return low_inventory if low_inventory is not None else []
@@ -55,3 +76,8 @@ def search_for_low_quantity(self):
         logger.error(f"Low inventory search error: {e}")
 
         return []
+
+
+# Asyncio counterparts; each runs the blocking function on the database thread pool.
+search_for_expiration_async = db_connection.to_async(search_for_expiration)
+search_for_low_quantity_async = db_connection.to_async(search_for_low_quantity)
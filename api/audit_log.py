@@ -15,10 +15,13 @@ import utils.db_connection as db_connection
 import logging
 import utils.validators as validators
 from utils.decorators import roles_required
+from utils.db_rows import AuditEntry
 from mysql.connector import Error as MySQLError
 
 logger = logging.getLogger(__name__)
 
+ACTION_TYPES = {"ADD", "UPDATE", "DELETE", "LOGIN", "LOGOUT", "ACCESS"}
+
 
 def update_audit_log(current_user, updated_object, action_type, details):
     """Updates the audit log with a new entry.
@@ -34,7 +37,7 @@ def update_audit_log(current_user, updated_object, action_type, details):
         Exception: If a database error occurs.
     """
 
-    if action_type not in {"ADD", "UPDATE", "DELETE", "LOGIN", "LOGOUT", "ACCESS"}:
+    if action_type not in ACTION_TYPES:
         raise TypeError(
             "Action type must be ADD, UPDATE, DELETE, LOGIN, LOGOUT, or ACCESS"
         )
@@ -52,6 +55,52 @@ def update_audit_log(current_user, updated_object, action_type, details):
         raise
 
 
+def update_audit_log_for_items(current_user, action_type, details_by_item):
+    """Adds audit log entries for inventory items identified by ID.
+
+    The item names are read inside the same INSERT ... SELECT statement, so
+    auditing costs one round trip however many items are involved. Items that do
+    not exist get no entry, which callers use to detect missing items.
+
+    Args:
+        current_user (CurrentUser): The user performing the action.
+        action_type (str): The type of action (ADD, UPDATE, DELETE, ...).
+        details_by_item (dict): Maps each item ID to the details of its entry.
+
+    Returns:
+        int: The number of entries added.
+
+    Raises:
+        TypeError: If action_type is not among the allowed types.
+        Exception: If a database error occurs.
+    """
+
+    if action_type not in ACTION_TYPES:
+        raise TypeError(
+            "Action type must be ADD, UPDATE, DELETE, LOGIN, LOGOUT, or ACCESS"
+        )
+
+    if not details_by_item:
+        return 0
+
+    item_ids = list(details_by_item)
+    case = " ".join(["WHEN %s THEN %s"] * len(item_ids))
+    case_params = [
+        value for item_id in item_ids for value in (item_id, details_by_item[item_id])
+    ]
+
+    try:
+        return db_connection.execute_query(
+            f"INSERT INTO audit_log (username, updated_object, action_type, details) "
+            f"SELECT %s, item_name, %s, CASE item_id {case} END FROM inventory "
+            f"WHERE item_id IN ({', '.join(['%s'] * len(item_ids))})",
+            [current_user.username, action_type] + case_params + item_ids,
+        )
+    except MySQLError as e:
+        logger.error(f"Database error updating audit log: {e}")
+        raise
+
+
 @roles_required(["Admin"])
 def pull_audit_log(current_user, number_of_entries):
     """Retrieves the most recent audit log entries.
@@ -61,52 +110,33 @@ def pull_audit_log(current_user, number_of_entries):
         number_of_entries (int): The number of recent log entries to pull.
 
     Returns:
-        list: A list of audit log entries.
+        list: A list of AuditEntry rows, newest first.
 
     Raises:
         TypeError: If number_of_entries is not a positive integer.
         Exception: If a database error occurs.
     """
 
-    connection = None
-    cursor = None
-
     try:
         if not validators.is_positive_int(number_of_entries):
             raise TypeError("Number of entries must be a positive integer")
 
-        connection = db_connection.get_connection()
-
-        if connection is None:
-            logger.error("Unable to establish a database connection.")
-            return []
-
-        cursor = connection.cursor()
-        cursor.callproc("GetLastAuditEntries", [number_of_entries])
-
-        result_set = []
-        for item in cursor.stored_results():
-            result_set = item.fetchall()
-
-            break
-
-        return result_set
+        return db_connection.call_procedure(
+            "GetLastAuditEntries", [number_of_entries], row_class=AuditEntry
+        )
     except MySQLError as e:
         logger.error(f"Error pulling audit log: {e}")
 
         return []
-    finally:
-        if cursor is not None:
-            cursor.close()
-
-        if connection is not None:
-            connection.close()
 
 
 @roles_required(["Admin"])
 def export_to_txt(current_user, file_path="audit_log_export.txt"):
     """Exports the entire audit log to a text file.
 
+    Entries are streamed from the database straight into the file, so the log is
+    never held in memory as a whole.
+
     Args:
         current_user (CurrentUser): The admin performing the export.
         file_path (str, optional): The path (relative to the module) for the export file.
@@ -117,24 +147,24 @@ def export_to_txt(current_user, file_path="audit_log_export.txt"):
     """
 
     try:
-        log_entries = db_connection.execute_query(
-            "SELECT log_id, username, updated_object, action_type, details, action_timestamp FROM audit_log ORDER BY action_timestamp DESC",
-            None,
-            False,
+        log_entries = db_connection.stream_query(
+            "SELECT log_id, username, updated_object, action_type, action_timestamp, details FROM audit_log ORDER BY action_timestamp DESC",
+            row_class=AuditEntry,
         )
-
-        if log_entries is None:
-            logger.info("No audit log entries retrieved")
-
-            return
-
         export_path = os.path.join(os.path.dirname(__file__), file_path)
 
         with open(export_path, "w") as file:
             for entry in log_entries:
                 file.write(
-                    f"Log ID: {entry[0]} | User: {entry[1]} | Updated object: {entry[2]} | Action: {entry[3]} | Details: {entry[4]} | Time: {entry[5]}\n"
+                    f"Log ID: {entry.log_id} | User: {entry.username} | Updated object: {entry.updated_object} | Action: {entry.action_type} | Details: {entry.details} | Time: {entry.action_timestamp}\n"
                 )
     except (MySQLError, IOError) as e:
         logger.error(f"Error exporting audit log: {e}")
         raise
+
+
+# Asyncio counterparts; each runs the blocking function on the database thread pool.
+update_audit_log_async = db_connection.to_async(update_audit_log)
+update_audit_log_for_items_async = db_connection.to_async(update_audit_log_for_items)
+pull_audit_log_async = db_connection.to_async(pull_audit_log)
+export_to_txt_async = db_connection.to_async(export_to_txt)
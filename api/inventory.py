@@ -7,48 +7,641 @@ viewing inventory details. All database changes are also logged in the audit log
 
 import os
 import sys
+import csv
+import json
+import threading
+import time
 
 # Append the parent directory to the system path.
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import utils.db_connection as db_connection
 import api.audit_log as audit_log
+import api.locations as locations
 import logging
 import utils.validators as validators
+from datetime import datetime, timedelta
 from utils.decorators import roles_required
+from utils.db_rows import InventoryItem, InventoryLot
+from utils.search_index import SearchIndex, query_terms
+from utils.ttl_cache import TTLCache
 from mysql.connector import Error as MySQLError
+from dotenv import load_dotenv
+
+ENV_FILE_PATH = ".env"
+load_dotenv(ENV_FILE_PATH)
 
 logger = logging.getLogger(__name__)
 
+# Process-local caches of single items (show_item) and of listings
+# (query_inventory, show_all_inventory). Writers in this module invalidate what
+# they change once their transaction commits. Changes made by other processes
+# are found by checking the inventory high-water mark at most every
+# INVENTORY_CACHE_CHECK_INTERVAL seconds, and no entry outlives
+# INVENTORY_CACHE_TTL seconds.
+INVENTORY_CACHE_SIZE = int(os.getenv("INVENTORY_CACHE_SIZE", "2000"))
+INVENTORY_CACHE_TTL = float(os.getenv("INVENTORY_CACHE_TTL", "60"))
+INVENTORY_CACHE_CHECK_INTERVAL = float(os.getenv("INVENTORY_CACHE_CHECK_INTERVAL", "2"))
+LISTING_CACHE_SIZE = 64
+
+# Reasons recorded in the stock movement ledger, one per kind of quantity change.
+MOVEMENT_REASONS = (
+    "opening",
+    "add",
+    "increase",
+    "decrease",
+    "set",
+    "adjust",
+    "import",
+    "delete",
+    "transfer",
+)
+
+# Order in which an item's lots are used up: earliest expiration first, undated
+# stock last.
+LOT_ORDER = "expiration_date IS NULL, expiration_date, lot_id"
+
+# Columns of import and export files. Exports also hold item_id and last_updated,
+# which imports ignore, so an exported file can be imported again.
+IMPORT_COLUMNS = (
+    "item_name",
+    "category",
+    "description",
+    "quantity",
+    "expiration_date",
+    "min_threshold",
+    "location_id",
+)
+EXPORT_COLUMNS = ("item_id",) + IMPORT_COLUMNS + ("last_updated",)
+IMPORT_CHUNK_SIZE = 1000
+# Row errors kept in an import report; further errors are only counted.
+MAX_IMPORT_ERRORS = 1000
+FILE_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+# inventory_changes_since() re-reads this much before its cursor, so changes
+# committed a little after their last_updated time are not missed.
+CHANGE_FEED_OVERLAP = timedelta(seconds=5)
+
+# Sort orders accepted by query_inventory(), as the columns rows are ordered by.
+# Each list ends in a unique key so the order is total and keyset pagination
+# neither skips nor repeats rows; names repeat across locations, so item_id
+# breaks their ties. A leading "-" on the sort name reverses it.
+INVENTORY_SORTS = {
+    "name": ("item_name", "category", "item_id"),
+    "category": ("category", "item_name", "item_id"),
+    "quantity": ("quantity", "item_id"),
+}
+
+# Columns of a listing page; descriptions are left out and read by show_item().
+INVENTORY_LIST_COLUMNS = "item_id, item_name, category, quantity, expiration_date, min_threshold, last_updated, location_id, row_version"
+
+# Columns of a full item, as returned by show_item().
+INVENTORY_ITEM_COLUMNS = "item_id, item_name, category, description, quantity, expiration_date, min_threshold, last_updated, location_id, row_version"
+
+INVENTORY_PAGE_SIZE = 50
+INVENTORY_MAX_PAGE_SIZE = 500
+
+# Times set_quantity() and update_item() re-read an item that changed under them
+# when the caller did not pass the version it saw.
+VERSION_CONFLICT_RETRIES = 3
+
+# Columns update_item() can change, with the check a new value must pass.
+EDITABLE_FIELDS = {
+    "item_name": (
+        validators.is_non_empty_string,
+        "Item name must be a non-empty string",
+    ),
+    "category": (
+        validators.is_non_empty_string,
+        "Category must be a non-empty string",
+    ),
+    "description": (
+        lambda value: value is None or isinstance(value, str),
+        "Description must be a string",
+    ),
+    "expiration_date": (
+        lambda value: value is None or validators.is_valid_date(value),
+        "Expiration date must be formatted YYYY-MM-DD",
+    ),
+    "min_threshold": (
+        lambda value: value is None or validators.is_positive_int(value),
+        "Minimum threshold must be a positive integer",
+    ),
+}
+
+
+# Relevance-ranked search. MySQL answers from the ngram FULLTEXT index added by
+# migration 3; other backends use an in-memory index loaded on first search and
+# refreshed from the items reported to _inventory_changed().
+SEARCH_RESULTS_LIMIT = 20
+
+# Above this many changed items the search index is reloaded instead of patched.
+SEARCH_INDEX_RELOAD_AT = 1000
+
+_search_index = SearchIndex()
+_search_index_loaded = False
+_stale_item_ids = set()
+_search_index_lock = threading.Lock()
+
+_item_cache = TTLCache(INVENTORY_CACHE_SIZE, INVENTORY_CACHE_TTL)
+_listing_cache = TTLCache(LISTING_CACHE_SIZE, INVENTORY_CACHE_TTL)
+# Bumped by every invalidation, so a read that raced with a write does not
+# store what it read.
+_cache_generation = 0
+
+# (latest last_updated, row count, {(item_id, row_version)} at the latest time)
+_high_water_mark = None
+_high_water_checked_at = 0.0
+_high_water_lock = threading.Lock()
+
+
+def _inventory_changed(*item_ids):
+    """Records that inventory items were added, changed or deleted.
+
+    Every function writing the inventory table calls this, so caches and the
+    search index drop the changed items once the transaction commits.
+
+    Args:
+        *item_ids (int): The IDs of the changed items; none means all items.
+    """
+
+    db_connection.on_commit(lambda: _invalidate(item_ids or None))
+
+
+def _invalidate(item_ids):
+    global _search_index_loaded, _cache_generation
+
+    with _search_index_lock:
+        _cache_generation += 1
+        _listing_cache.clear()
+
+        if item_ids is None:
+            _item_cache.clear()
+            _search_index_loaded = False
+        else:
+            for item_id in item_ids:
+                _item_cache.invalidate(item_id)
+
+            _stale_item_ids.update(item_ids)
+
+
+def _check_high_water_mark():
+    """Invalidates items changed by other processes since the last check.
+
+    Rows carry the time of their last change in last_updated, so rows after
+    the previous high-water mark have changed. last_updated only has
+    one-second resolution, so rows at the mark itself are compared by
+    row_version, which every update advances. Deletions only show in the row
+    count and clear the item cache.
+    """
+
+    global _high_water_mark, _high_water_checked_at
+
+    with _high_water_lock:
+        now = time.monotonic()
+
+        if now - _high_water_checked_at < INVENTORY_CACHE_CHECK_INTERVAL:
+            return
+
+        count = db_connection.execute_query(
+            "SELECT COUNT(*) FROM inventory", None, False
+        )[0][0]
+
+        if _high_water_mark is None or _high_water_mark[0] is None:
+            rows = db_connection.execute_query(
+                "SELECT item_id, last_updated, row_version FROM inventory WHERE last_updated = (SELECT MAX(last_updated) FROM inventory)",
+                None,
+                False,
+            )
+        else:
+            rows = db_connection.execute_query(
+                "SELECT item_id, last_updated, row_version FROM inventory WHERE last_updated >= %s",
+                [_high_water_mark[0]],
+                False,
+            )
+
+        previous = _high_water_mark
+        latest = max((updated for _, updated, _ in rows), default=None)
+        _high_water_mark = (
+            latest if latest is not None else previous and previous[0],
+            count,
+            {
+                (item_id, version)
+                for item_id, updated, version in rows
+                if updated == latest
+            },
+        )
+        _high_water_checked_at = now
+
+        if previous is None:
+            return
+
+        changed = [
+            item_id
+            for item_id, _, version in rows
+            if (item_id, version) not in previous[2]
+        ]
+
+        if count != previous[1]:
+            _item_cache.clear()
+
+        if changed or count != previous[1]:
+            logger.info(f"Inventory changed externally: {len(changed)} item(s)")
+            _invalidate(changed)
+
+
+def _cached(cache, key, load):
+    """Returns the cached value for key, calling load() and storing it on a miss.
+
+    Inside a transaction the cache is bypassed, so the caller sees its own
+    uncommitted writes and they are never cached.
+    """
+
+    if db_connection.current_transaction() is not None:
+        return load()
+
+    _check_high_water_mark()
+    value = cache.get(key)
+
+    if value is None:
+        generation = _cache_generation
+        value = load()
+
+        if generation == _cache_generation:
+            cache.put(key, value)
+
+    return value
+
+
+def cache_stats():
+    """Returns hit rate, size and memory counters of the inventory caches.
+
+    Returns:
+        dict: "items" and "listings", each as returned by TTLCache.stats().
+    """
+
+    return {"items": _item_cache.stats(), "listings": _listing_cache.stats()}
+
+
+def clear_cache():
+    """Empties the inventory caches and resets their counters."""
+
+    _invalidate(None)
+    _item_cache.reset_stats()
+    _listing_cache.reset_stats()
+
+
+def _refresh_search_index():
+    global _search_index_loaded
+
+    with _search_index_lock:
+        if not _search_index_loaded or len(_stale_item_ids) > SEARCH_INDEX_RELOAD_AT:
+            _search_index.clear()
+
+            for item in db_connection.stream_query(
+                "SELECT item_id, item_name, category, description, location_id FROM inventory",
+                row_class=InventoryItem,
+            ):
+                _search_index.add(
+                    item.item_id,
+                    item.item_name,
+                    item.description,
+                    item.category,
+                    item.location_id,
+                )
+
+            _search_index_loaded = True
+            _stale_item_ids.clear()
+            logger.info(f"Loaded search index with {len(_search_index)} items")
+        elif _stale_item_ids:
+            item_ids = list(_stale_item_ids)
+            current = {
+                item.item_id: item
+                for item in db_connection.execute_query(
+                    f"SELECT item_id, item_name, category, description, location_id FROM inventory WHERE item_id IN ({', '.join(['%s'] * len(item_ids))})",
+                    item_ids,
+                    False,
+                    row_class=InventoryItem,
+                )
+            }
+
+            for item_id in item_ids:
+                if item_id in current:
+                    item = current[item_id]
+                    _search_index.add(
+                        item_id,
+                        item.item_name,
+                        item.description,
+                        item.category,
+                        item.location_id,
+                    )
+                else:
+                    _search_index.remove(item_id)
+
+            _stale_item_ids.clear()
+
+
+def _record_movements(current_user, reason, deltas):
+    """Appends quantity changes to the stock movement ledger.
+
+    Must run in the transaction that changes the quantities, so the ledger and
+    inventory.quantity always agree.
+
+    Args:
+        current_user (CurrentUser): The user making the change, or None.
+        reason (str): One of MOVEMENT_REASONS.
+        deltas (dict): Quantity change per item ID; zero changes are skipped.
+    """
+
+    if reason not in MOVEMENT_REASONS:
+        raise ValueError(f"Invalid movement reason: {reason}")
+
+    username = current_user.username if current_user is not None else None
+    rows = [
+        (item_id, delta, reason, username)
+        for item_id, delta in deltas.items()
+        if delta != 0
+    ]
+
+    if rows:
+        db_connection.execute_many(
+            "INSERT INTO stock_movements (item_id, delta, reason, username) VALUES (%s, %s, %s, %s)",
+            rows,
+        )
+
+
+def _receive_stock(quantities, expiration_date=None):
+    """Adds received stock to the lots of the given expiration date.
+
+    Must run in the transaction that raises inventory.quantity, after that
+    statement locked the item rows, so concurrent receipts cannot create the
+    same lot twice.
+
+    Args:
+        quantities (dict): Quantity received per item ID; zero is skipped.
+        expiration_date (str or date, optional): Expiration date of the stock.
+                                                 None adds undated stock.
+    """
+
+    item_ids = [item_id for item_id, quantity in quantities.items() if quantity > 0]
+
+    for item_id in item_ids:
+        updated = db_connection.execute_query(
+            "UPDATE inventory_lots SET quantity = quantity + %s WHERE item_id = %s AND expiration_date <=> %s",
+            [quantities[item_id], item_id, expiration_date],
+        )
+
+        if not updated:
+            db_connection.execute_query(
+                "INSERT INTO inventory_lots (item_id, quantity, expiration_date) VALUES (%s, %s, %s)",
+                [item_id, quantities[item_id], expiration_date],
+            )
+
+    _sync_expiration(item_ids)
+
+
+def _consume_stock(quantities):
+    """Takes consumed stock out of the item lots, earliest expiration first.
+
+    Must run in the transaction that lowers inventory.quantity, after that
+    statement locked the item rows. Emptied lots are deleted.
+
+    Args:
+        quantities (dict): Quantity consumed per item ID; zero is skipped.
+
+    Returns:
+        dict: The (expiration_date, quantity) taken from each lot, per item ID,
+              in the order the lots were used.
+    """
+
+    item_ids = [item_id for item_id, quantity in quantities.items() if quantity > 0]
+    taken = {item_id: [] for item_id in item_ids}
+
+    if not item_ids:
+        return taken
+
+    lots = db_connection.execute_query(
+        f"SELECT lot_id, item_id, quantity, expiration_date FROM inventory_lots WHERE item_id IN ({', '.join(['%s'] * len(item_ids))}) ORDER BY item_id, {LOT_ORDER} FOR UPDATE",
+        item_ids,
+        False,
+    )
+    remaining = {item_id: quantities[item_id] for item_id in item_ids}
+    emptied = []
+    partial = []
+
+    for lot_id, item_id, quantity, expiration_date in lots:
+        needed = remaining[item_id]
+
+        if needed <= 0:
+            continue
+
+        if quantity <= needed:
+            emptied.append(lot_id)
+        else:
+            partial.append((quantity - needed, lot_id))
+
+        taken[item_id].append((expiration_date, min(quantity, needed)))
+        remaining[item_id] = needed - min(quantity, needed)
+
+    short = sorted(item_id for item_id, needed in remaining.items() if needed > 0)
+
+    if short:
+        # The item quantities were already checked, so only lots changed
+        # outside this module can be short; the consumption still goes ahead.
+        logger.warning(f"Lots of items {short} hold less than their quantity")
+
+    if emptied:
+        db_connection.execute_query(
+            f"DELETE FROM inventory_lots WHERE lot_id IN ({', '.join(['%s'] * len(emptied))})",
+            emptied,
+        )
+
+    for quantity, lot_id in partial:
+        db_connection.execute_query(
+            "UPDATE inventory_lots SET quantity = %s WHERE lot_id = %s",
+            [quantity, lot_id],
+        )
+
+    _sync_expiration(item_ids)
+
+    return taken
+
+
+def _sync_expiration(item_ids):
+    """Sets inventory.expiration_date to the earliest date of the item's lots."""
+
+    if item_ids:
+        db_connection.execute_query(
+            f"UPDATE inventory SET expiration_date = (SELECT MIN(l.expiration_date) FROM inventory_lots l WHERE l.item_id = inventory.item_id) WHERE item_id IN ({', '.join(['%s'] * len(item_ids))})",
+            list(item_ids),
+        )
+
+
+def _replace_lots(item_ids):
+    """Replaces the lots of items with one lot of their quantity and expiration.
+
+    Used where the whole stock of an item takes one expiration date: new items,
+    set_expiration() and imports.
+    """
+
+    if item_ids:
+        in_list = ", ".join(["%s"] * len(item_ids))
+        db_connection.execute_query(
+            f"DELETE FROM inventory_lots WHERE item_id IN ({in_list})", list(item_ids)
+        )
+        db_connection.execute_query(
+            f"INSERT INTO inventory_lots (item_id, quantity, expiration_date) SELECT item_id, quantity, expiration_date FROM inventory WHERE item_id IN ({in_list}) AND quantity > 0",
+            list(item_ids),
+        )
+
+
+class VersionConflictError(ValueError):
+    """An item was changed by someone else since the caller read it.
+
+    Attributes:
+        current (InventoryItem): The item as it is now, including its new
+                                 row_version, so the caller can merge or retry
+                                 without reading it again.
+    """
+
+    def __init__(self, current):
+        super().__init__(f"Item {current.item_name} was changed by another user")
+        self.current = current
+
+
+def _current_row(item_id, latest=False):
+    """Reads an item from the database, bypassing the cache, or None if it is gone.
+
+    With latest, a locking read returns the latest committed row rather than the
+    transaction's snapshot; it is only used once an update has already failed.
+    """
+
+    rows = db_connection.execute_query(
+        f"SELECT {INVENTORY_ITEM_COLUMNS} FROM inventory WHERE item_id = %s{' FOR UPDATE' if latest else ''}",
+        [item_id],
+        False,
+        row_class=InventoryItem,
+    )
+
+    return rows[0] if rows else None
+
+
+def _check_version(item_id, expected_version):
+    """Explains a compare-and-swap update that matched no row.
+
+    Returns quietly if the item is still at expected_version, which happens when
+    MySQL reports an update that changed nothing as zero affected rows.
+
+    Raises:
+        ValueError: If the item does not exist.
+        VersionConflictError: If the item has moved past expected_version.
+    """
+
+    current = _current_row(item_id, latest=True)
+
+    if current is None:
+        raise ValueError("Item not found")
+
+    if current.row_version != expected_version:
+        raise VersionConflictError(current)
+
+
+def _retry_conflicts(expected_version, operation):
+    """Runs an optimistic update, repeating it when the item changed meanwhile.
+
+    Only updates that read the version themselves are repeated; if the caller
+    passed the version it saw, or an outer transaction holds an older snapshot,
+    the conflict is raised.
+
+    Args:
+        expected_version (int): The version passed by the caller, or None.
+        operation (callable): Reads the item and updates it, raising
+                              VersionConflictError if the item changed.
+
+    Returns:
+        object: The result of operation.
+    """
+
+    for attempt in range(VERSION_CONFLICT_RETRIES):
+        try:
+            return operation()
+        except VersionConflictError:
+            if (
+                expected_version is not None
+                or attempt == VERSION_CONFLICT_RETRIES - 1
+                or db_connection.current_transaction() is not None
+            ):
+                raise
+
+            logger.info("Item changed while it was being updated, retrying")
+
 
 def perform_inventory_update(
-    current_user, item_name, query, params, success_message, audit_message
+    current_user,
+    item_id,
+    query,
+    params,
+    success_message,
+    audit_message,
+    movement=None,
+    expected_version=None,
 ):
     """Performs a generic inventory update with logging.
 
     Executes a database update query, prints a success message if the operation
-    is successful, and updates the audit log.
+    is successful, and updates the audit log. The update, its audit entry and
+    its stock movement are committed together in one transaction.
 
     Args:
         current_user (CurrentUser): The user performing the update.
-        item_name (str): The name of the inventory item.
+        item_id (int): The ID of the inventory item.
         query (str): The SQL query to execute.
         params (list): Parameters for the SQL query.
         success_message (str): Message to display on success.
         audit_message (str): Message to record in the audit log.
+        movement (tuple, optional): (reason, delta) to record in the stock
+                                    movement ledger if the update changes the
+                                    quantity.
+        expected_version (int, optional): The row_version the caller read. If
+                                          given, the query only applies while
+                                          the item is still at that version.
+                                          The query must end in its WHERE
+                                          clause.
 
     Returns:
-        object: The result of the database query if successful; otherwise, None.
+        object: The result of the database query.
+
+    Raises:
+        ValueError: If the item does not exist.
+        VersionConflictError: If the item is no longer at expected_version.
     """
 
     try:
-        result = db_connection.execute_query(query, params)
+        if expected_version is not None:
+            if not validators.is_positive_int(expected_version):
+                raise TypeError("Expected version must be a positive integer")
+
+            expected_version = int(expected_version)
+            query += " AND row_version = %s"
+            params = list(params) + [expected_version]
 
-        if result is None:
-            raise Exception("Database operation failed.")
+        with db_connection.transaction():
+            result = db_connection.execute_query(query, params)
 
+            if expected_version is not None and not result:
+                _check_version(item_id, expected_version)
+
+            # The audit entry is only written if the item exists.
+            if not audit_log.update_audit_log_for_items(
+                current_user, "UPDATE", {item_id: audit_message}
+            ):
+                raise ValueError("Item not found")
+
+            if movement is not None:
+                _record_movements(current_user, movement[0], {item_id: movement[1]})
+
+        _inventory_changed(item_id)
         logger.info(success_message)
-        audit_log.update_audit_log(current_user, item_name, "UPDATE", audit_message)
 
         return result
     except (MySQLError, Exception) as e:
@@ -66,11 +659,13 @@ def add_inventory_item(
     initial_quantity,
     expiration_date,
     minimum_threshold,
+    location_id=locations.DEFAULT_LOCATION_ID,
 ):
     """Adds a new inventory item to the database.
 
-    Checks for uniqueness of the item by name and validates input before insertion.
-    Also updates the audit log upon success.
+    Validates input, then inserts the item with INSERT IGNORE so an existing item
+    with the same name and category at the location is detected by the insert
+    itself instead of a separate lookup. Also updates the audit log upon success.
 
     Args:
         current_user (CurrentUser): The admin performing the operation.
@@ -80,6 +675,11 @@ def add_inventory_item(
         initial_quantity (int): The starting quantity.
         expiration_date (str): Expiration date in YYYY-MM-DD format.
         minimum_threshold (int): The minimum threshold for the item.
+        location_id (int, optional): The station or vehicle holding the item.
+                                     Defaults to the main station.
+
+    Returns:
+        int: The ID of the new item, or None if the item already exists.
 
     Raises:
         TypeError: If any input is invalid.
@@ -87,34 +687,35 @@ def add_inventory_item(
     """
 
     try:
-        result = db_connection.execute_query(
-            "SELECT COUNT(*) AS num_rows FROM inventory WHERE item_name = %s",
-            [item_name],
-        )
-        count = result[0][0] if result and len(result) > 0 else 0
+        if not validators.is_non_empty_string(item_name):
+            raise TypeError("Item name must be a non-empty string")
 
-        if count == 0:
-            if not validators.is_non_empty_string(item_name):
-                raise TypeError("Item name must be a non-empty string")
+        if not validators.is_non_empty_string(item_category):
+            raise TypeError("Item category must be a non-empty string")
 
-            if not validators.is_positive_int(initial_quantity):
-                raise TypeError("Initial quantity must be a positive integer")
+        if not validators.is_positive_int(initial_quantity):
+            raise TypeError("Initial quantity must be a positive integer")
 
-            if expiration_date:
-                if not validators.is_valid_date(expiration_date):
-                    raise TypeError("Expiration date must be formatted YYYY-MM-DD")
-            else:
-                expiration_date = None
+        if expiration_date:
+            if not validators.is_valid_date(expiration_date):
+                raise TypeError("Expiration date must be formatted YYYY-MM-DD")
+        else:
+            expiration_date = None
 
-            if minimum_threshold:
-                if not validators.is_positive_int(minimum_threshold):
-                    raise TypeError("Minimum threshold must be a positive integer")
-                else:
-                    minimum_threshold = None
+        if minimum_threshold:
+            if not validators.is_positive_int(minimum_threshold):
+                raise TypeError("Minimum threshold must be a positive integer")
+        else:
+            minimum_threshold = None
 
-            db_connection.execute_query(
-                "INSERT INTO inventory (item_name, category, description, quantity, expiration_date, min_threshold) VALUES(%s, %s, %s, %s, %s, %s)",
+        if not validators.is_positive_int(location_id):
+            raise TypeError("Location ID must be a positive integer")
+
+        with db_connection.transaction():
+            item_id = db_connection.execute_insert(
+                "INSERT IGNORE INTO inventory (location_id, item_name, category, description, quantity, expiration_date, min_threshold) VALUES(%s, %s, %s, %s, %s, %s, %s)",
                 [
+                    location_id,
                     item_name,
                     item_category,
                     description,
@@ -123,25 +724,43 @@ def add_inventory_item(
                     minimum_threshold,
                 ],
             )
+
+            if item_id is None:
+                logger.info(
+                    f"Item {item_name} already exists in {item_category}; please update instead."
+                )
+
+                return None
+
             audit_log.update_audit_log(
                 current_user, item_name, "ADD", "Added item to inventory"
             )
-            logger.info(f"Item {item_name} added")
-        else:
-            logger.info(f"Item {item_name} already exists; please update instead.")
+            _record_movements(current_user, "add", {item_id: int(initial_quantity)})
+            _replace_lots([item_id])
+
+        _inventory_changed(item_id)
+        logger.info(f"Item {item_name} added")
+
+        return item_id
     except (MySQLError, Exception) as e:
         logger.error(f"Error adding inventory item: {e}")
         raise
 
 
 @roles_required(["Admin", "Leadership"])
-def increase_item(current_user, item_name, quantity):
+def increase_item(current_user, item_id, quantity, expiration_date=None):
     """Increases the quantity of an inventory item.
 
+    The stock is added to the item's lot expiring on expiration_date, which is
+    created if needed.
+
     Args:
         current_user (CurrentUser): The user performing the update.
-        item_name (str): The name of the item.
+        item_id (int): The ID of the item.
         quantity (int): The quantity to increase by.
+        expiration_date (str, optional): Expiration date of the added stock in
+                                         YYYY-MM-DD format. Defaults to undated
+                                         stock.
 
     Raises:
         TypeError: If parameters are invalid.
@@ -149,34 +768,44 @@ def increase_item(current_user, item_name, quantity):
     """
 
     try:
-        if not validators.is_non_empty_string(item_name):
-            raise TypeError("Item name must be a non-empty string")
+        if not validators.is_positive_int(item_id):
+            raise TypeError("Item ID must be a positive integer")
 
         if not validators.is_positive_int(quantity):
             raise TypeError("Quantity must be a positive integer")
 
-        query = "UPDATE inventory SET quantity = quantity + %s WHERE item_name = %s"
-        perform_inventory_update(
-            current_user,
-            item_name,
-            query,
-            [quantity, item_name],
-            f"Quantity of {item_name} increased",
-            f"Quantity increased by {quantity}",
-        )
+        if expiration_date and not validators.is_valid_date(expiration_date):
+            raise TypeError("Expiration date must be formatted YYYY-MM-DD")
+
+        query = "UPDATE inventory SET quantity = quantity + %s WHERE item_id = %s"
+
+        with db_connection.transaction():
+            perform_inventory_update(
+                current_user,
+                item_id,
+                query,
+                [quantity, item_id],
+                f"Quantity of item {item_id} increased",
+                f"Quantity increased by {quantity}"
+                + (f" expiring {expiration_date}" if expiration_date else ""),
+                movement=("increase", int(quantity)),
+            )
+            _receive_stock({item_id: int(quantity)}, expiration_date or None)
     except (MySQLError, Exception) as e:
         logger.error(f"Error increasing item quantity: {e}")
 
 
 @roles_required(["Admin", "Leadership"])
-def decrease_item(current_user, item_name, quantity):
+def decrease_item(current_user, item_id, quantity):
     """Decreases the quantity of an inventory item.
 
-    Ensures that the quantity does not fall below zero.
+    Ensures that the quantity does not fall below zero. The check and the update
+    are a single conditional UPDATE; the affected row count tells whether there
+    was enough stock. The stock is taken from the earliest-expiring lots first.
 
     Args:
         current_user (CurrentUser): The user performing the update.
-        item_name (str): The name of the item.
+        item_id (int): The ID of the item.
         quantity (int): The quantity to decrease by.
 
     Raises:
@@ -186,55 +815,192 @@ def decrease_item(current_user, item_name, quantity):
     """
 
     try:
-        if not validators.is_non_empty_string(item_name):
-            raise TypeError("Item name must be a non-empty string")
+        if not validators.is_positive_int(item_id):
+            raise TypeError("Item ID must be a positive integer")
 
         if not validators.is_positive_int(quantity):
             raise TypeError("Quantity must be a positive integer")
 
-        current = db_connection.execute_query(
-            "SELECT quantity FROM inventory WHERE item_name = %s", [item_name], False
-        )
+        with db_connection.transaction():
+            # The stock check and the decrement are one statement, so concurrent
+            # updates can neither interleave nor drive the quantity below zero.
+            updated = db_connection.execute_query(
+                "UPDATE inventory SET quantity = quantity - %s WHERE item_id = %s AND quantity >= %s",
+                [quantity, item_id, quantity],
+            )
 
-        if not current or len(current) == 0:
-            raise Exception("Item not found")
+            if not updated:
+                current = db_connection.execute_query(
+                    "SELECT quantity FROM inventory WHERE item_id = %s",
+                    [item_id],
+                    False,
+                )
 
-        current_qty = current[0][0]
-        if current_qty - quantity < 0:
-            raise ValueError("Insufficient quantity: cannot decrease below 0")
+                if not current or len(current) == 0:
+                    raise Exception("Item not found")
 
-        query = "UPDATE inventory SET quantity = quantity - %s WHERE item_name = %s"
-        perform_inventory_update(
-            current_user,
-            item_name,
-            query,
-            [quantity, item_name],
-            f"Quantity of {item_name} decreased",
-            f"Quantity decreased by {quantity}",
-        )
+                raise ValueError("Insufficient quantity: cannot decrease below 0")
+
+            audit_log.update_audit_log_for_items(
+                current_user, "UPDATE", {item_id: f"Quantity decreased by {quantity}"}
+            )
+            _record_movements(current_user, "decrease", {item_id: -int(quantity)})
+            _consume_stock({item_id: int(quantity)})
+
+        _inventory_changed(item_id)
+        logger.info(f"Quantity of item {item_id} decreased")
     except (MySQLError, Exception) as e:
         logger.error(f"Error decreasing item quantity: {e}")
         raise
 
 
 @roles_required(["Admin", "Leadership"])
-def set_quantity(current_user, item_name, quantity):
+def apply_adjustments(current_user, adjustments, location_id=None):
+    """Applies quantity changes to several inventory items at once.
+
+    Meant for truck and shift checks. Deltas for the same item are combined,
+    every item is updated by one CASE-based UPDATE and audited by one multi-row
+    insert, all in one transaction. If any item is missing or would fall below
+    zero, nothing is changed. Consumption uses the earliest-expiring lots first;
+    restocked items get undated stock.
+
+    Args:
+        current_user (CurrentUser): The user performing the adjustments.
+        adjustments (list): (item_id, delta) pairs; a positive delta restocks
+                            the item, a negative delta consumes it.
+        location_id (int, optional): The location the items must belong to, so
+                                     a truck check cannot change another
+                                     location's stock.
+
+    Returns:
+        int: The number of items updated.
+
+    Raises:
+        TypeError: If an item ID or delta is invalid.
+        ValueError: If an item does not exist, is at another location or has
+                    insufficient quantity.
+        Exception: If an error occurs during the update.
+    """
+
+    try:
+        if location_id is not None and not validators.is_positive_int(location_id):
+            raise TypeError("Location ID must be a positive integer")
+
+        deltas = {}
+
+        for item_id, delta in adjustments:
+            if not validators.is_positive_int(item_id):
+                raise TypeError("Item ID must be a positive integer")
+
+            if not isinstance(delta, int) or isinstance(delta, bool):
+                raise TypeError("Adjustment must be an integer")
+
+            item_id = int(item_id)
+            deltas[item_id] = deltas.get(item_id, 0) + delta
+
+        deltas = {item_id: delta for item_id, delta in deltas.items() if delta != 0}
+
+        if not deltas:
+            return 0
+
+        item_ids = list(deltas)
+        in_list = ", ".join(["%s"] * len(item_ids))
+        case = "CASE item_id " + " ".join(["WHEN %s THEN %s"] * len(item_ids))
+        case_params = [
+            value for item_id in item_ids for value in (item_id, deltas[item_id])
+        ]
+        location_filter = " AND location_id = %s" if location_id is not None else ""
+        location_params = [location_id] if location_id is not None else []
+
+        with db_connection.transaction():
+            # WHERE sees the quantities before the update, so rows that would go
+            # negative are skipped and detected through the affected row count.
+            updated = db_connection.execute_query(
+                f"UPDATE inventory SET quantity = quantity + {case} END "
+                f"WHERE item_id IN ({in_list}){location_filter} AND quantity + {case} END >= 0",
+                case_params + item_ids + location_params + case_params,
+            )
+
+            if updated != len(item_ids):
+                current = {
+                    item_id: (item_name, quantity, item_location_id)
+                    for item_id, item_name, quantity, item_location_id in db_connection.execute_query(
+                        f"SELECT item_id, item_name, quantity, location_id FROM inventory WHERE item_id IN ({in_list})",
+                        item_ids,
+                        False,
+                    )
+                }
+                problems = []
+
+                for item_id in item_ids:
+                    if item_id not in current:
+                        problems.append(f"item {item_id} (not found)")
+                    elif location_id is not None and current[item_id][2] != location_id:
+                        problems.append(f"{current[item_id][0]} (at another location)")
+                    elif current[item_id][1] + deltas[item_id] < 0:
+                        problems.append(
+                            f"{current[item_id][0]} (have {current[item_id][1]}, need {-deltas[item_id]})"
+                        )
+
+                raise ValueError(f"No adjustments applied: {', '.join(problems)}")
+
+            audit_log.update_audit_log_for_items(
+                current_user,
+                "UPDATE",
+                {
+                    item_id: (
+                        f"Quantity increased by {delta}"
+                        if delta > 0
+                        else f"Quantity decreased by {-delta}"
+                    )
+                    for item_id, delta in deltas.items()
+                },
+            )
+            _record_movements(current_user, "adjust", deltas)
+            _consume_stock(
+                {item_id: -delta for item_id, delta in deltas.items() if delta < 0}
+            )
+            _receive_stock(
+                {item_id: delta for item_id, delta in deltas.items() if delta > 0}
+            )
+
+        _inventory_changed(*item_ids)
+        logger.info(f"Adjusted quantities of {len(item_ids)} items")
+
+        return len(item_ids)
+    except (MySQLError, Exception) as e:
+        logger.error(f"Error applying inventory adjustments: {e}")
+        raise
+
+
+@roles_required(["Admin", "Leadership"])
+def set_quantity(current_user, item_id, quantity, expected_version=None):
     """Sets the quantity of an inventory item to an exact value.
 
+    A lower count is taken from the earliest-expiring lots first; a higher count
+    is added as undated stock. The count is only written if the item is still at
+    the version its old quantity was read from, so the recorded change is exact
+    without locking the row.
+
     Args:
         current_user (CurrentUser): The user performing the update.
-        item_name (str): The name of the item.
+        item_id (int): The ID of the item.
         quantity (int): The new quantity value.
+        expected_version (int, optional): The row_version the user saw. If
+                                          omitted, the item is re-read and the
+                                          update retried when it changes
+                                          meanwhile.
 
     Raises:
         TypeError: If parameters are invalid.
-        ValueError: If quantity is negative.
+        ValueError: If quantity is negative or the item does not exist.
+        VersionConflictError: If the item is no longer at expected_version.
         Exception: If an error occurs during the update.
     """
 
     try:
-        if not validators.is_non_empty_string(item_name):
-            raise TypeError("Item name must be a non-empty string")
+        if not validators.is_positive_int(item_id):
+            raise TypeError("Item ID must be a positive integer")
 
         if not validators.is_positive_int(quantity):
             raise TypeError("Quantity must be a positive integer")
@@ -242,84 +1008,125 @@ def set_quantity(current_user, item_name, quantity):
         if quantity < 0:
             raise ValueError("Quantity cannot be negative")
 
-        query = "UPDATE inventory SET quantity = %s WHERE item_name = %s"
-        perform_inventory_update(
-            current_user,
-            item_name,
-            query,
-            [quantity, item_name],
-            f"Quantity of {item_name} set to {quantity}",
-            f"Quantity set to {quantity}",
-        )
+        if expected_version is not None:
+            if not validators.is_positive_int(expected_version):
+                raise TypeError("Expected version must be a positive integer")
+
+            expected_version = int(expected_version)
+
+        def set_once():
+            with db_connection.transaction():
+                current = _current_row(item_id)
+
+                if current is None:
+                    raise ValueError("Item not found")
+
+                if expected_version is None:
+                    version = current.row_version
+                elif current.row_version != expected_version:
+                    raise VersionConflictError(current)
+                else:
+                    version = expected_version
+
+                change = int(quantity) - current.quantity
+                query = "UPDATE inventory SET quantity = %s WHERE item_id = %s"
+                perform_inventory_update(
+                    current_user,
+                    item_id,
+                    query,
+                    [quantity, item_id],
+                    f"Quantity of item {item_id} set to {quantity}",
+                    f"Quantity set to {quantity}",
+                    movement=("set", change),
+                    expected_version=version,
+                )
+
+                if change > 0:
+                    _receive_stock({item_id: change})
+                else:
+                    _consume_stock({item_id: -change})
+
+        _retry_conflicts(expected_version, set_once)
     except (MySQLError, Exception) as e:
         logger.error(f"Error setting item quantity: {e}")
         raise
 
 
 @roles_required(["Admin", "Leadership"])
-def set_expiration(current_user, item_name, new_expiration):
+def set_expiration(current_user, item_id, new_expiration, expected_version=None):
     """Sets a new expiration date for an inventory item.
 
+    The date applies to all of the item's stock, so its lots are merged into one.
+
     Args:
         current_user (CurrentUser): The user performing the update.
-        item_name (str): The name of the item.
+        item_id (int): The ID of the item.
         new_expiration (str): New expiration date in YYYY-MM-DD format.
+        expected_version (int, optional): The row_version the user saw; the
+                                          update is refused if the item has
+                                          changed since.
 
     Raises:
         TypeError: If inputs are invalid.
+        VersionConflictError: If the item is no longer at expected_version.
         Exception: If a database error occurs.
     """
 
     try:
-        if not validators.is_non_empty_string(item_name):
-            raise TypeError("Item name must be a non-empty string")
+        if not validators.is_positive_int(item_id):
+            raise TypeError("Item ID must be a positive integer")
 
         if not validators.is_valid_date(new_expiration):
             raise TypeError("Expiration date must be formatted YYYY-MM-DD")
 
-        db_connection.execute_query(
-            "UPDATE inventory SET expiration_date = %s WHERE item_name = %s",
-            [new_expiration, item_name],
-        )
-
-        audit_log.update_audit_log(
-            current_user,
-            item_name,
-            "UPDATE",
-            "Expiration date set to " + new_expiration,
-        )
+        with db_connection.transaction():
+            perform_inventory_update(
+                current_user,
+                item_id,
+                "UPDATE inventory SET expiration_date = %s WHERE item_id = %s",
+                [new_expiration, item_id],
+                f"Expiration date of item {item_id} set",
+                "Expiration date set to " + new_expiration,
+                expected_version=expected_version,
+            )
+            _replace_lots([item_id])
     except (MySQLError, Exception) as e:
         logger.error(f"Error setting expiration date: {e}")
         raise
 
 
-def set_category(current_user, item_name, new_category):
+def set_category(current_user, item_id, new_category, expected_version=None):
     """Updates the category of an inventory item.
 
     Args:
         current_user (CurrentUser): The user performing the update.
-        item_name (str): The name of the item.
+        item_id (int): The ID of the item.
         new_category (str): The new category name.
+        expected_version (int, optional): The row_version the user saw; the
+                                          update is refused if the item has
+                                          changed since.
 
     Raises:
-        TypeError: If item_name or new_category are invalid.
+        TypeError: If item_id or new_category are invalid.
+        VersionConflictError: If the item is no longer at expected_version.
         Exception: If a database error occurs.
     """
 
     try:
-        if not validators.is_non_empty_string(item_name):
-            raise TypeError("Item name must be a non-empty string")
+        if not validators.is_positive_int(item_id):
+            raise TypeError("Item ID must be a positive integer")
 
         if not validators.is_non_empty_string(new_category):
             raise TypeError("Category must be a non-empty string")
 
-        db_connection.execute_query(
-            "UPDATE inventory SET category = %s WHERE item_name = %s",
-            [new_category, item_name],
-        )
-
-        audit_log.update_audit_log(
-            current_user, item_name, "UPDATE", "Category set to " + new_category
+        perform_inventory_update(
+            current_user,
+            item_id,
+            "UPDATE inventory SET category = %s WHERE item_id = %s",
+            [new_category, item_id],
+            f"Category of item {item_id} set",
+            "Category set to " + new_category,
+            expected_version=expected_version,
         )
     except (MySQLError, Exception) as e:
         logger.error(f"Error setting category: {e}")
@@ -327,33 +1134,35 @@ def set_category(current_user, item_name, new_category):
 
 
 @roles_required(["Admin", "Leadership"])
-def set_description(current_user, item_name, new_description):
+def set_description(current_user, item_id, new_description, expected_version=None):
     """Updates the description of an inventory item.
 
     Args:
         current_user (CurrentUser): The user performing the update.
-        item_name (str): The name of the item.
+        item_id (int): The ID of the item.
         new_description (str): The new description text.
+        expected_version (int, optional): The row_version the user saw; the
+                                          update is refused if the item has
+                                          changed since.
 
     Raises:
-        TypeError: If item_name is invalid.
+        TypeError: If item_id is invalid.
+        VersionConflictError: If the item is no longer at expected_version.
         Exception: If a database error occurs.
     """
 
     try:
-        if not validators.is_non_empty_string(item_name):
-            raise TypeError("Item name must be a non-empty string")
-
-        db_connection.execute_query(
-            "UPDATE inventory SET description = %s WHERE item_name = %s",
-            [new_description, item_name],
-        )
+        if not validators.is_positive_int(item_id):
+            raise TypeError("Item ID must be a positive integer")
 
-        audit_log.update_audit_log(
+        perform_inventory_update(
             current_user,
-            item_name,
-            "UPDATE",
+            item_id,
+            "UPDATE inventory SET description = %s WHERE item_id = %s",
+            [new_description, item_id],
+            f"Description of item {item_id} set",
             "Description set to " + new_description,
+            expected_version=expected_version,
         )
     except (MySQLError, Exception) as e:
         logger.error(f"Error setting description: {e}")
@@ -361,114 +1170,1198 @@ def set_description(current_user, item_name, new_description):
 
 
 @roles_required(["Admin", "Leadership"])
-def set_minimum_threshold(current_user, item_name, new_minimum_threshold):
+def set_minimum_threshold(
+    current_user, item_id, new_minimum_threshold, expected_version=None
+):
     """Sets the minimum threshold for an inventory item.
 
     Args:
         current_user (CurrentUser): The user performing the update.
-        item_name (str): The name of the item.
+        item_id (int): The ID of the item.
         new_minimum_threshold (int): The new minimum threshold value.
+        expected_version (int, optional): The row_version the user saw; the
+                                          update is refused if the item has
+                                          changed since.
 
     Raises:
         TypeError: If inputs are invalid.
+        VersionConflictError: If the item is no longer at expected_version.
         Exception: If a database error occurs.
     """
 
     try:
-        if not validators.is_non_empty_string(item_name):
-            raise TypeError("Item name must be a non-empty string")
+        if not validators.is_positive_int(item_id):
+            raise TypeError("Item ID must be a positive integer")
 
         if not validators.is_positive_int(new_minimum_threshold):
             raise TypeError("New minimum threshold must be a positive integer")
 
-        db_connection.execute_query(
-            "UPDATE inventory SET min_threshold = %s WHERE item_name = %s",
-            [new_minimum_threshold, item_name],
-        )
-
-        audit_log.update_audit_log(
+        perform_inventory_update(
             current_user,
-            item_name,
-            "UPDATE",
+            item_id,
+            "UPDATE inventory SET min_threshold = %s WHERE item_id = %s",
+            [new_minimum_threshold, item_id],
+            f"Minimum threshold of item {item_id} set",
             "Minimum threshold set to " + str(new_minimum_threshold),
+            expected_version=expected_version,
         )
     except (MySQLError, Exception) as e:
         logger.error(f"Error setting minimum threshold: {e}")
         raise
 
 
-@roles_required(["Admin", "Leadership", "General Responder"])
-def show_item(current_user, item_name):
+def _normalize_field(column, value):
+    """Converts a validated field value to the type stored in the database."""
+
+    if isinstance(value, str):
+        value = value.strip()
+
+        if value == "" and column in ("description", "expiration_date"):
+            return None
+
+    if column == "expiration_date" and isinstance(value, str):
+        return datetime.strptime(value, "%Y-%m-%d").date()
+
+    if column == "min_threshold" and value is not None:
+        return int(value)
+
+    return value
+
+
+@roles_required(["Admin", "Leadership"])
+def update_item(current_user, item_id, expected_version=None, **fields):
+    """Updates several fields of an inventory item at once.
+
+    Validates every field first, then writes only the columns whose value
+    actually changes with a single UPDATE and records one audit entry listing
+    the old and new values. The update only applies while the item is at the
+    version the old values were read from.
+
+    Args:
+        current_user (CurrentUser): The user performing the update.
+        item_id (int): The ID of the item.
+        expected_version (int, optional): The row_version the user saw. If
+                                          omitted, the item is re-read and the
+                                          update retried when it changes
+                                          meanwhile.
+        **fields: New values keyed by column: item_name, category, description,
+                  expiration_date (YYYY-MM-DD) and min_threshold. Empty
+                  description and expiration_date values clear the column.
+                  A new expiration date applies to all of the item's stock,
+                  as with set_expiration().
+
+    Returns:
+        dict: The changed columns, mapped to (old value, new value) tuples.
+              Empty if nothing changed.
+
+    Raises:
+        TypeError: If item_id or a field is invalid.
+        ValueError: If the item does not exist or another item already has the
+                    new name and category.
+        VersionConflictError: If the item is no longer at expected_version.
+        Exception: If a database error occurs.
+    """
+
+    try:
+        if not validators.is_positive_int(item_id):
+            raise TypeError("Item ID must be a positive integer")
+
+        unknown = set(fields) - set(EDITABLE_FIELDS)
+
+        if unknown:
+            raise TypeError(f"Fields cannot be updated: {', '.join(sorted(unknown))}")
+
+        for column, value in fields.items():
+            is_valid, message = EDITABLE_FIELDS[column]
+
+            if not is_valid(value):
+                raise TypeError(message)
+
+        if expected_version is not None:
+            if not validators.is_positive_int(expected_version):
+                raise TypeError("Expected version must be a positive integer")
+
+            expected_version = int(expected_version)
+
+        def update_once():
+            with db_connection.transaction():
+                current = _current_row(item_id)
+
+                if current is None:
+                    raise ValueError("Item not found")
+
+                if (
+                    expected_version is not None
+                    and current.row_version != expected_version
+                ):
+                    raise VersionConflictError(current)
+
+                old_values = {
+                    column: getattr(current, column) for column in EDITABLE_FIELDS
+                }
+                changes = {}
+
+                for column, value in fields.items():
+                    value = _normalize_field(column, value)
+
+                    if value != old_values[column]:
+                        changes[column] = (old_values[column], value)
+
+                if not changes:
+                    return {}
+
+                assignments = ", ".join(f"{column} = %s" for column in changes)
+
+                try:
+                    updated = db_connection.execute_query(
+                        f"UPDATE inventory SET {assignments} WHERE item_id = %s AND row_version = %s",
+                        [new for _, new in changes.values()]
+                        + [item_id, current.row_version],
+                    )
+                except db_connection.ConstraintViolationError:
+                    new_values = {
+                        **old_values,
+                        **{c: n for c, (_, n) in changes.items()},
+                    }
+
+                    raise ValueError(
+                        f"An item named {new_values['item_name']} already exists in {new_values['category']}"
+                    )
+
+                if not updated:
+                    _check_version(item_id, current.row_version)
+
+                if "expiration_date" in changes:
+                    _replace_lots([item_id])
+
+                audit_log.update_audit_log(
+                    current_user,
+                    old_values["item_name"],
+                    "UPDATE",
+                    json.dumps(
+                        {
+                            column: {"old": old, "new": new}
+                            for column, (old, new) in changes.items()
+                        },
+                        default=str,
+                    ),
+                )
+
+            _inventory_changed(item_id)
+            logger.info(f"Item {old_values['item_name']} updated: {', '.join(changes)}")
+
+            return changes
+
+        return _retry_conflicts(expected_version, update_once)
+    except (MySQLError, Exception) as e:
+        logger.error(f"Error updating item: {e}")
+        raise
+
+
+@roles_required(["Admin", "Leadership"])
+def transfer_stock(current_user, item_id, to_location_id, quantity):
+    """Moves stock of an item to another station or vehicle.
+
+    The stock leaves the item and is added to the item of the same name and
+    category at the destination, which is created (with the same description
+    and threshold) if the location does not stock it yet. The moved stock is
+    taken from the earliest-expiring lots and keeps their expiration dates.
+    Both quantities, their audit entries and their ledger entries change in one
+    transaction.
+
+    Args:
+        current_user (CurrentUser): The user moving the stock.
+        item_id (int): The ID of the item the stock is taken from.
+        to_location_id (int): The ID of the receiving location.
+        quantity (int): The quantity to move.
+
+    Returns:
+        int: The ID of the receiving item.
+
+    Raises:
+        TypeError: If parameters are invalid.
+        ValueError: If the item or location does not exist, the item is already
+                    at the location, or its quantity is insufficient.
+        Exception: If an error occurs during the update.
+    """
+
+    try:
+        if not validators.is_positive_int(item_id):
+            raise TypeError("Item ID must be a positive integer")
+
+        if not validators.is_positive_int(to_location_id):
+            raise TypeError("Location ID must be a positive integer")
+
+        if not validators.is_positive_int(quantity) or int(quantity) == 0:
+            raise TypeError("Quantity must be a positive integer")
+
+        item_id, to_location_id, quantity = (
+            int(item_id),
+            int(to_location_id),
+            int(quantity),
+        )
+
+        with db_connection.transaction():
+            source = db_connection.execute_query(
+                "SELECT item_name, category, description, min_threshold, location_id FROM inventory WHERE item_id = %s",
+                [item_id],
+                False,
+            )
+
+            if not source:
+                raise ValueError("Item not found")
+
+            item_name, category, description, min_threshold, from_location_id = source[
+                0
+            ]
+
+            if from_location_id == to_location_id:
+                raise ValueError("Item is already at that location")
+
+            destination = db_connection.execute_query(
+                "SELECT location_name FROM locations WHERE location_id = %s",
+                [to_location_id],
+                False,
+            )
+
+            if not destination:
+                raise ValueError("Location not found")
+
+            target = db_connection.execute_query(
+                "SELECT item_id FROM inventory WHERE location_id = %s AND item_name = %s AND category = %s",
+                [to_location_id, item_name, category],
+                False,
+            )
+
+            if target:
+                target_id = target[0][0]
+            else:
+                target_id = db_connection.execute_insert(
+                    "INSERT INTO inventory (location_id, item_name, category, description, quantity, min_threshold) VALUES (%s, %s, %s, %s, 0, %s)",
+                    [to_location_id, item_name, category, description, min_threshold],
+                )
+
+            # Both rows are locked in item_id order, so opposite transfers
+            # between two locations cannot deadlock.
+            db_connection.execute_query(
+                "SELECT item_id FROM inventory WHERE item_id IN (%s, %s) ORDER BY item_id FOR UPDATE",
+                [item_id, target_id],
+                False,
+            )
+
+            updated = db_connection.execute_query(
+                "UPDATE inventory SET quantity = quantity - %s WHERE item_id = %s AND quantity >= %s",
+                [quantity, item_id, quantity],
+            )
+
+            if not updated:
+                raise ValueError("Insufficient quantity: cannot decrease below 0")
+
+            db_connection.execute_query(
+                "UPDATE inventory SET quantity = quantity + %s WHERE item_id = %s",
+                [quantity, target_id],
+            )
+
+            moved = _consume_stock({item_id: quantity})[item_id]
+            missing = quantity - sum(lot_quantity for _, lot_quantity in moved)
+
+            for expiration_date, lot_quantity in moved + [(None, missing)]:
+                _receive_stock({target_id: lot_quantity}, expiration_date)
+
+            audit_log.update_audit_log_for_items(
+                current_user,
+                "UPDATE",
+                {
+                    item_id: f"Transferred {quantity} to {destination[0][0]}",
+                    target_id: f"Received {quantity} by transfer",
+                },
+            )
+            _record_movements(
+                current_user, "transfer", {item_id: -quantity, target_id: quantity}
+            )
+
+        _inventory_changed(item_id, target_id)
+        logger.info(
+            f"Transferred {quantity} of item {item_id} to location {to_location_id}"
+        )
+
+        return target_id
+    except (MySQLError, Exception) as e:
+        logger.error(f"Error transferring stock: {e}")
+        raise
+
+
+@roles_required(["Admin", "Leadership", "General Responder"])
+def show_item(current_user, item_id):
     """Retrieves details for a specific inventory item.
 
     Args:
         current_user (CurrentUser): The user requesting the item details.
-        item_name (str): The name of the item.
+        item_id (int): The ID of the item.
 
     Returns:
-        list: A list of item details or an empty list if an error occurs.
+        list: A list of InventoryItem rows or an empty list if an error occurs.
     """
 
     try:
-        if not validators.is_non_empty_string(item_name):
-            raise TypeError("Item name must be non-empty string")
-
-        item_contents = db_connection.execute_query(
-            "SELECT * FROM inventory WHERE item_name = %s", [item_name], False
+        if not validators.is_positive_int(item_id):
+            raise TypeError("Item ID must be a positive integer")
+
+        item_contents = _cached(
+            _item_cache,
+            int(item_id),
+            lambda: tuple(
+                db_connection.execute_query(
+                    f"SELECT {INVENTORY_ITEM_COLUMNS} FROM inventory WHERE item_id = %s",
+                    [item_id],
+                    False,
+                    row_class=InventoryItem,
+                )
+            ),
         )
 
-        return item_contents
+        return list(item_contents)
     except (MySQLError, Exception) as e:
         logger.error(f"Error retrieving item: {e}")
         return []
 
 
+@roles_required(["Admin", "Leadership", "General Responder"])
+def show_lots(current_user, item_id):
+    """Retrieves the stock lots of an inventory item.
+
+    Args:
+        current_user (CurrentUser): The user requesting the lots.
+        item_id (int): The ID of the item.
+
+    Returns:
+        list: InventoryLot rows in the order they are used up, earliest
+              expiration first. Returns an empty list if an error occurs.
+    """
+
+    try:
+        if not validators.is_positive_int(item_id):
+            raise TypeError("Item ID must be a positive integer")
+
+        return db_connection.execute_query(
+            f"SELECT lot_id, item_id, quantity, expiration_date, received_at FROM inventory_lots WHERE item_id = %s ORDER BY {LOT_ORDER}",
+            [item_id],
+            False,
+            row_class=InventoryLot,
+        )
+    except (MySQLError, Exception) as e:
+        logger.error(f"Error retrieving item lots: {e}")
+        return []
+
+
 @roles_required(["Admin"])
-def delete_item(current_user, item_name):
+def delete_item(current_user, item_id):
     """Deletes an inventory item from the database.
 
     Args:
         current_user (CurrentUser): The admin performing the deletion.
-        item_name (str): The name of the item to delete.
+        item_id (int): The ID of the item to delete.
 
     Raises:
-        TypeError: If item_name is not valid.
+        TypeError: If item_id is not valid.
+        ValueError: If the item does not exist.
         Exception: If a database error occurs.
     """
 
     try:
-        if not validators.is_non_empty_string(item_name):
-            raise TypeError("Item name must be non-empty string")
+        if not validators.is_positive_int(item_id):
+            raise TypeError("Item ID must be a positive integer")
+
+        with db_connection.transaction():
+            # Locked until the delete, so the closing ledger entry is exact.
+            current = db_connection.execute_query(
+                "SELECT quantity FROM inventory WHERE item_id = %s FOR UPDATE",
+                [item_id],
+                False,
+            )
 
-        db_connection.execute_query(
-            "DELETE FROM inventory WHERE item_name = %s", [item_name]
-        )
+            if not current:
+                raise ValueError("Item not found")
 
-        audit_log.update_audit_log(current_user, item_name, "DELETE", "Deleted item")
+            # Audited first, while the item name can still be read.
+            audit_log.update_audit_log_for_items(
+                current_user, "DELETE", {item_id: "Deleted item"}
+            )
+            # The remaining stock leaves the ledger with the item.
+            _record_movements(current_user, "delete", {item_id: -current[0][0]})
+
+            db_connection.execute_query(
+                "REPLACE INTO deleted_items (item_id, item_name, category) SELECT item_id, item_name, category FROM inventory WHERE item_id = %s",
+                [item_id],
+            )
+            db_connection.execute_query(
+                "DELETE FROM inventory_lots WHERE item_id = %s", [item_id]
+            )
+            db_connection.execute_query(
+                "DELETE FROM inventory WHERE item_id = %s", [item_id]
+            )
+
+        _inventory_changed(item_id)
     except (MySQLError, Exception) as e:
         logger.error(f"Error deleting item: {e}")
         raise
 
 
+def _keyset_condition(columns, descending):
+    """Builds the WHERE condition selecting the rows after a cursor.
+
+    Expands (a, b) > (x, y) into a > x OR (a = x AND b > y), which both
+    backends can serve from an index on the sort columns.
+    """
+
+    operator = "<" if descending else ">"
+    condition = f"{columns[-1]} {operator} %s"
+
+    for column in reversed(columns[:-1]):
+        condition = f"{column} {operator} %s OR ({column} = %s AND ({condition}))"
+
+    return f"({condition})"
+
+
+def _keyset_params(after):
+    params = [after[-1]]
+
+    for value in reversed(after[:-1]):
+        params = [value, value] + params
+
+    return params
+
+
 @roles_required(["Admin", "Leadership", "General Responder"])
-def show_all_inventory(current_user):
-    """Retrieves all inventory items and their details.
+def query_inventory(
+    current_user,
+    search=None,
+    category=None,
+    sort="name",
+    after=None,
+    limit=None,
+    location_id=None,
+):
+    """Retrieves one page of inventory items, filtered and sorted by the database.
+
+    Pages are read with keyset pagination: the cursor returned with a page
+    holds the sort values of its last row, and passing it back as after
+    continues right behind that row. Every page costs the same no matter how
+    deep into the listing it is, and rows inserted or deleted meanwhile do not
+    shift later pages. Rows do not include descriptions.
 
     Args:
         current_user (CurrentUser): The user requesting the inventory list.
+        search (str, optional): Text the item name or category must contain.
+        category (str, optional): Only return items of this category.
+        sort (str): A key of INVENTORY_SORTS, optionally prefixed with "-" for
+                    descending order. Defaults to "name".
+        after (tuple, optional): The cursor returned with the previous page.
+        limit (int, optional): Maximum number of rows, up to
+                               INVENTORY_MAX_PAGE_SIZE. Defaults to
+                               INVENTORY_PAGE_SIZE.
+        location_id (int, optional): Only return the items of this location.
 
     Returns:
-        list: A list of inventory items or an empty list if an error occurs.
+        tuple: (items, next_cursor) where items is a list of InventoryItem rows
+               and next_cursor is None on the last page. Returns ([], None) if
+               an error occurs.
     """
 
     try:
-        table_contents = db_connection.execute_query(
-            "SELECT item_name, category, description, quantity, expiration_date, min_threshold, last_updated FROM inventory",
+        descending = sort.startswith("-")
+        columns = INVENTORY_SORTS.get(sort.lstrip("-"))
+
+        if columns is None:
+            raise ValueError(f"Unknown sort order: {sort}")
+
+        if limit is None:
+            limit = INVENTORY_PAGE_SIZE
+        elif not validators.is_positive_int(limit):
+            raise TypeError("Limit must be a positive integer")
+
+        limit = min(int(limit), INVENTORY_MAX_PAGE_SIZE)
+        conditions = []
+        params = []
+
+        if location_id is not None:
+            if not validators.is_positive_int(location_id):
+                raise TypeError("Location ID must be a positive integer")
+
+            conditions.append("location_id = %s")
+            params.append(location_id)
+
+        if search:
+            # "!" escapes LIKE wildcards typed by the user on both backends.
+            pattern = (
+                "%"
+                + search.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+                + "%"
+            )
+            conditions.append(
+                "(item_name LIKE %s ESCAPE '!' OR category LIKE %s ESCAPE '!')"
+            )
+            params += [pattern, pattern]
+
+        if category:
+            conditions.append("category = %s")
+            params.append(category)
+
+        if after is not None:
+            if len(after) != len(columns):
+                raise ValueError("Cursor does not match the sort order")
+
+            conditions.append(_keyset_condition(columns, descending))
+            params += _keyset_params(list(after))
+
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        direction = " DESC" if descending else ""
+        order_by = ", ".join(column + direction for column in columns)
+
+        def load():
+            # One extra row tells whether another page follows.
+            items = db_connection.execute_query(
+                f"SELECT {INVENTORY_LIST_COLUMNS} FROM inventory{where} ORDER BY {order_by} LIMIT %s",
+                params + [limit + 1],
+                False,
+                row_class=InventoryItem,
+            )
+
+            if len(items) <= limit:
+                return tuple(items), None
+
+            items = items[:limit]
+
+            return tuple(items), tuple(getattr(items[-1], c) for c in columns)
+
+        key = (
+            "page",
+            search,
+            category,
+            sort,
+            after and tuple(after),
+            limit,
+            location_id,
+        )
+        items, next_cursor = _cached(_listing_cache, key, load)
+
+        return list(items), next_cursor
+    except (MySQLError, Exception) as e:
+        logger.error(f"Database error querying inventory: {e}")
+        return [], None
+
+
+@roles_required(["Admin", "Leadership", "General Responder"])
+def search_inventory(
+    current_user, query, limit=SEARCH_RESULTS_LIMIT, category=None, location_id=None
+):
+    """Searches item names and descriptions, returning the best matches first.
+
+    Every word of the query must appear in the item's name or description. On
+    MySQL words match anywhere inside a word ("ped" finds "orthopedic"); the
+    in-memory index used by other backends matches the start of words.
+
+    Args:
+        current_user (CurrentUser): The user searching the inventory.
+        query (str): The search text, e.g. "pediatric 14g".
+        limit (int): Maximum number of results, up to INVENTORY_MAX_PAGE_SIZE.
+                     Defaults to SEARCH_RESULTS_LIMIT.
+        category (str, optional): Only return items of this category.
+        location_id (int, optional): Only return the items of this location.
+
+    Returns:
+        list: InventoryItem rows without descriptions, ordered by relevance.
+              Returns an empty list if nothing matches or an error occurs.
+    """
+
+    try:
+        if not validators.is_positive_int(limit):
+            raise TypeError("Limit must be a positive integer")
+
+        limit = min(int(limit), INVENTORY_MAX_PAGE_SIZE)
+        terms = query_terms(query or "")
+
+        if not terms:
+            return []
+
+        if db_connection.init_pool().name == "mysql":
+            filters = ""
+            filter_params = []
+
+            if category:
+                filters += " AND category = %s"
+                filter_params.append(category)
+
+            if location_id is not None:
+                filters += " AND location_id = %s"
+                filter_params.append(location_id)
+
+            # Terms only hold letters and digits, so quoting them is safe. A
+            # quoted term is matched as a sequence of ngrams.
+            against = " ".join(f'+"{term}"' for term in terms)
+
+            return db_connection.execute_query(
+                f"SELECT {INVENTORY_LIST_COLUMNS} FROM inventory WHERE MATCH(item_name, description) AGAINST (%s IN BOOLEAN MODE){filters} ORDER BY MATCH(item_name, description) AGAINST (%s IN BOOLEAN MODE) DESC, item_id LIMIT %s",
+                [against] + filter_params + [against, limit],
+                False,
+                row_class=InventoryItem,
+            )
+
+        _check_high_water_mark()
+        _refresh_search_index()
+        ranked = _search_index.search(query, limit, category, location_id)
+
+        if not ranked:
+            return []
+
+        item_ids = [item_id for item_id, _ in ranked]
+        items = {
+            item.item_id: item
+            for item in db_connection.execute_query(
+                f"SELECT {INVENTORY_LIST_COLUMNS} FROM inventory WHERE item_id IN ({', '.join(['%s'] * len(item_ids))})",
+                item_ids,
+                False,
+                row_class=InventoryItem,
+            )
+        }
+
+        return [items[item_id] for item_id in item_ids if item_id in items]
+    except (MySQLError, Exception) as e:
+        logger.error(f"Inventory search error: {e}")
+        return []
+
+
+@roles_required(["Admin", "Leadership", "General Responder"])
+def inventory_changes_since(current_user, cursor=None, location_id=None):
+    """Returns the inventory items changed or deleted since a cursor.
+
+    Lets a client keep a local copy of the inventory current without reading
+    the whole table: the first call (without a cursor) returns every item, and
+    each later call passes the cursor returned by the one before. Changes are
+    found through last_updated and the deleted_items tombstones written by
+    delete_item(). Changes near the cursor may be returned again, so applying a
+    result must be idempotent (replace items by item_id).
+
+    Args:
+        current_user (CurrentUser): The user requesting the changes.
+        cursor (datetime, optional): The cursor returned by the previous call.
+        location_id (int, optional): Only return the items of this location.
+                                     Deleted IDs are not filtered; IDs unknown
+                                     to the client can be ignored.
+
+    Returns:
+        dict: "upserts" (InventoryItem rows to add or replace), "deleted" (IDs
+              of deleted items) and "cursor" (to pass to the next call).
+
+    Raises:
+        TypeError: If the cursor is not a datetime.
+        Exception: If a database error occurs.
+    """
+
+    try:
+        if cursor is not None and not isinstance(cursor, datetime):
+            raise TypeError("Cursor must be a value returned by this function")
+
+        if location_id is not None and not validators.is_positive_int(location_id):
+            raise TypeError("Location ID must be a positive integer")
+
+        location_filter = "location_id = %s" if location_id is not None else ""
+        location_params = [location_id] if location_id is not None else []
+
+        # Both reads run in one read-only transaction (an explicit BEGIN on
+        # SQLite), so they see the same snapshot and no change falls between them.
+        with db_connection.transaction(write=False):
+            if cursor is None:
+                upserts = db_connection.execute_query(
+                    f"SELECT {INVENTORY_ITEM_COLUMNS} FROM inventory"
+                    + (f" WHERE {location_filter}" if location_filter else ""),
+                    location_params or None,
+                    False,
+                    row_class=InventoryItem,
+                )
+                deleted = []
+            else:
+                since = cursor - CHANGE_FEED_OVERLAP
+                upserts = db_connection.execute_query(
+                    f"SELECT {INVENTORY_ITEM_COLUMNS} FROM inventory WHERE last_updated >= %s"
+                    + (f" AND {location_filter}" if location_filter else "")
+                    + " ORDER BY last_updated, item_id",
+                    [since] + location_params,
+                    False,
+                    row_class=InventoryItem,
+                )
+                deleted = db_connection.execute_query(
+                    "SELECT item_id, deleted_at FROM deleted_items WHERE deleted_at >= %s ORDER BY deleted_at, item_id",
+                    [since],
+                    False,
+                )
+
+        next_cursor = max(
+            [item.last_updated for item in upserts]
+            + [deleted_at for _, deleted_at in deleted],
+            default=cursor,
+        )
+
+        return {
+            "upserts": upserts,
+            "deleted": [item_id for item_id, _ in deleted],
+            "cursor": next_cursor,
+        }
+    except (MySQLError, Exception) as e:
+        logger.error(f"Error reading inventory changes: {e}")
+        raise
+
+
+def _file_format(path, file_format):
+    if file_format is None:
+        file_format = FILE_FORMATS.get(os.path.splitext(path)[1].lower())
+
+    if file_format not in ("csv", "jsonl"):
+        raise ValueError("File must be a .csv or .jsonl file")
+
+    return file_format
+
+
+def _read_records(file, file_format):
+    """Yields (line number, record) pairs from an open import file.
+
+    A record is a dictionary of column to value, or an error message string for
+    a line that cannot be parsed.
+    """
+
+    if file_format == "csv":
+        reader = csv.DictReader(file)
+
+        for record in reader:
+            if None in record:
+                yield reader.line_num, "Row has more values than the header"
+            else:
+                yield reader.line_num, record
+
+        return
+
+    for line_number, line in enumerate(file, 1):
+        if not line.strip():
+            continue
+
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_number, f"Invalid JSON: {e}"
+            continue
+
+        if isinstance(record, dict):
+            yield line_number, record
+        else:
+            yield line_number, "Line must hold a JSON object"
+
+
+def _is_whole_number(value):
+    # JSON may hold true or 2.5, which int() would silently accept.
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        return False
+
+    return validators.is_positive_int(value)
+
+
+def _validate_record(record, location_ids, default_location_id):
+    """Checks one import record and converts it to insert parameters.
+
+    Args:
+        record (dict): The record read from the file.
+        location_ids (set): The IDs of the existing locations.
+        default_location_id (int): The location of records without one.
+
+    Returns:
+        tuple: (params, None) for a valid record, or (None, error message).
+    """
+
+    unknown = set(record) - set(EXPORT_COLUMNS)
+
+    if unknown:
+        return None, f"Unknown column(s): {', '.join(sorted(unknown))}"
+
+    # CSV files hold empty strings where JSON would hold null.
+    values = {
+        column: None if record.get(column) in (None, "") else record[column]
+        for column in IMPORT_COLUMNS
+    }
+
+    for column in ("item_name", "category"):
+        if not validators.is_non_empty_string(values[column]):
+            return None, f"{column} must be a non-empty string"
+
+        values[column] = values[column].strip()
+
+    if not _is_whole_number(values["quantity"]):
+        return None, "quantity must be a positive integer"
+
+    if values["min_threshold"] is not None:
+        if not _is_whole_number(values["min_threshold"]):
+            return None, "min_threshold must be a positive integer"
+
+        values["min_threshold"] = int(values["min_threshold"])
+
+    if values["expiration_date"] is not None and not validators.is_valid_date(
+        values["expiration_date"]
+    ):
+        return None, "expiration_date must be formatted YYYY-MM-DD"
+
+    if values["description"] is not None and not isinstance(values["description"], str):
+        return None, "description must be a string"
+
+    if values["location_id"] is None:
+        values["location_id"] = default_location_id
+    elif not _is_whole_number(values["location_id"]) or (
+        int(values["location_id"]) not in location_ids
+    ):
+        return None, "location_id must be the ID of an existing location"
+    else:
+        values["location_id"] = int(values["location_id"])
+
+    values["quantity"] = int(values["quantity"])
+
+    return [values[column] for column in IMPORT_COLUMNS], None
+
+
+@roles_required(["Admin"])
+def import_inventory(
+    current_user,
+    file_path,
+    file_format=None,
+    chunk_size=IMPORT_CHUNK_SIZE,
+    location_id=locations.DEFAULT_LOCATION_ID,
+):
+    """Imports inventory items from a CSV or JSON Lines file.
+
+    The file is streamed and imported in chunks of chunk_size rows: each chunk
+    is upserted with multi-row INSERT ... ON DUPLICATE KEY UPDATE statements
+    and audited with a single entry, in one transaction. Items are matched on
+    location, name and category; existing items take the file's description, quantity,
+    expiration date and threshold. The stock of items whose quantity or
+    expiration date changes becomes a single lot. Invalid rows are skipped and
+    reported.
+
+    CSV files need a header row naming the columns; JSON Lines files hold one
+    object per line. item_name, category and quantity are required;
+    description, expiration_date (YYYY-MM-DD), min_threshold and location_id
+    are optional.
+
+    Args:
+        current_user (CurrentUser): The admin performing the import.
+        file_path (str): Path of the file to import.
+        file_format (str, optional): "csv" or "jsonl". Defaults to the format
+                                     given by the file extension.
+        chunk_size (int, optional): Rows per transaction. Defaults to
+                                    IMPORT_CHUNK_SIZE.
+        location_id (int, optional): Location of the rows without a
+                                     location_id. Defaults to the main station.
+
+    Returns:
+        dict: "imported" (rows written), "failed" (rows skipped) and "errors"
+              (up to MAX_IMPORT_ERRORS (line number, message) pairs).
+
+    Raises:
+        ValueError: If the file format or chunk size is not supported.
+        Exception: If the file cannot be read or a chunk fails to import.
+                   Chunks imported before the failure are kept.
+    """
+
+    try:
+        file_format = _file_format(file_path, file_format)
+
+        if not isinstance(chunk_size, int) or chunk_size <= 0:
+            raise ValueError("Chunk size must be a positive integer")
+
+        location_ids = {
+            location.location_id for location in locations.show_locations(current_user)
+        }
+
+        if location_id not in location_ids:
+            raise ValueError("Location not found")
+
+        report = {"imported": 0, "failed": 0, "errors": []}
+        source = os.path.basename(file_path)
+
+        def import_chunk(rows, first_line, last_line):
+            names = list({row[0] for row in rows})
+
+            def stock(lock):
+                # Items are found by name through the (item_name, category) index.
+                # Items of other categories or locations come along unchanged, so
+                # they add no ledger entries and keep their lots.
+                return {
+                    item_id: (quantity, expiration_date)
+                    for item_id, quantity, expiration_date in db_connection.execute_query(
+                        f"SELECT item_id, quantity, expiration_date FROM inventory WHERE item_name IN ({', '.join(['%s'] * len(names))}){' FOR UPDATE' if lock else ''}",
+                        names,
+                        False,
+                    )
+                }
+
+            with db_connection.transaction():
+                # Stock before and after the upsert gives the ledger entries. The
+                # locking read (the write lock on SQLite) keeps "before" exact
+                # until the upsert.
+                before = stock(lock=True)
+                db_connection.execute_many(
+                    "INSERT INTO inventory (item_name, category, description, quantity, expiration_date, min_threshold, location_id) VALUES (%s, %s, %s, %s, %s, %s, %s) ON DUPLICATE KEY UPDATE description = VALUES(description), quantity = VALUES(quantity), expiration_date = VALUES(expiration_date), min_threshold = VALUES(min_threshold)",
+                    rows,
+                    chunk_size=len(rows),
+                )
+                audit_log.update_audit_log(
+                    current_user,
+                    "inventory import",
+                    "UPDATE",
+                    f"Imported {len(rows)} items from {source} (lines {first_line}-{last_line})",
+                )
+                after = stock(lock=False)
+                _record_movements(
+                    current_user,
+                    "import",
+                    {
+                        item_id: quantity - before.get(item_id, (0, None))[0]
+                        for item_id, (quantity, _) in after.items()
+                    },
+                )
+                _replace_lots(
+                    [
+                        item_id
+                        for item_id, values in after.items()
+                        if before.get(item_id) != values
+                    ]
+                )
+
+            report["imported"] += len(rows)
+
+        try:
+            with open(file_path, newline="", encoding="utf-8-sig") as file:
+                rows = []
+                first_line = None
+
+                for line_number, record in _read_records(file, file_format):
+                    params, error = (
+                        (None, record)
+                        if isinstance(record, str)
+                        else _validate_record(record, location_ids, location_id)
+                    )
+
+                    if error is not None:
+                        report["failed"] += 1
+
+                        if len(report["errors"]) < MAX_IMPORT_ERRORS:
+                            report["errors"].append((line_number, error))
+
+                        continue
+
+                    rows.append(params)
+                    first_line = first_line or line_number
+
+                    if len(rows) >= chunk_size:
+                        import_chunk(rows, first_line, line_number)
+                        rows = []
+                        first_line = None
+
+                if rows:
+                    import_chunk(rows, first_line, line_number)
+        finally:
+            if report["imported"]:
+                _inventory_changed()
+
+        logger.info(
+            f"Imported {report['imported']} items from {source}, skipped {report['failed']} rows"
+        )
+
+        return report
+    except (MySQLError, Exception) as e:
+        logger.error(f"Error importing inventory: {e}")
+        raise
+
+
+@roles_required(["Admin", "Leadership"])
+def export_inventory(current_user, file_path, file_format=None):
+    """Exports the inventory to a CSV or JSON Lines file.
+
+    Items are streamed from the database straight into the file, so the
+    inventory is never held in memory as a whole. The file can be imported
+    again with import_inventory().
+
+    Args:
+        current_user (CurrentUser): The user performing the export.
+        file_path (str): Path of the file to write.
+        file_format (str, optional): "csv" or "jsonl". Defaults to the format
+                                     given by the file extension.
+
+    Returns:
+        int: The number of items exported.
+
+    Raises:
+        ValueError: If the file format is not supported.
+        Exception: If an error occurs during file or database operations.
+    """
+
+    try:
+        file_format = _file_format(file_path, file_format)
+        items = db_connection.stream_query(
+            f"SELECT {', '.join(EXPORT_COLUMNS)} FROM inventory ORDER BY item_id",
+            row_class=InventoryItem,
+        )
+        count = 0
+
+        with open(file_path, "w", newline="", encoding="utf-8") as file:
+            if file_format == "csv":
+                writer = csv.writer(file)
+                writer.writerow(EXPORT_COLUMNS)
+
+                for item in items:
+                    writer.writerow(
+                        [
+                            "" if value is None else value
+                            for value in (getattr(item, c) for c in EXPORT_COLUMNS)
+                        ]
+                    )
+                    count += 1
+            else:
+                for item in items:
+                    record = {c: getattr(item, c) for c in EXPORT_COLUMNS}
+                    file.write(json.dumps(record, default=str) + "\n")
+                    count += 1
+
+        logger.info(f"Exported {count} items to {file_path}")
+
+        return count
+    except (MySQLError, Exception) as e:
+        logger.error(f"Error exporting inventory: {e}")
+        raise
+
+
+@roles_required(["Admin", "Leadership"])
+def stock_usage(current_user, since, until=None):
+    """Totals the stock consumed per item over a period, from the ledger.
+
+    Consumption is every decrease and negative adjustment; corrections made with
+    set_quantity and deletions are not counted.
+
+    Args:
+        current_user (CurrentUser): The user requesting the report.
+        since (datetime): Start of the period.
+        until (datetime, optional): End of the period (exclusive). Defaults to now.
+
+    Returns:
+        list: (item_id, item_name, quantity_used) tuples, most used first.
+              Returns an empty list if an error occurs.
+    """
+
+    try:
+        period = "m.moved_at >= %s" + (" AND m.moved_at < %s" if until else "")
+        params = [since] + ([until] if until else [])
+
+        return db_connection.execute_query(
+            f"SELECT m.item_id, COALESCE(i.item_name, d.item_name), SUM(-m.delta) AS used FROM stock_movements m LEFT JOIN inventory i ON i.item_id = m.item_id LEFT JOIN deleted_items d ON d.item_id = m.item_id WHERE {period} AND m.reason IN ('decrease', 'adjust') AND m.delta < 0 GROUP BY m.item_id, COALESCE(i.item_name, d.item_name) ORDER BY used DESC, m.item_id",
+            params,
+            False,
+        )
+    except (MySQLError, Exception) as e:
+        logger.error(f"Error reading stock usage: {e}")
+        return []
+
+
+@roles_required(["Admin", "Leadership"])
+def verify_stock_ledger(current_user):
+    """Checks every item's quantity against the sum of its stock movements.
+
+    Runs as one aggregate pass over the ledger, so it can be scheduled
+    periodically.
+
+    Args:
+        current_user (CurrentUser): The user running the check.
+
+    Returns:
+        list: (item_id, item_name, quantity, ledger_total) for each item whose
+              quantity differs from its ledger; empty if all items agree.
+
+    Raises:
+        Exception: If a database error occurs.
+    """
+
+    try:
+        mismatches = db_connection.execute_query(
+            "SELECT i.item_id, i.item_name, i.quantity, COALESCE(m.total, 0) FROM inventory i LEFT JOIN (SELECT item_id, SUM(delta) AS total FROM stock_movements GROUP BY item_id) m ON m.item_id = i.item_id WHERE i.quantity <> COALESCE(m.total, 0)",
             None,
             False,
         )
+        mismatches = [
+            (item_id, item_name, quantity, int(total))
+            for item_id, item_name, quantity, total in mismatches
+        ]
+
+        if mismatches:
+            logger.warning(
+                f"Stock ledger disagrees with {len(mismatches)} item quantities"
+            )
+
+        return mismatches
+    except (MySQLError, Exception) as e:
+        logger.error(f"Error verifying stock ledger: {e}")
+        raise
+
+
+@roles_required(["Admin", "Leadership", "General Responder"])
+def show_all_inventory(current_user, location_id=None):
+    """Retrieves all inventory items and their details.
+
+    Args:
+        current_user (CurrentUser): The user requesting the inventory list.
+        location_id (int, optional): Only return the items of this location.
+
+    Returns:
+        list: A list of InventoryItem rows or an empty list if an error occurs.
+    """
+
+    try:
+        if location_id is not None and not validators.is_positive_int(location_id):
+            raise TypeError("Location ID must be a positive integer")
+
+        where = " WHERE location_id = %s" if location_id is not None else ""
+        table_contents = _cached(
+            _listing_cache,
+            ("all", location_id),
+            lambda: tuple(
+                db_connection.execute_query(
+                    f"SELECT {INVENTORY_ITEM_COLUMNS} FROM inventory{where}",
+                    [location_id] if location_id is not None else None,
+                    False,
+                    row_class=InventoryItem,
+                )
+            ),
+        )
 
-        return table_contents
+        return list(table_contents)
     except (MySQLError, Exception) as e:
         logger.error(f"Database error retrieving inventory: {e}")
         return []
+
+
+# Asyncio counterparts; each runs the blocking function on the database thread pool.
+add_inventory_item_async = db_connection.to_async(add_inventory_item)
+increase_item_async = db_connection.to_async(increase_item)
+decrease_item_async = db_connection.to_async(decrease_item)
+apply_adjustments_async = db_connection.to_async(apply_adjustments)
+transfer_stock_async = db_connection.to_async(transfer_stock)
+set_quantity_async = db_connection.to_async(set_quantity)
+set_expiration_async = db_connection.to_async(set_expiration)
+set_category_async = db_connection.to_async(set_category)
+set_description_async = db_connection.to_async(set_description)
+set_minimum_threshold_async = db_connection.to_async(set_minimum_threshold)
+update_item_async = db_connection.to_async(update_item)
+show_item_async = db_connection.to_async(show_item)
+show_lots_async = db_connection.to_async(show_lots)
+delete_item_async = db_connection.to_async(delete_item)
+query_inventory_async = db_connection.to_async(query_inventory)
+search_inventory_async = db_connection.to_async(search_inventory)
+inventory_changes_since_async = db_connection.to_async(inventory_changes_since)
+stock_usage_async = db_connection.to_async(stock_usage)
+verify_stock_ledger_async = db_connection.to_async(verify_stock_ledger)
+import_inventory_async = db_connection.to_async(import_inventory)
+export_inventory_async = db_connection.to_async(export_inventory)
+show_all_inventory_async = db_connection.to_async(show_all_inventory)
@@ -0,0 +1,103 @@
+"""
+Module for inventory locations.
+
+Provides functions for adding and listing the stations and vehicles that hold
+inventory. Every inventory item belongs to one location; items of the same name
+at different locations are separate items.
+"""
+
+import os
+import sys
+
+# Append the parent directory to the system path.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import utils.db_connection as db_connection
+import api.audit_log as audit_log
+import logging
+import utils.validators as validators
+from utils.decorators import roles_required
+from utils.db_rows import Location
+from mysql.connector import Error as MySQLError
+
+logger = logging.getLogger(__name__)
+
+LOCATION_TYPES = ("Station", "Vehicle")
+
+# Location created by migration 8 that holds the items added before locations.
+DEFAULT_LOCATION_ID = 1
+
+
+@roles_required(["Admin"])
+def add_location(current_user, location_name, location_type="Station"):
+    """Adds a new station or vehicle.
+
+    Args:
+        current_user (CurrentUser): The admin performing the operation.
+        location_name (str): The unique name of the location, e.g. "Medic 2".
+        location_type (str): One of LOCATION_TYPES. Defaults to "Station".
+
+    Returns:
+        int: The ID of the new location, or None if the name is already taken.
+
+    Raises:
+        TypeError: If any input is invalid.
+        Exception: If a database error occurs.
+    """
+
+    try:
+        if not validators.is_non_empty_string(location_name):
+            raise TypeError("Location name must be a non-empty string")
+
+        if location_type not in LOCATION_TYPES:
+            raise TypeError(f"Location type must be one of {', '.join(LOCATION_TYPES)}")
+
+        with db_connection.transaction():
+            location_id = db_connection.execute_insert(
+                "INSERT IGNORE INTO locations (location_name, location_type) VALUES (%s, %s)",
+                [location_name.strip(), location_type],
+            )
+
+            if location_id is None:
+                logger.info(f"Location {location_name} already exists")
+
+                return None
+
+            audit_log.update_audit_log(
+                current_user, location_name, "ADD", f"Added {location_type.lower()}"
+            )
+
+        logger.info(f"Location {location_name} added")
+
+        return location_id
+    except (MySQLError, Exception) as e:
+        logger.error(f"Error adding location: {e}")
+        raise
+
+
+@roles_required(["Admin", "Leadership", "General Responder"])
+def show_locations(current_user):
+    """Retrieves every location, ordered by name.
+
+    Args:
+        current_user (CurrentUser): The user requesting the locations.
+
+    Returns:
+        list: Location rows, or an empty list if an error occurs.
+    """
+
+    try:
+        return db_connection.execute_query(
+            "SELECT location_id, location_name, location_type FROM locations ORDER BY location_name",
+            None,
+            False,
+            row_class=Location,
+        )
+    except (MySQLError, Exception) as e:
+        logger.error(f"Error retrieving locations: {e}")
+        return []
+
+
+# Asyncio counterparts; each runs the blocking function on the database thread pool.
+add_location_async = db_connection.to_async(add_location)
+show_locations_async = db_connection.to_async(show_locations)
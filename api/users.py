@@ -17,6 +17,7 @@ import api.audit_log as audit_log
 import utils.validators as validators
 import logging
 from utils.decorators import roles_required
+from utils.db_rows import UserRecord
 from mysql.connector import Error as MySQLError
 
 logger = logging.getLogger(__name__)
@@ -69,29 +70,34 @@ def add_user(current_user, target_user, password, role, email):
         if not validators.is_valid_email(email):
             raise TypeError("Email is not valid")
 
-        user_name_count = db_connection.execute_query(
-            "SELECT COUNT(*) AS user_rows FROM users WHERE username = %s",
-            [target_user],
-            False,
-        )
-        user_name_count = user_name_count[0][0]
-
-        if user_name_count == 0:
-            db_connection.execute_query(
-                "INSERT INTO users (username, role, email, password_encrypted) VALUES(%s, %s, %s, %s)",
-                [
-                    target_user,
-                    role,
-                    email,
-                    encryption.encrypt_data(password),
-                ],
+        with db_connection.transaction():
+            user_name_count = db_connection.execute_query(
+                "SELECT COUNT(*) AS user_rows FROM users WHERE username = %s",
+                [target_user],
+                False,
             )
+            user_name_count = user_name_count[0][0]
+
+            if user_name_count == 0:
+                db_connection.execute_query(
+                    "INSERT INTO users (username, role, email, password_encrypted) VALUES(%s, %s, %s, %s)",
+                    [
+                        target_user,
+                        role,
+                        email,
+                        encryption.encrypt_data(password),
+                    ],
+                )
 
-        else:
-            logger.info(
-                "User " + target_user + " already exists. Consider updating instead."
+            else:
+                logger.info(
+                    "User "
+                    + target_user
+                    + " already exists. Consider updating instead."
+                )
+            audit_log.update_audit_log(
+                current_user, target_user, "ADD", "New user added"
             )
-        audit_log.update_audit_log(current_user, target_user, "ADD", "New user added")
     except (MySQLError, Exception) as e:
         logger.error(f"Error adding user: {e}")
         raise
@@ -118,14 +124,15 @@ def change_user_role(current_user, target_user, new_role):
         if not validators.is_valid_role(new_role):
             raise TypeError("Role is not valid")
 
-        db_connection.execute_query(
-            "UPDATE users SET role = %s WHERE username = %s",
-            [new_role, target_user],
-        )
+        with db_connection.transaction():
+            db_connection.execute_query(
+                "UPDATE users SET role = %s WHERE username = %s",
+                [new_role, target_user],
+            )
 
-        audit_log.update_audit_log(
-            current_user, target_user, "UPDATE", "Set user role to " + new_role
-        )
+            audit_log.update_audit_log(
+                current_user, target_user, "UPDATE", "Set user role to " + new_role
+            )
     except (MySQLError, Exception) as e:
         logger.error(f"Error changing user role: {e}")
         raise
@@ -148,11 +155,14 @@ def delete_user(current_user, target_user):
         if not validators.is_non_empty_string(target_user):
             raise TypeError("Target user must be non-empty string")
 
-        db_connection.execute_query(
-            "DELETE FROM users WHERE username = %s", [target_user]
-        )
+        with db_connection.transaction():
+            db_connection.execute_query(
+                "DELETE FROM users WHERE username = %s", [target_user]
+            )
 
-        audit_log.update_audit_log(current_user, target_user, "DELETE", "Deleted user")
+            audit_log.update_audit_log(
+                current_user, target_user, "DELETE", "Deleted user"
+            )
     except (MySQLError, Exception) as e:
         logger.error(f"Error deleting user: {e}")
         raise
@@ -192,10 +202,8 @@ def login(username, password):
 
         if user_details and len(user_details) > 0:
             if encryption.decrypt_data(user_details[0][0]) == password:
-                current_user = get_user(username)[0]
-                current_user = CurrentUser(
-                    current_user[1], current_user[3], current_user[4]
-                )
+                user = get_user(username)[0]
+                current_user = CurrentUser(user.username, user.role, user.email)
                 audit_log.update_audit_log(
                     current_user, current_user.username, "LOGIN", "Logged in"
                 )
@@ -219,7 +227,7 @@ def get_user(username):
         username (str): The username to retrieve.
 
     Returns:
-        list: A list containing user details or an empty list if not found.
+        list: A list containing the UserRecord or an empty list if not found.
 
     Raises:
         TypeError: If username is not a non-empty string.
@@ -231,7 +239,10 @@ def get_user(username):
             raise TypeError("Username must be non-empty string")
 
         user_list = db_connection.execute_query(
-            "SELECT * FROM users WHERE username = %s", [username], False
+            "SELECT user_id, username, role, email, created_at, updated_at FROM users WHERE username = %s",
+            [username],
+            False,
+            row_class=UserRecord,
         )
 
         return user_list
@@ -250,7 +261,7 @@ def view_user(current_user, target_user):
         target_user (str): The username of the user to view.
 
     Returns:
-        list: A list of details for the specified user.
+        list: A list containing the UserRecord of the specified user.
               Returns an empty list if any error occurs.
 
     Raises:
@@ -266,6 +277,7 @@ def view_user(current_user, target_user):
             "SELECT user_id, username, role, email, created_at, updated_at FROM users WHERE username = %s",
             [target_user],
             False,
+            row_class=UserRecord,
         )
 
         return user_list
@@ -291,17 +303,18 @@ def change_user_password(current_user, new_password):
         if not validators.is_non_empty_string(new_password):
             raise TypeError("Password must be non-empty string")
 
-        db_connection.execute_query(
-            "UPDATE users SET password_encrypted = %s WHERE username = %s",
-            [encryption.encrypt_data(new_password), current_user.username],
-        )
+        with db_connection.transaction():
+            db_connection.execute_query(
+                "UPDATE users SET password_encrypted = %s WHERE username = %s",
+                [encryption.encrypt_data(new_password), current_user.username],
+            )
 
-        audit_log.update_audit_log(
-            current_user,
-            current_user.username,
-            "UPDATE",
-            "Password changed",
-        )
+            audit_log.update_audit_log(
+                current_user,
+                current_user.username,
+                "UPDATE",
+                "Password changed",
+            )
     except (MySQLError, Exception) as e:
         logger.error(f"Error changing password: {e}")
         raise
@@ -323,17 +336,18 @@ def change_user_username(current_user, new_username):
         if not validators.is_non_empty_string(new_username):
             raise TypeError("Username must be non-empty string")
 
-        db_connection.execute_query(
-            "UPDATE users SET username = %s WHERE username = %s",
-            [new_username, current_user.username],
-        )
+        with db_connection.transaction():
+            db_connection.execute_query(
+                "UPDATE users SET username = %s WHERE username = %s",
+                [new_username, current_user.username],
+            )
 
-        audit_log.update_audit_log(
-            current_user,
-            current_user.username,
-            "UPDATE",
-            "Changed username to " + new_username,
-        )
+            audit_log.update_audit_log(
+                current_user,
+                current_user.username,
+                "UPDATE",
+                "Changed username to " + new_username,
+            )
     except (MySQLError, Exception) as e:
         logger.error(f"Error changing username: {e}")
         raise
@@ -355,17 +369,18 @@ def change_user_email(current_user, new_email):
         if not validators.is_valid_email(new_email):
             raise TypeError("Username must be non-empty string")
 
-        db_connection.execute_query(
-            "UPDATE users SET email = %s WHERE username = %s",
-            [new_email, current_user.username],
-        )
+        with db_connection.transaction():
+            db_connection.execute_query(
+                "UPDATE users SET email = %s WHERE username = %s",
+                [new_email, current_user.username],
+            )
 
-        audit_log.update_audit_log(
-            current_user,
-            current_user.username,
-            "UPDATE",
-            "Changed email to " + new_email,
-        )
+            audit_log.update_audit_log(
+                current_user,
+                current_user.username,
+                "UPDATE",
+                "Changed email to " + new_email,
+            )
     except (MySQLError, Exception) as e:
         logger.error(f"Error changing email: {e}")
         raise
@@ -379,7 +394,7 @@ def show_all_users(current_user):
         current_user (CurrentUser): The admin requesting this list.
 
     Returns:
-        list: A list containing the details of all users.
+        list: A list of UserRecord rows for all users.
               Returns an empty list if any error occurs.
     """
 
@@ -388,6 +403,7 @@ def show_all_users(current_user):
             "SELECT user_id, username, role, email, created_at, updated_at FROM users",
             None,
             False,
+            row_class=UserRecord,
         )
 
         return table_contents
@@ -395,3 +411,16 @@ def show_all_users(current_user):
         logger.error(f"Error showing all users: {e}")
 
         return []
+
+
+# Asyncio counterparts; each runs the blocking function on the database thread pool.
+add_user_async = db_connection.to_async(add_user)
+change_user_role_async = db_connection.to_async(change_user_role)
+delete_user_async = db_connection.to_async(delete_user)
+login_async = db_connection.to_async(login)
+get_user_async = db_connection.to_async(get_user)
+view_user_async = db_connection.to_async(view_user)
+change_user_password_async = db_connection.to_async(change_user_password)
+change_user_username_async = db_connection.to_async(change_user_username)
+change_user_email_async = db_connection.to_async(change_user_email)
+show_all_users_async = db_connection.to_async(show_all_users)
@@ -0,0 +1,80 @@
+"""
+Benchmark of execute_many() against one execute_query() per row.
+
+Inserts 1k, 10k and 100k audit log rows both ways and prints the throughput of
+each path. The single-row path checks out a connection and commits once per
+row; execute_many() sends multi-row statements and commits once per chunk.
+
+    python benchmarks/bench_execute_many.py [--backend mysql --mysql-database NAME]
+"""
+
+import common
+
+INSERT_AUDIT_ROW = "INSERT INTO audit_log (username, updated_object, action_type, details) VALUES (%s, %s, %s, %s)"
+
+
+def add_arguments(parser):
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1000, 10000, 100000],
+        help="row counts to insert (default: 1000 10000 100000)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=1000,
+        help="execute_many() chunk size (default: 1000)",
+    )
+
+
+def main():
+    args = common.parse_args(__doc__.strip().splitlines()[0], add_arguments)
+
+    import utils.db_connection as db_connection
+
+    def rows(count, path):
+        return [
+            ("benchmark", f"{path} row {n}", "ADD", "execute_many benchmark")
+            for n in range(count)
+        ]
+
+    def clear():
+        db_connection.execute_query(
+            "DELETE FROM audit_log WHERE username = %s", ["benchmark"]
+        )
+
+    print(f"Backend: {db_connection.init_pool().name}, chunk size {args.chunk_size}")
+    print(
+        f"{'rows':>8}  {'single-row s':>12}  {'rows/s':>9}  {'execute_many s':>14}  {'rows/s':>9}  {'speedup':>7}"
+    )
+
+    for size in args.sizes:
+        clear()
+        single_rows = rows(size, "single")
+        single = common.time_call(
+            lambda: [
+                db_connection.execute_query(INSERT_AUDIT_ROW, row)
+                for row in single_rows
+            ]
+        )
+
+        clear()
+        bulk_rows = rows(size, "bulk")
+        bulk = common.time_call(
+            lambda: db_connection.execute_many(
+                INSERT_AUDIT_ROW, bulk_rows, chunk_size=args.chunk_size
+            )
+        )
+        clear()
+
+        print(
+            f"{size:>8}  {single:>12.3f}  {size / single:>9.0f}  {bulk:>14.3f}  {size / bulk:>9.0f}  {single / bulk:>6.1f}x"
+        )
+
+    db_connection.close_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Benchmark of the hot inventory and audit queries before and after the schema
+migrations.
+
+Creates the base schema without migrations, seeds it with 100k items and 10M
+audit log rows, and prints the plan and median time of each hot query as the
+application ran it then. It then applies every migration in utils/migrations.py
+and prints the plan and time of the query the application runs now.
+
+    python benchmarks/bench_migrations.py [--items N] [--audit-rows N]
+        [--backend mysql --mysql-database NEW_SCRATCH_DATABASE]
+
+The database must be new, since the "before" numbers need the unmigrated schema.
+The expired items alert now reads stock lots, and items without stock have none,
+so it can return fewer rows after the migrations.
+"""
+
+import random
+import sys
+from datetime import date, datetime, timedelta
+import common
+
+SEED_CHUNK_SIZE = 50000
+
+# name: (query on the base schema, query run by the application now, params)
+HOT_QUERIES = {
+    "item by name": (
+        "SELECT item_id, quantity FROM inventory WHERE item_name = %s",
+        "SELECT item_id, quantity FROM inventory WHERE item_name = %s",
+        ["Item 54321"],
+    ),
+    "category listing": (
+        "SELECT item_id, item_name, quantity FROM inventory WHERE category = %s ORDER BY item_name",
+        "SELECT item_id, item_name, quantity FROM inventory WHERE category = %s ORDER BY item_name",
+        ["Airway"],
+    ),
+    "expired items alert": (
+        "SELECT item_name, quantity, expiration_date FROM inventory WHERE expiration_date < CURDATE() ORDER BY expiration_date ASC",
+        # As run by api.alerts.search_for_expiration().
+        "SELECT i.item_name, l.quantity, l.expiration_date FROM inventory_lots l JOIN inventory i ON i.item_id = l.item_id WHERE l.expiration_date < CURDATE() ORDER BY l.expiration_date ASC",
+        None,
+    ),
+    "low stock alert": (
+        "SELECT item_name, quantity, min_threshold FROM inventory WHERE min_threshold IS NOT NULL AND quantity < min_threshold ORDER BY quantity ASC",
+        # As run by api.alerts.search_for_low_quantity().
+        "SELECT item_name, quantity, min_threshold FROM inventory WHERE low_stock = 1 ORDER BY quantity ASC",
+        None,
+    ),
+    "last audit entries": (
+        "SELECT log_id, username, updated_object, action_type, action_timestamp, details FROM audit_log ORDER BY action_timestamp DESC LIMIT 50",
+        "SELECT log_id, username, updated_object, action_type, action_timestamp, details FROM audit_log ORDER BY action_timestamp DESC LIMIT 50",
+        None,
+    ),
+}
+
+CATEGORIES = ["Airway", "Ventilation", "Medications", "Trauma", "Vitals", "PPE"]
+
+
+def add_arguments(parser):
+    parser.add_argument("--items", type=int, default=100000)
+    parser.add_argument("--audit-rows", type=int, default=10000000)
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="runs per query (default: 5)"
+    )
+
+
+def seed(connection, items, audit_rows):
+    """Inserts the items and audit rows in chunks on the base schema."""
+
+    rng = random.Random(11)
+    today = date.today()
+
+    def insert(query, rows):
+        with connection.cursor() as cursor:
+            for start in range(0, len(rows), SEED_CHUNK_SIZE):
+                cursor.executemany(query, rows[start : start + SEED_CHUNK_SIZE])
+
+        connection.commit()
+
+    insert(
+        "INSERT INTO inventory (item_name, category, description, quantity, expiration_date, min_threshold) VALUES (%s, %s, %s, %s, %s, %s)",
+        [
+            (
+                f"Item {n}",
+                rng.choice(CATEGORIES),
+                "Benchmark item",
+                rng.randint(0, 100),
+                today + timedelta(days=rng.randint(-60, 1500)),
+                rng.choice([None, 5, 10, 20]),
+            )
+            for n in range(items)
+        ],
+    )
+
+    first = datetime(2020, 1, 1)
+
+    for start in range(0, audit_rows, SEED_CHUNK_SIZE * 10):
+        count = min(SEED_CHUNK_SIZE * 10, audit_rows - start)
+        insert(
+            "INSERT INTO audit_log (username, updated_object, action_type, action_timestamp, details) VALUES (%s, %s, %s, %s, %s)",
+            [
+                (
+                    "benchmark",
+                    f"Item {(start + n) % items}",
+                    "UPDATE",
+                    first + timedelta(seconds=(start + n) * 3),
+                    "Quantity increased by 1",
+                )
+                for n in range(count)
+            ],
+        )
+
+
+def analyze(backend, connection):
+    """Refreshes the MySQL index statistics, as InnoDB does in the background.
+
+    SQLite is left without statistics, as the application never runs ANALYZE,
+    so the plans shown are the ones it gets.
+    """
+
+    if backend.name == "mysql":
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE TABLE inventory, audit_log")
+            cursor.fetchall()
+
+        connection.commit()
+
+
+def explain(backend, connection, query, params):
+    prefix = "EXPLAIN QUERY PLAN " if backend.name == "sqlite" else "EXPLAIN "
+
+    with connection.cursor() as cursor:
+        cursor.execute(prefix + query, params)
+        rows = cursor.fetchall()
+
+    if backend.name == "sqlite":
+        return [row[3] for row in rows]
+
+    columns = ("table", "type", "key", "rows", "Extra")
+    names = cursor.column_names
+
+    return [
+        ", ".join(
+            f"{column}={row[names.index(column)]}"
+            for column in columns
+            if column in names
+        )
+        for row in rows
+    ]
+
+
+def measure(backend, connection, repeat):
+    results = {}
+
+    for name, (before, after, params) in HOT_QUERIES.items():
+        query = after if measure.migrated else before
+
+        def run():
+            with connection.cursor() as cursor:
+                cursor.execute(query, params)
+                run.rows = len(cursor.fetchall())
+
+        seconds = common.time_call(run, repeat)
+        results[name] = (explain(backend, connection, query, params), seconds, run.rows)
+
+    return results
+
+
+def main():
+    args = common.parse_args(__doc__.strip().splitlines()[0], add_arguments)
+
+    import utils.db_connection as db_connection
+    import utils.migrations as migrations
+
+    backend = db_connection.create_backend()
+
+    if backend.name == "mysql":
+        backend.initialize_database()
+
+    with backend.get_connection() as connection:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM inventory")
+
+            if cursor.fetchall()[0][0]:
+                sys.exit("The benchmark needs a new, empty database")
+
+        print(f"Seeding {args.items} items and {args.audit_rows} audit rows...")
+        seed(connection, args.items, args.audit_rows)
+        analyze(backend, connection)
+
+        measure.migrated = False
+        before = measure(backend, connection, args.repeat)
+
+    print("Applying migrations...")
+    migrations.migrate(backend)
+
+    with backend.get_connection() as connection:
+        analyze(backend, connection)
+        measure.migrated = True
+        after = measure(backend, connection, args.repeat)
+
+    backend.close()
+
+    for name in HOT_QUERIES:
+        plan_before, seconds_before, rows_before = before[name]
+        plan_after, seconds_after, rows_after = after[name]
+        print(f"\n{name}")
+        print(
+            f"  before: {seconds_before * 1000:10.2f} ms, {rows_before} rows"
+            + "".join(f"\n          {line}" for line in plan_before)
+        )
+        print(
+            f"  after:  {seconds_after * 1000:10.2f} ms, {rows_after} rows"
+            + "".join(f"\n          {line}" for line in plan_after)
+        )
+        print(f"  speedup: {seconds_before / max(seconds_after, 1e-9):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
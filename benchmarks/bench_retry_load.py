@@ -0,0 +1,204 @@
+"""
+Load run for the retry layer in utils.db_connection.
+
+Many threads read and update a small set of items through a deliberately
+undersized connection pool, so checkouts time out under the burst. The run is
+made twice, with retries disabled (DB_RETRY_ATTEMPTS = 0) and with the
+configured retries, and prints for each the operations per second, latency
+percentiles, the errors seen by callers, and the retry, failure and pool
+counters from db_stats().
+
+On MySQL, --kill-interval also kills the benchmark's own server sessions at that
+interval, so lost connections are retried too.
+
+    python benchmarks/bench_retry_load.py [--threads N] [--seconds S]
+        [--backend mysql --mysql-database SCRATCH_DATABASE [--kill-interval S]]
+"""
+
+import os
+import random
+import threading
+import time
+from collections import Counter
+import common
+
+ITEMS = 20
+WRITE_SHARE = 0.3
+
+
+def add_arguments(parser):
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument(
+        "--seconds", type=float, default=10, help="length of each run (default: 10)"
+    )
+    parser.add_argument(
+        "--pool-size", type=int, default=4, help="pool size (default: 4)"
+    )
+    parser.add_argument(
+        "--pool-timeout",
+        type=float,
+        default=0.005,
+        help="checkout timeout in seconds (default: 0.005)",
+    )
+    parser.add_argument(
+        "--kill-interval",
+        type=float,
+        help="MySQL only: seconds between killing the benchmark's sessions",
+    )
+
+
+def kill_sessions(stop, interval):
+    """Kills the other sessions of the benchmark database until stop is set."""
+
+    import mysql.connector
+
+    connection = mysql.connector.connect(
+        host=os.getenv("DB_HOST"),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+    )
+    killed = 0
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT CONNECTION_ID()")
+        own_id = cursor.fetchall()[0][0]
+
+        while not stop.wait(interval):
+            cursor.execute(
+                "SELECT id FROM information_schema.processlist WHERE db = %s AND id <> %s",
+                [os.getenv("DB_NAME"), own_id],
+            )
+
+            for (session_id,) in cursor.fetchall():
+                try:
+                    cursor.execute(f"KILL {int(session_id)}")
+                    killed += 1
+                except mysql.connector.Error:
+                    pass
+
+    connection.close()
+    print(f"  killed {killed} sessions")
+
+
+def load_run(args, retry_attempts):
+    import api.inventory as inventory
+    import api.users as users
+    import utils.db_connection as db_connection
+
+    db_connection.DB_RETRY_ATTEMPTS = retry_attempts
+    db_connection.reset_db_stats()
+    # Pool counters are cumulative, so the run reports their growth.
+    pool_before = db_connection.init_pool().stats()
+    user = users.login("admin", "pass")
+    item_ids = [
+        row[0]
+        for row in db_connection.execute_query(
+            "SELECT item_id FROM inventory WHERE item_name LIKE %s",
+            ["Load item %"],
+            False,
+        )
+    ]
+    stop = threading.Event()
+    latencies = []
+    errors = Counter()
+    lock = threading.Lock()
+
+    def worker():
+        rng = random.Random()
+
+        while not stop.is_set():
+            item_id = rng.choice(item_ids)
+            started = time.perf_counter()
+
+            try:
+                if rng.random() < WRITE_SHARE:
+                    inventory.increase_item(user, item_id, 1)
+                else:
+                    db_connection.execute_query(
+                        "SELECT quantity FROM inventory WHERE item_id = %s",
+                        [item_id],
+                        False,
+                    )
+                error = None
+            except Exception as e:
+                error = type(e).__name__
+
+            with lock:
+                latencies.append(time.perf_counter() - started)
+
+                if error:
+                    errors[error] += 1
+
+    threads = [threading.Thread(target=worker) for _ in range(args.threads)]
+
+    if args.kill_interval and args.backend == "mysql":
+        threads.append(
+            threading.Thread(target=kill_sessions, args=(stop, args.kill_interval))
+        )
+
+    for thread in threads:
+        thread.start()
+
+    time.sleep(args.seconds)
+    stop.set()
+
+    for thread in threads:
+        thread.join()
+
+    stats = db_connection.db_stats()
+    latencies.sort()
+
+    def percentile(share):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * share))] * 1000
+
+    print(
+        f"  {len(latencies) / args.seconds:.0f} ops/s, p50 {percentile(0.5):.1f} ms, "
+        f"p99 {percentile(0.99):.1f} ms, errors seen by callers: "
+        f"{sum(errors.values())} {dict(errors)}"
+    )
+    print(f"  retries {stats['retries']}, failures {stats['failures']}")
+    pool = {
+        name: stats["pool"][name] - pool_before[name]
+        for name in ("checkouts", "waits", "timeouts")
+    }
+    print(
+        f"  pool: {pool['checkouts']} checkouts, {pool['waits']} waits, "
+        f"{pool['timeouts']} timeouts"
+    )
+
+
+def main():
+    args = common.parse_args(__doc__.strip().splitlines()[0], add_arguments)
+
+    os.environ["CONNECTION_POOL_SIZE"] = str(args.pool_size)
+    os.environ["DB_POOL_MIN_SIZE"] = str(args.pool_size)
+    os.environ["DB_POOL_MAX_SIZE"] = str(args.pool_size)
+    os.environ["DB_POOL_TIMEOUT"] = str(args.pool_timeout)
+
+    import logging
+    import utils.db_connection as db_connection
+
+    # Every retry and failure is logged; the counters printed summarize them.
+    logging.disable(logging.ERROR)
+
+    retry_attempts = db_connection.DB_RETRY_ATTEMPTS
+    db_connection.execute_many(
+        "INSERT IGNORE INTO inventory (item_name, category, quantity) VALUES (%s, %s, %s)",
+        [(f"Load item {n}", "Miscellaneous", 0) for n in range(ITEMS)],
+    )
+
+    print(
+        f"Backend: {db_connection.init_pool().name}, {args.threads} threads, pool of "
+        f"{args.pool_size}, {args.pool_timeout * 1000:g} ms checkout timeout, "
+        f"{WRITE_SHARE:.0%} writes"
+    )
+
+    for attempts in (0, retry_attempts):
+        print(f"\nDB_RETRY_ATTEMPTS = {attempts}:")
+        load_run(args, attempts)
+
+    db_connection.close_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark of search_inventory() on 100k items.
+
+Seeds the inventory with 100k items whose names and descriptions mix medical
+supply words, then prints the median latency of search_inventory() for typical
+responder queries. On SQLite this measures the in-memory inverted index in
+utils/search_index.py (its first search loads it); on MySQL it measures the
+ngram FULLTEXT query, whose plan is printed. The substring filter of
+query_inventory(search=...) is timed alongside as the baseline.
+
+    python benchmarks/bench_search.py [--items N]
+        [--backend mysql --mysql-database SCRATCH_DATABASE]
+"""
+
+import random
+import common
+
+QUERIES = [
+    "pediatric",
+    "14g",
+    "pediatric catheter 14g",
+    "sterile gauze",
+    "tourniquet xl",
+    "ped",
+    "zzz",
+]
+
+NOUNS = ["catheter", "bandage", "gauze", "splint", "syringe", "mask", "airway"]
+NOUNS += ["tourniquet", "dressing", "glove", "needle", "tube", "collar", "vial"]
+ADJECTIVES = ["pediatric", "adult", "neonatal", "sterile", "disposable", "large"]
+ADJECTIVES += ["small", "trauma", "nasal", "oral", "cervical", "elastic"]
+SIZES = ["14g", "16g", "18g", "20g", "22g", "5ml", "10ml", "XL", "M", "S"]
+CATEGORIES = ["Airway", "Medications", "Trauma", "Vitals"]
+
+
+def add_arguments(parser):
+    parser.add_argument("--items", type=int, default=100000)
+    parser.add_argument(
+        "--repeat", type=int, default=20, help="runs per query (default: 20)"
+    )
+
+
+def main():
+    args = common.parse_args(__doc__.strip().splitlines()[0], add_arguments)
+
+    import api.inventory as inventory
+    import api.users as users
+    import utils.db_connection as db_connection
+
+    rng = random.Random(1)
+    words = ADJECTIVES + NOUNS + SIZES + ["for", "use", "with", "kit", "pack"]
+    run = rng.randrange(10**6)
+    db_connection.execute_many(
+        "INSERT INTO inventory (item_name, category, description, quantity) VALUES (%s, %s, %s, %s)",
+        [
+            (
+                f"{rng.choice(ADJECTIVES).title()} {rng.choice(NOUNS)} {rng.choice(SIZES)} #{run}-{n}",
+                rng.choice(CATEGORIES),
+                " ".join(rng.choice(words) for _ in range(12)),
+                rng.randint(0, 50),
+            )
+            for n in range(args.items)
+        ],
+    )
+
+    user = users.login("admin", "pass")
+    backend = db_connection.init_pool().name
+    print(f"Backend: {backend}, {args.items} items")
+
+    first = common.time_call(lambda: inventory.search_inventory(user, "pediatric"))
+    print(f"First search (loads the in-memory index on SQLite): {first * 1000:.0f} ms")
+
+    if backend == "mysql":
+        plan = db_connection.execute_query(
+            "EXPLAIN SELECT item_id FROM inventory WHERE MATCH(item_name, description) AGAINST (%s IN BOOLEAN MODE)",
+            ['+"pediatric"'],
+            False,
+        )
+        print(f"FULLTEXT plan: {plan}")
+
+    print(f"{'query':<24}  {'search ms':>9}  {'hits':>4}  {'substring ms':>12}")
+
+    for query in QUERIES:
+        search = common.time_call(
+            lambda: inventory.search_inventory(user, query), args.repeat
+        )
+        hits = len(inventory.search_inventory(user, query))
+
+        def substring_search():
+            # Reads inside a transaction bypass the listing cache.
+            with db_connection.transaction(write=False):
+                inventory.query_inventory(user, search=query, limit=20)
+
+        substring = common.time_call(substring_search, max(1, args.repeat // 4))
+        print(
+            f"{query!r:<24}  {search * 1000:>9.2f}  {hits:>4}  {substring * 1000:>12.2f}"
+        )
+
+    db_connection.close_pool()
+
+
+if __name__ == "__main__":
+    main()
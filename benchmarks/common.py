@@ -0,0 +1,88 @@
+"""
+Shared setup for the benchmark scripts.
+
+Each benchmark runs against a throwaway SQLite database by default, or against a
+MySQL database named on the command line. The backend is configured through the
+environment before any application module is imported, since they read their
+configuration at import time. Point MySQL runs at a scratch database: the
+benchmarks insert, update and delete rows.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from dotenv import load_dotenv
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def parse_args(description, add_arguments=None):
+    """Parses the common benchmark options and configures the backend.
+
+    Args:
+        description (str): Description shown by --help.
+        add_arguments (callable, optional): Adds benchmark-specific options to
+                                            the argparse parser.
+
+    Returns:
+        argparse.Namespace: The parsed options.
+    """
+
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--backend",
+        choices=("sqlite", "mysql"),
+        default="sqlite",
+        help="storage backend to benchmark (default: sqlite)",
+    )
+    parser.add_argument(
+        "--sqlite-path",
+        help="SQLite database file (default: a new temporary file)",
+    )
+    parser.add_argument(
+        "--mysql-database",
+        help="scratch MySQL database to use instead of DB_NAME from .env",
+    )
+
+    if add_arguments is not None:
+        add_arguments(parser)
+
+    args = parser.parse_args()
+    configure(args)
+
+    return args
+
+
+def configure(args):
+    """Points the application at the benchmark database."""
+
+    sys.path.insert(0, ROOT)
+    os.environ["DB_BACKEND"] = args.backend
+    # Seeding and full scans are slow on purpose; keep them out of the output.
+    os.environ["SLOW_QUERY_LOG_PATH"] = ""
+    os.environ["SLOW_QUERY_THRESHOLD_MS"] = "600000"
+
+    if args.backend == "sqlite":
+        os.environ["SQLITE_DB_PATH"] = args.sqlite_path or os.path.join(
+            tempfile.mkdtemp(prefix="ems_inventory_bench_"), "bench.db"
+        )
+    elif args.mysql_database:
+        os.environ["DB_NAME"] = args.mysql_database
+
+    load_dotenv(os.path.join(ROOT, ".env"))
+
+
+def time_call(function, repeat=1):
+    """Runs function repeat times and returns the median duration in seconds."""
+
+    durations = []
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - started)
+
+    return statistics.median(durations)
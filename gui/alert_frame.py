@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import scrolledtext, messagebox
 import api.alerts as alerts
+from gui.location_picker import LocationPicker
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,6 +16,9 @@ class AlertFrame(tk.Frame):
 
         tk.Label(self, text="Alerts", font=("Arial", 18)).pack(pady=20)
 
+        self.location_picker = LocationPicker(self)
+        self.location_picker.pack(pady=5)
+
         self.alert_text = scrolledtext.ScrolledText(
             self, wrap=tk.WORD, width=100, height=20
         )
@@ -34,6 +38,12 @@ class AlertFrame(tk.Frame):
             command=lambda: controller.show_frame("MainMenuFrame"),
         ).pack(pady=5)
 
+    def tkraise(self, aboveThis=None):
+        """Overrides tkraise to reload the locations when the frame is raised."""
+
+        super().tkraise(aboveThis)
+        self.location_picker.refresh(self.controller.current_user)
+
     def view_expired_items(self):
         """Displays a list of expired inventory items."""
 
@@ -42,14 +52,14 @@ class AlertFrame(tk.Frame):
 
         try:
             expired_inventory = alerts.search_for_expiration(
-                self.controller.current_user
+                self.controller.current_user, self.location_picker.location_id
             )
             if expired_inventory:
                 for item in expired_inventory:
                     alert_str = (
-                        f"Item: {item[0]}\n"
-                        f"Quantity: {item[1]}\n"
-                        f"Expiration date: {item[2]}\n"
+                        f"Item: {item.item_name}\n"
+                        f"Quantity: {item.quantity}\n"
+                        f"Expiration date: {item.expiration_date}\n"
                         "----------------------------------------\n"
                     )
 
@@ -67,14 +77,16 @@ class AlertFrame(tk.Frame):
         self.alert_text.delete("1.0", tk.END)
 
         try:
-            low_inventory = alerts.search_for_low_quantity(self.controller.current_user)
+            low_inventory = alerts.search_for_low_quantity(
+                self.controller.current_user, self.location_picker.location_id
+            )
 
             if low_inventory:
                 for item in low_inventory:
                     alert_str = (
-                        f"Item: {item[0]}\n"
-                        f"Quantity: {item[1]}\n"
-                        f"Minimum threshold: {item[2]}\n"
+                        f"Item: {item.item_name}\n"
+                        f"Quantity: {item.quantity}\n"
+                        f"Minimum threshold: {item.min_threshold}\n"
                         "----------------------------------------\n"
                     )
 
@@ -1,4 +1,6 @@
 import tkinter as tk
+import utils.db_connection as db_connection
+import api.inventory as inventory
 from gui.login_frame import LoginFrame
 from gui.main_menu_frame import MainMenuFrame
 from gui.inventory_frame import InventoryFrame
@@ -6,6 +8,18 @@ from gui.users_frame import UsersFrame
 from gui.audit_frame import AuditFrame
 from gui.alert_frame import AlertFrame
 from gui.account_frame import AccountFrame
+from dotenv import load_dotenv
+import os
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+ENV_FILE_PATH = ".env"
+load_dotenv(ENV_FILE_PATH)
+
+# Seconds between checks of inventory quantities against the stock ledger.
+LEDGER_CHECK_INTERVAL = float(os.getenv("LEDGER_CHECK_INTERVAL", "3600"))
 
 
 class App(tk.Tk):
@@ -42,8 +56,43 @@ class App(tk.Tk):
 
         self.show_frame("LoginFrame")
 
+        # Connect in the background while the login screen is on display.
+        db_connection.warm_up_pool()
+
+        self.after(int(LEDGER_CHECK_INTERVAL * 1000), self.check_stock_ledger)
+
     def show_frame(self, frame_name):
         """Raises the specified frame to the top for display."""
         frame = self.frames.get(frame_name)
         if frame:
             frame.tkraise()
+
+    def check_stock_ledger(self):
+        """Verifies the stock ledger in the background and schedules the next check.
+
+        The check only runs while an Admin or Leadership user is logged in.
+        Mismatches are logged.
+        """
+
+        user = self.current_user
+
+        if user is not None and user.role in ("Admin", "Leadership"):
+            threading.Thread(
+                target=self.verify_stock_ledger, args=(user,), daemon=True
+            ).start()
+
+        self.after(int(LEDGER_CHECK_INTERVAL * 1000), self.check_stock_ledger)
+
+    def verify_stock_ledger(self, user):
+        """Runs the stock ledger check and logs every mismatch found."""
+
+        try:
+            mismatches = inventory.verify_stock_ledger(user)
+        except Exception as e:
+            logger.error(f"Stock ledger check failed: {e}")
+            return
+
+        for item_id, item_name, quantity, ledger_total in mismatches:
+            logger.warning(
+                f"Item {item_name} (ID {item_id}) has quantity {quantity}, but its stock movements total {ledger_total}"
+            )
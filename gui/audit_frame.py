@@ -57,12 +57,12 @@ class AuditFrame(tk.Frame):
 
                 for entry in log_entries:
                     audit_str = (
-                        f"Log ID: {entry[0]}\n"
-                        f"User: {entry[1]}\n"
-                        f"Updated object: {entry[2]}\n"
-                        f"Action: {entry[3]}\n"
-                        f"Details: {entry[5]}\n"
-                        f"Time: {entry[4]}\n"
+                        f"Log ID: {entry.log_id}\n"
+                        f"User: {entry.username}\n"
+                        f"Updated object: {entry.updated_object}\n"
+                        f"Action: {entry.action_type}\n"
+                        f"Details: {entry.details}\n"
+                        f"Time: {entry.action_timestamp}\n"
                         "----------------------------------------\n"
                     )
 
@@ -1,7 +1,9 @@
 import tkinter as tk
-from tkinter import messagebox, simpledialog, ttk
+from tkinter import filedialog, messagebox, simpledialog, ttk
 import api.inventory as inventory
+import api.locations as locations
 import utils.validators as validators
+from gui.location_picker import LocationPicker
 from gui.scrollable_frame import ScrollableFrame
 from dotenv import load_dotenv
 import os
@@ -15,6 +17,17 @@ load_dotenv(ENV_FILE_PATH)
 
 VALID_CATEGORIES = ast.literal_eval(os.getenv("VALID_CATEGORIES"))
 
+ALL_CATEGORIES = "All categories"
+
+# Milliseconds of typing pause before the search is sent to the database.
+SEARCH_DELAY_MS = 300
+
+# The next page is fetched once the list is scrolled past this fraction.
+LOAD_MORE_AT = 0.9
+
+# Number of best matches listed for a search.
+SEARCH_RESULTS_LIMIT = 100
+
 
 class InventoryFrame(tk.Frame):
     """Frame for inventory management functionality."""
@@ -23,7 +36,11 @@ class InventoryFrame(tk.Frame):
         super().__init__(master)
         self.controller = controller
         self.selected_item = None
-        self.all_items = []
+        # Version of the selected item as displayed, sent back with every edit.
+        self.selected_version = None
+        self.next_cursor = None
+        self.loading_page = False
+        self.search_job = None
         self.grid_columnconfigure(0, weight=1, uniform="col")
         self.grid_columnconfigure(1, weight=3, uniform="col")
         self.grid_rowconfigure(0, weight=3)
@@ -33,6 +50,7 @@ class InventoryFrame(tk.Frame):
         self.left_frame.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
         self.scrollable_frame = ScrollableFrame(self.left_frame)
         self.scrollable_frame.pack(fill="both", expand=True)
+        self.scrollable_frame.canvas.configure(yscrollcommand=self.on_list_scroll)
 
         self.search_var = tk.StringVar()
         # Properly invoke the filter callback on change
@@ -40,6 +58,23 @@ class InventoryFrame(tk.Frame):
         search_entry = tk.Entry(self.left_frame, textvariable=self.search_var)
         search_entry.pack(fill="x", padx=2, pady=2)
 
+        self.category_var = tk.StringVar(value=ALL_CATEGORIES)
+        category_filter = ttk.Combobox(
+            self.left_frame,
+            textvariable=self.category_var,
+            values=[ALL_CATEGORIES] + VALID_CATEGORIES,
+            state="readonly",
+        )
+        category_filter.bind(
+            "<<ComboboxSelected>>", lambda event: self.refresh_inventory_list()
+        )
+        category_filter.pack(fill="x", padx=2, pady=2)
+
+        self.location_picker = LocationPicker(
+            self.left_frame, command=self.refresh_inventory_list
+        )
+        self.location_picker.pack(fill="x", padx=2, pady=2)
+
         self.left_bottom_frame = tk.Frame(self)
         self.left_bottom_frame.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
 
@@ -47,6 +82,18 @@ class InventoryFrame(tk.Frame):
             self.left_bottom_frame, text="Add Item", command=self.add_item
         )
 
+        self.restock_button = tk.Button(
+            self.left_bottom_frame, text="Restock sheet", command=self.restock_sheet
+        )
+
+        self.import_button = tk.Button(
+            self.left_bottom_frame, text="Import", command=self.import_items
+        )
+
+        self.export_button = tk.Button(
+            self.left_bottom_frame, text="Export", command=self.export_items
+        )
+
         self.return_button = tk.Button(
             self.left_bottom_frame,
             text="Return to Menu",
@@ -77,10 +124,22 @@ class InventoryFrame(tk.Frame):
             command=self.decrease_quantity,
         )
 
+        self.transfer_button = tk.Button(
+            self.right_bottom_frame,
+            text="Transfer",
+            command=self.transfer_stock,
+        )
+
         self.set_button = tk.Button(
             self.right_bottom_frame, text="Change quantity", command=self.set_quantity
         )
 
+        self.edit_button = tk.Button(
+            self.right_bottom_frame,
+            text="Edit item",
+            command=self.edit_item,
+        )
+
         self.description_button = tk.Button(
             self.right_bottom_frame,
             text="Change description",
@@ -118,11 +177,16 @@ class InventoryFrame(tk.Frame):
         )
 
         self.add_item_button.pack(side="left", padx=5, pady=5)
+        self.restock_button.pack(side="left", padx=5, pady=5)
+        self.import_button.pack(side="left", padx=5, pady=5)
+        self.export_button.pack(side="left", padx=5, pady=5)
         self.return_button.pack(side="left", padx=5, pady=5)
 
         self.increase_button.pack(side="left", padx=5, pady=5)
         self.decrease_button.pack(side="left", padx=5, pady=5)
+        self.transfer_button.pack(side="left", padx=5, pady=5)
         self.set_button.pack(side="left", padx=5, pady=5)
+        self.edit_button.pack(side="left", padx=5, pady=5)
         self.description_button.pack(side="left", padx=5, pady=5)
         self.expiration_button.pack(side="left", padx=5, pady=5)
         self.threshold_button.pack(side="left", padx=5, pady=5)
@@ -137,20 +201,74 @@ class InventoryFrame(tk.Frame):
         """Overrides tkraise to refresh the inventory list when the frame is raised and update button visibility."""
 
         super().tkraise(aboveThis)
+        self.location_picker.refresh(self.controller.current_user)
         self.refresh_inventory_list()
         self.update_button_visibility()
 
     def refresh_inventory_list(self):
-        """Fetches and displays the list of inventory items."""
+        """Fetches and displays the first page of inventory items."""
+
+        for widget in self.scrollable_frame.scrollable_frame.winfo_children():
+            widget.destroy()
+
+        self.scrollable_frame.canvas.yview_moveto(0)
+        self.next_cursor = None
+        self.load_next_page(first=True)
+
+    def load_next_page(self, first=False):
+        """Fetches the next page of the list and appends its item buttons.
+
+        Args:
+            first (bool): Whether this is the first page of a new listing.
+        """
+
+        if self.loading_page or (not first and self.next_cursor is None):
+            return
 
         current_user = self.controller.current_user
+        search = self.search_var.get().strip()
+        category = self.category_var.get()
+        category = None if category == ALL_CATEGORIES else category
+        location_id = self.location_picker.location_id
+        self.loading_page = True
         try:
-            items = inventory.show_all_inventory(current_user)
-            self.all_items = items if items else []
+            if search:
+                # Search results are ranked by relevance and fit on one page.
+                items = inventory.search_inventory(
+                    current_user,
+                    search,
+                    limit=SEARCH_RESULTS_LIMIT,
+                    category=category,
+                    location_id=location_id,
+                )
+                self.next_cursor = None
+            else:
+                items, self.next_cursor = inventory.query_inventory(
+                    current_user,
+                    category=category,
+                    after=None if first else self.next_cursor,
+                    location_id=location_id,
+                )
 
-            self.populate_item_buttons(self.all_items)
+            self.populate_item_buttons(items, first)
         except Exception as e:
             logger.error(f"Error refreshing inventory list: {e}")
+        finally:
+            self.loading_page = False
+
+    def on_list_scroll(self, first, last):
+        """Updates the scrollbar and fetches another page near the list's end.
+
+        Args:
+            first (str): Top of the visible part of the list, from 0 to 1.
+            last (str): Bottom of the visible part of the list, from 0 to 1.
+        """
+
+        self.scrollable_frame.scrollbar.set(first, last)
+
+        # Also fills the list until it overflows the canvas, since last stays 1.
+        if self.next_cursor is not None and float(last) >= LOAD_MORE_AT:
+            self.after_idle(self.load_next_page)
 
     def update_button_visibility(self):
         """Allows filtering of inventory actions by role"""
@@ -161,14 +279,20 @@ class InventoryFrame(tk.Frame):
 
         elif role == "Leadership":
             self.add_item_button.pack_forget()
+            self.import_button.pack_forget()
             self.delete_button.pack_forget()
 
         elif role == "General Responder":
             self.add_item_button.pack_forget()
+            self.restock_button.pack_forget()
+            self.import_button.pack_forget()
+            self.export_button.pack_forget()
             self.delete_button.pack_forget()
             self.increase_button.pack_forget()
             self.decrease_button.pack_forget()
+            self.transfer_button.pack_forget()
             self.set_button.pack_forget()
+            self.edit_button.pack_forget()
             self.description_button.pack_forget()
             self.expiration_button.pack_forget()
             self.threshold_button.pack_forget()
@@ -178,37 +302,56 @@ class InventoryFrame(tk.Frame):
             self.controller.show_frame("MainMenuFrame")
 
     def filter_items(self):
-        """Filters the displayed item buttons based on the search query."""
+        """Reloads the list with the search results once typing pauses."""
 
-        query = self.search_var.get().lower()
-        filtered_items = [
-            item
-            for item in self.all_items
-            if query in item[0].lower() or query in item[1].lower()
-        ]
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
 
-        self.populate_item_buttons(filtered_items)
+        self.search_job = self.after(SEARCH_DELAY_MS, self.run_search)
 
-    def populate_item_buttons(self, items):
+    def run_search(self):
+        """Reloads the list for the current search query."""
+
+        self.search_job = None
+        self.refresh_inventory_list()
+
+    def item_label(self, item):
+        """Returns the list label of an item, naming its location when all are listed."""
+
+        if self.location_picker.location_id is not None:
+            return f"{item.item_name} ({item.category})"
+
+        return f"{item.item_name} ({item.category}, {self.location_name(item.location_id)})"
+
+    def location_name(self, location_id):
+        """Returns the name of a location known to the location picker."""
+
+        for name, known_id in self.location_picker.locations.items():
+            if known_id == location_id:
+                return name
+
+        return f"location {location_id}"
+
+    def populate_item_buttons(self, items, first=True):
         """Creates buttons for each inventory item in the scrollable frame.
 
         Args:
             items (list): A list of inventory items.
+            first (bool): Whether items is the first page; an empty first page
+                          shows a notice instead.
         """
 
-        for widget in self.scrollable_frame.scrollable_frame.winfo_children():
-            widget.destroy()
-
         if items:
             for item in items:
-                item_name = item[0]
                 btn = tk.Button(
                     self.scrollable_frame.scrollable_frame,
-                    text=item_name,
-                    command=lambda name=item_name: self.show_item_details(name),
+                    text=self.item_label(item),
+                    command=lambda item_id=item.item_id: self.show_item_details(
+                        item_id
+                    ),
                 )
                 btn.pack(fill="x", padx=2, pady=2)
-        else:
+        elif first:
             tk.Label(
                 self.scrollable_frame.scrollable_frame, text="No inventory items found."
             ).pack()
@@ -222,41 +365,79 @@ class InventoryFrame(tk.Frame):
             messagebox.showerror("Error", "No item selected.")
             logger.error("No item selected")
 
-    def show_item_details(self, item_name):
+    def show_item_details(self, item_id):
         """Displays detailed information for a selected inventory item.
 
         Args:
-            item_name (str): The name of the selected inventory item.
+            item_id (int): The ID of the selected inventory item.
         """
 
-        self.selected_item = item_name
+        self.selected_item = item_id
         current_user = self.controller.current_user
         try:
-            item_data = inventory.show_item(current_user, item_name)
-            self.item_details_text.config(state="normal")
-            self.item_details_text.delete("1.0", tk.END)
+            item_data = inventory.show_item(current_user, item_id)
 
             if item_data and len(item_data) > 0:
-                item = item_data[0]
-                details = (
-                    f"Name: {item[1]}\n"
-                    f"Description: {item[3]}\n"
-                    f"Category: {item[2]}\n"
-                    f"Quantity: {item[4]}\n"
-                    f"Expiration date: {item[5]}\n"
-                    f"Minimum alert threshold: {item[6]}\n"
-                    f"Last updated: {item[7]}\n"
-                )
-
-                self.item_details_text.insert(tk.END, details)
+                self.display_item(item_data[0])
             else:
+                self.selected_version = None
+                self.item_details_text.config(state="normal")
+                self.item_details_text.delete("1.0", tk.END)
                 self.item_details_text.insert(tk.END, "No details available.")
-
-            self.item_details_text.config(state="disabled")
+                self.item_details_text.config(state="disabled")
         except Exception as e:
             messagebox.showerror("Error", f"Error showing item details: {e}")
             logger.error(f"Error showing item details: {e}")
 
+    def display_item(self, item):
+        """Fills the details pane with an item and remembers the version shown.
+
+        Args:
+            item (InventoryItem): The item to display.
+        """
+
+        current_user = self.controller.current_user
+        self.selected_item = item.item_id
+        self.selected_version = item.row_version
+        self.item_details_text.config(state="normal")
+        self.item_details_text.delete("1.0", tk.END)
+
+        details = (
+            f"Name: {item.item_name}\n"
+            f"Description: {item.description}\n"
+            f"Category: {item.category}\n"
+            f"Location: {self.location_name(item.location_id)}\n"
+            f"Quantity: {item.quantity}\n"
+            f"Expiration date: {item.expiration_date}\n"
+            f"Minimum alert threshold: {item.min_threshold}\n"
+            f"Last updated: {item.last_updated}\n"
+        )
+        lots = inventory.show_lots(current_user, item.item_id)
+
+        if lots:
+            details += "Lots (used first to last):\n" + "".join(
+                f"  {lot.quantity} expiring {lot.expiration_date or 'never'}\n"
+                for lot in lots
+            )
+
+        self.item_details_text.insert(tk.END, details)
+        self.item_details_text.config(state="disabled")
+
+    def show_conflict(self, error):
+        """Shows the latest state of an item another user changed meanwhile.
+
+        Args:
+            error (VersionConflictError): The conflict raised by the edit.
+        """
+
+        messagebox.showwarning(
+            "Item changed",
+            f"{error}. Its latest details are now shown; check them and try again.",
+        )
+        logger.warning(f"Edit refused: {error}")
+        self.refresh_inventory_list()
+        self.display_item(error.current)
+
     def add_item(self):
         """Adds a new inventory item using user inputs."""
 
@@ -357,7 +538,7 @@ class InventoryFrame(tk.Frame):
                 elif description and not validators.is_non_empty_string(description):
                     raise ValueError("Description must be non-empty string")
 
-                inventory.add_inventory_item(
+                item_id = inventory.add_inventory_item(
                     current_user,
                     item_name,
                     category,
@@ -365,11 +546,14 @@ class InventoryFrame(tk.Frame):
                     quantity,
                     expiration_date,
                     minimum_threshold,
+                    self.location_picker.location_id or locations.DEFAULT_LOCATION_ID,
                 )
 
+                if item_id is None:
+                    raise ValueError(f"{item_name} already exists in {category}")
+
                 self.refresh_inventory_list()
-                self.show_item_details(item_name)
-                self.refresh_item_details()
+                self.show_item_details(item_id)
 
             except Exception as e:
                 messagebox.showerror(
@@ -381,6 +565,294 @@ class InventoryFrame(tk.Frame):
         submit_button = tk.Button(popup, text="Submit", command=submit)
         submit_button.pack(padx=20, pady=10)
 
+    def edit_item(self):
+        """Opens a form for changing several fields of the selected item at once.
+
+        All changes are submitted together as one update with one audit entry.
+        If another user changed the item since the form was opened, the fields
+        they changed are listed and the form stays open; saving again applies
+        the entries over their changes.
+        """
+
+        current_user = self.controller.current_user
+        try:
+            if not self.selected_item:
+                raise ValueError("No item selected.")
+
+            item_data = inventory.show_item(current_user, self.selected_item)
+
+            if not item_data:
+                raise ValueError("Item not found.")
+
+            item = item_data[0]
+        except Exception as e:
+            messagebox.showerror("Error", f"Error editing item: {e}")
+            logger.error(f"Error editing item: {e}")
+            return
+
+        popup = tk.Toplevel(self)
+        popup.title(f"Edit {item.item_name}")
+
+        def add_field(label_text, value):
+            field_frame = tk.Frame(popup)
+            field_label = tk.Label(field_frame, text=label_text)
+            field_input = tk.Entry(field_frame)
+            field_input.insert(0, "" if value is None else str(value))
+            field_label.pack(side="left", padx=20, pady=10)
+            field_input.pack(side="left", padx=20, pady=10)
+            field_frame.pack()
+
+            return field_input
+
+        item_name_input = add_field("Item name:", item.item_name)
+
+        item_category_frame = tk.Frame(popup)
+        item_category_label = tk.Label(item_category_frame, text="Category:")
+        selected_category = tk.StringVar(popup)
+        selected_category.set(item.category)
+        item_category_dropdown = ttk.Combobox(
+            item_category_frame,
+            textvariable=selected_category,
+            values=VALID_CATEGORIES,
+            state="readonly",
+        )
+        item_category_label.pack(side="left", padx=20, pady=10)
+        item_category_dropdown.pack(side="left", padx=20, pady=10)
+        item_category_frame.pack()
+
+        description_input = add_field("Description:", item.description)
+        expiration_input = add_field(
+            "Expiration date (YYYY-MM-DD, optional):", item.expiration_date
+        )
+        threshold_input = add_field(
+            "Minimum alert threshold (optional):", item.min_threshold
+        )
+
+        def submit():
+            nonlocal item
+
+            try:
+                min_threshold = threshold_input.get().strip()
+
+                changes = inventory.update_item(
+                    current_user,
+                    item.item_id,
+                    item.row_version,
+                    item_name=item_name_input.get(),
+                    category=selected_category.get(),
+                    description=description_input.get(),
+                    expiration_date=expiration_input.get().strip() or None,
+                    min_threshold=min_threshold or None,
+                )
+
+                if changes:
+                    self.refresh_inventory_list()
+                    self.show_item_details(item.item_id)
+
+                popup.destroy()
+            except inventory.VersionConflictError as e:
+                changed = [
+                    f"{column.replace('_', ' ')}: {getattr(e.current, column)}"
+                    for column in inventory.EDITABLE_FIELDS
+                    if getattr(e.current, column) != getattr(item, column)
+                ]
+                item = e.current
+                self.refresh_inventory_list()
+                self.display_item(item)
+                message = f"{e} while you were editing it.\n\n"
+
+                if changed:
+                    message += "Their changes:\n" + "\n".join(changed) + "\n\n"
+
+                messagebox.showwarning(
+                    "Item changed",
+                    message + "Save again to apply your entries over their changes.",
+                    parent=popup,
+                )
+                logger.warning(f"Edit refused: {e}")
+            except Exception as e:
+                # The form stays open so the entries can be corrected.
+                messagebox.showerror("Error", f"Error updating item: {e}")
+                logger.error(f"Error updating item: {e}")
+
+        submit_button = tk.Button(popup, text="Save changes", command=submit)
+        submit_button.pack(padx=20, pady=10)
+
+    def restock_sheet(self):
+        """Opens a sheet for adjusting the quantities of several items at once.
+
+        Each row holds an item and a signed change (e.g. 5 to restock, -2 for
+        items used). All rows are applied together, or none if any item lacks
+        the stock to cover its change.
+        """
+
+        current_user = self.controller.current_user
+        # The sheet only changes the stock of the location being listed.
+        location_id = self.location_picker.location_id
+        # Every label offered so far; names are not unique across categories
+        # and locations, so each label names them.
+        item_ids = {}
+
+        def item_choices(text):
+            # A chosen label is not a search term, so it lists from the start.
+            search = None if text in item_ids else text.strip()
+
+            if search:
+                items = inventory.search_inventory(
+                    current_user, search, location_id=location_id
+                )
+            else:
+                items, _ = inventory.query_inventory(
+                    current_user, location_id=location_id
+                )
+            labels = []
+
+            for item in items:
+                label = self.item_label(item)
+                item_ids[label] = item.item_id
+                labels.append(label)
+
+            return labels
+
+        popup = tk.Toplevel(self)
+        popup.title("Restock Sheet")
+
+        header_frame = tk.Frame(popup)
+        tk.Label(header_frame, text="Item", width=30, anchor="w").pack(
+            side="left", padx=5
+        )
+        tk.Label(header_frame, text="Change (+/-)", width=12, anchor="w").pack(
+            side="left", padx=5
+        )
+        header_frame.pack(fill="x", padx=20, pady=(10, 0))
+
+        rows_frame = tk.Frame(popup)
+        rows_frame.pack(fill="both", expand=True, padx=20, pady=5)
+        rows = []
+
+        def add_row():
+            row_frame = tk.Frame(rows_frame)
+            item_var = tk.StringVar(popup)
+            # Typing narrows the items listed when the dropdown is opened.
+            item_dropdown = ttk.Combobox(
+                row_frame,
+                textvariable=item_var,
+                postcommand=lambda: item_dropdown.configure(
+                    values=item_choices(item_var.get())
+                ),
+                width=30,
+            )
+            delta_input = tk.Entry(row_frame, width=12)
+            item_dropdown.pack(side="left", padx=5, pady=2)
+            delta_input.pack(side="left", padx=5, pady=2)
+            row_frame.pack(fill="x")
+            rows.append((item_var, delta_input))
+
+        def submit():
+            try:
+                adjustments = []
+
+                for item_var, delta_input in rows:
+                    item_label = item_var.get()
+                    delta = delta_input.get().strip()
+
+                    if not item_label and not delta:
+                        continue
+
+                    if item_label not in item_ids:
+                        raise TypeError("Select an item for every change")
+
+                    try:
+                        adjustments.append((item_ids[item_label], int(delta)))
+                    except ValueError:
+                        raise TypeError(
+                            f"Change for {item_label} must be a whole number"
+                        )
+
+                updated = inventory.apply_adjustments(
+                    current_user, adjustments, location_id
+                )
+
+                messagebox.showinfo("Restock sheet", f"Updated {updated} item(s).")
+                self.refresh_inventory_list()
+
+                if self.selected_item:
+                    self.refresh_item_details()
+
+                popup.destroy()
+            except Exception as e:
+                # The sheet stays open so the entries can be corrected.
+                messagebox.showerror("Error", f"Error applying adjustments: {e}")
+                logger.error(f"Error applying adjustments: {e}")
+
+        for _ in range(5):
+            add_row()
+
+        buttons_frame = tk.Frame(popup)
+        tk.Button(buttons_frame, text="Add row", command=add_row).pack(
+            side="left", padx=5
+        )
+        tk.Button(buttons_frame, text="Apply all", command=submit).pack(
+            side="left", padx=5
+        )
+        buttons_frame.pack(padx=20, pady=10)
+
+    def import_items(self):
+        """Imports inventory items from a CSV or JSON Lines file."""
+
+        current_user = self.controller.current_user
+        file_path = filedialog.askopenfilename(
+            title="Import inventory",
+            filetypes=[("CSV files", "*.csv"), ("JSON Lines files", "*.jsonl")],
+        )
+
+        if not file_path:
+            return
+
+        try:
+            report = inventory.import_inventory(
+                current_user,
+                file_path,
+                location_id=self.location_picker.location_id
+                or locations.DEFAULT_LOCATION_ID,
+            )
+            message = f"Imported {report['imported']} item(s), skipped {report['failed']} row(s)."
+
+            if report["errors"]:
+                message += "\n\n" + "\n".join(
+                    f"Line {line}: {error}" for line, error in report["errors"][:10]
+                )
+
+                if report["failed"] > 10:
+                    message += f"\n... and {report['failed'] - 10} more"
+
+            messagebox.showinfo("Import", message)
+        except Exception as e:
+            messagebox.showerror("Error", f"Error importing inventory: {e}")
+            logger.error(f"Error importing inventory: {e}")
+
+        self.refresh_inventory_list()
+
+    def export_items(self):
+        """Exports the inventory to a CSV or JSON Lines file."""
+
+        current_user = self.controller.current_user
+        file_path = filedialog.asksaveasfilename(
+            title="Export inventory",
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("JSON Lines files", "*.jsonl")],
+        )
+
+        if not file_path:
+            return
+
+        try:
+            count = inventory.export_inventory(current_user, file_path)
+            messagebox.showinfo("Export", f"Exported {count} item(s).")
+        except Exception as e:
+            messagebox.showerror("Error", f"Error exporting inventory: {e}")
+            logger.error(f"Error exporting inventory: {e}")
+
     def delete_item(self):
         """Deletes the currently selected inventory item."""
 
@@ -407,7 +879,19 @@ class InventoryFrame(tk.Frame):
             if not validators.is_positive_int(quantity):
                 raise TypeError("Quantity must be a positive integer")
 
-            inventory.increase_item(current_user, self.selected_item, quantity)
+            expiration = simpledialog.askstring(
+                "Input", "Expiration date of the new stock (YYYY-MM-DD, optional): "
+            )
+
+            if expiration and not validators.is_valid_date(expiration.strip()):
+                raise TypeError("Date must be in YYYY-MM-DD format.")
+
+            inventory.increase_item(
+                current_user,
+                self.selected_item,
+                quantity,
+                expiration.strip() if expiration else None,
+            )
 
             self.refresh_inventory_list()
             self.refresh_item_details()
@@ -433,6 +917,61 @@ class InventoryFrame(tk.Frame):
             messagebox.showerror("Error", f"Error decreasing quantity: {e}")
             logger.error(f"Error decreasing quantity: {e}")
 
+    def transfer_stock(self):
+        """Moves stock of the selected item to another station or vehicle."""
+
+        current_user = self.controller.current_user
+        try:
+            if not self.selected_item:
+                raise ValueError("No item selected.")
+
+            popup = tk.Toplevel(self)
+            popup.title("Transfer Stock")
+
+            tk.Label(popup, text="Move to:").pack(padx=20, pady=10)
+            selected_location = tk.StringVar(popup)
+            dropdown = ttk.Combobox(
+                popup,
+                textvariable=selected_location,
+                values=list(self.location_picker.locations),
+                state="readonly",
+            )
+            dropdown.pack(padx=20, pady=10)
+
+            tk.Label(popup, text="Quantity:").pack(padx=20, pady=10)
+            quantity_input = tk.Entry(popup)
+            quantity_input.pack(padx=20, pady=10)
+
+            def submit():
+                try:
+                    location_id = self.location_picker.locations.get(
+                        selected_location.get()
+                    )
+
+                    if location_id is None:
+                        raise TypeError("Select a location")
+
+                    quantity = int(quantity_input.get())
+
+                    if quantity <= 0:
+                        raise TypeError("Quantity must be a positive integer")
+
+                    inventory.transfer_stock(
+                        current_user, self.selected_item, location_id, quantity
+                    )
+
+                    self.refresh_inventory_list()
+                    self.refresh_item_details()
+                    popup.destroy()
+                except Exception as e:
+                    messagebox.showerror("Error", f"Error transferring stock: {e}")
+                    logger.error(f"Error transferring stock: {e}")
+
+            tk.Button(popup, text="Submit", command=submit).pack(padx=20, pady=10)
+        except Exception as e:
+            messagebox.showerror("Error", f"Error transferring stock: {e}")
+            logger.error(f"Error transferring stock: {e}")
+
     def set_quantity(self):
         """Sets the quantity of the selected inventory item to a specific value."""
 
@@ -443,10 +982,14 @@ class InventoryFrame(tk.Frame):
             if not validators.is_positive_int(quantity):
                 raise TypeError("Quantity must be a positive integer")
 
-            inventory.set_quantity(current_user, self.selected_item, quantity)
+            inventory.set_quantity(
+                current_user, self.selected_item, quantity, self.selected_version
+            )
 
             self.refresh_inventory_list()
             self.refresh_item_details()
+        except inventory.VersionConflictError as e:
+            self.show_conflict(e)
         except Exception as e:
             messagebox.showerror("Error", f"Error setting item quantity: {e}")
             logger.error(f"Error setting item quantity: {e}")
@@ -461,10 +1004,14 @@ class InventoryFrame(tk.Frame):
             if not validators.is_valid_date(expiration):
                 raise TypeError("Date must be in YYYY-MM-DD format.")
 
-            inventory.set_expiration(current_user, self.selected_item, expiration)
+            inventory.set_expiration(
+                current_user, self.selected_item, expiration, self.selected_version
+            )
 
             self.refresh_inventory_list()
             self.refresh_item_details()
+        except inventory.VersionConflictError as e:
+            self.show_conflict(e)
         except Exception as e:
             messagebox.showerror("Error", f"Error setting item expiration date: {e}")
             logger.error(f"Error setting item expiration date: {e}")
@@ -476,10 +1023,14 @@ class InventoryFrame(tk.Frame):
         try:
             description = simpledialog.askstring("Input", "New description: ")
 
-            inventory.set_description(current_user, self.selected_item, description)
+            inventory.set_description(
+                current_user, self.selected_item, description, self.selected_version
+            )
 
             self.refresh_inventory_list()
             self.refresh_item_details()
+        except inventory.VersionConflictError as e:
+            self.show_conflict(e)
         except Exception as e:
             messagebox.showerror("Error", f"Error setting item description: {e}")
             logger.error(f"Error setting item description: {e}")
@@ -496,10 +1047,14 @@ class InventoryFrame(tk.Frame):
             if not validators.is_positive_int(quantity):
                 raise TypeError("Quantity must be a positive integer")
 
-            inventory.set_minimum_threshold(current_user, self.selected_item, quantity)
+            inventory.set_minimum_threshold(
+                current_user, self.selected_item, quantity, self.selected_version
+            )
 
             self.refresh_inventory_list()
             self.refresh_item_details()
+        except inventory.VersionConflictError as e:
+            self.show_conflict(e)
         except Exception as e:
             messagebox.showerror("Error", f"Error setting item minimum threshold: {e}")
             logger.error(f"Error setting item minimum threshold: {e}")
@@ -530,10 +1085,17 @@ class InventoryFrame(tk.Frame):
             def submit():
                 category = selected_category.get()
                 try:
-                    inventory.set_category(current_user, self.selected_item, category)
+                    inventory.set_category(
+                        current_user,
+                        self.selected_item,
+                        category,
+                        self.selected_version,
+                    )
 
                     self.refresh_inventory_list()
                     self.refresh_item_details()
+                except inventory.VersionConflictError as e:
+                    self.show_conflict(e)
                 except Exception as e:
                     messagebox.showerror("Error", f"Error setting item category: {e}")
                     logger.error(f"Error setting item category: {e}")
@@ -0,0 +1,56 @@
+import tkinter as tk
+from tkinter import ttk
+import api.locations as locations
+from dotenv import load_dotenv
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+ENV_FILE_PATH = ".env"
+load_dotenv(ENV_FILE_PATH)
+
+ALL_LOCATIONS = "All locations"
+
+# Location shown by default, e.g. the vehicle a tablet is mounted in; empty for all.
+INVENTORY_LOCATION = os.getenv("INVENTORY_LOCATION", "").strip()
+
+
+class LocationPicker(ttk.Combobox):
+    """Combobox choosing the station or vehicle whose inventory is shown."""
+
+    def __init__(self, master, command=None, **kwargs):
+        self.location_var = tk.StringVar(value=INVENTORY_LOCATION or ALL_LOCATIONS)
+        super().__init__(
+            master,
+            textvariable=self.location_var,
+            values=[ALL_LOCATIONS],
+            state="readonly",
+            **kwargs,
+        )
+        self.locations = {}
+
+        if command is not None:
+            self.bind("<<ComboboxSelected>>", lambda event: command())
+
+    def refresh(self, current_user):
+        """Reloads the location names, keeping the current choice if it still exists."""
+
+        try:
+            self.locations = {
+                location.location_name: location.location_id
+                for location in locations.show_locations(current_user)
+            }
+        except Exception as e:
+            logger.error(f"Error loading locations: {e}")
+
+        self.configure(values=[ALL_LOCATIONS] + list(self.locations))
+
+        if self.location_var.get() not in self.locations:
+            self.location_var.set(ALL_LOCATIONS)
+
+    @property
+    def location_id(self):
+        """The ID of the chosen location, or None for all locations."""
+
+        return self.locations.get(self.location_var.get())
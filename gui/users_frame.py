@@ -128,7 +128,9 @@ class UsersFrame(tk.Frame):
         """Filters displayed users based on the search query."""
 
         query = self.search_var.get().lower()
-        filtered_users = [user for user in self.all_users if query in user[0].lower()]
+        filtered_users = [
+            user for user in self.all_users if query in user.username.lower()
+        ]
 
         self.populate_user_buttons(filtered_users)
 
@@ -144,7 +146,7 @@ class UsersFrame(tk.Frame):
 
         if users:
             for user in users:
-                username = user[1]
+                username = user.username
                 btn = tk.Button(
                     self.scrollable_frame.scrollable_frame,
                     text=username,
@@ -182,12 +184,12 @@ class UsersFrame(tk.Frame):
             if user_data and len(user_data) > 0:
                 user = user_data[0]
                 details = (
-                    f"Username: {user[1]}\n"
-                    f"User ID: {user[0]}\n"
-                    f"Role: {user[2]}\n"
-                    f"Email: {user[3]}\n"
-                    f"Registered: {user[4]}\n"
-                    f"Last updated: {user[5]}"
+                    f"Username: {user.username}\n"
+                    f"User ID: {user.user_id}\n"
+                    f"Role: {user.role}\n"
+                    f"Email: {user.email}\n"
+                    f"Registered: {user.created_at}\n"
+                    f"Last updated: {user.updated_at}"
                 )
 
                 self.user_details_text.insert(tk.END, details)
@@ -211,12 +213,12 @@ class UsersFrame(tk.Frame):
                 if users_list:
                     for user in users_list:
                         user_str = (
-                            f"Username: {user[1]}\n"
-                            f"User ID: {user[0]}\n"
-                            f"Role: {user[2]}\n"
-                            f"Email: {user[3]}\n"
-                            f"Created: {user[4]}\n"
-                            f"Updated: {user[5]}\n"
+                            f"Username: {user.username}\n"
+                            f"User ID: {user.user_id}\n"
+                            f"Role: {user.role}\n"
+                            f"Email: {user.email}\n"
+                            f"Created: {user.created_at}\n"
+                            f"Updated: {user.updated_at}\n"
                             "----------------------------------------\n"
                         )
 
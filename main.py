@@ -8,6 +8,7 @@ a subclass of tk.Frame.
 
 from gui.app import App
 import logging
+import utils.db_connection as db_connection
 
 logging.basicConfig(
     level=logging.DEBUG,
@@ -21,4 +22,7 @@ logging.basicConfig(
 
 if __name__ == "__main__":
     app = App()
-    app.mainloop()
+    try:
+        app.mainloop()
+    finally:
+        db_connection.close_pool()
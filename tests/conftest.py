@@ -0,0 +1,69 @@
+"""
+Shared test setup.
+
+Runs the application against a throwaway SQLite database, so the tests need no
+MySQL server. The environment is set before any application module is imported,
+since they read their configuration at import time.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import uuid
+import pytest
+from dotenv import load_dotenv
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+TEST_DIR = tempfile.mkdtemp(prefix="ems_inventory_tests_")
+
+sys.path.insert(0, ROOT)
+
+os.environ["DB_BACKEND"] = "sqlite"
+os.environ["SQLITE_DB_PATH"] = os.path.join(TEST_DIR, "ems_inventory.db")
+os.environ["SLOW_QUERY_LOG_PATH"] = os.path.join(TEST_DIR, "slow_queries.log")
+load_dotenv(os.path.join(ROOT, ".env"))
+
+import api.users as users  # noqa: E402
+
+
+@pytest.fixture
+def admin():
+    """The default admin user, logged in."""
+
+    return users.login("admin", "pass")
+
+
+@pytest.fixture
+def item_name():
+    """A unique item name, so tests sharing the database do not collide."""
+
+    return f"Test item {uuid.uuid4().hex[:8]}"
+
+
+@pytest.fixture
+def run_threads():
+    """Runs each given function on its own thread, all at once, and re-raises
+    the first error any of them raised."""
+
+    def run_all(*targets):
+        errors = []
+
+        def run(target):
+            try:
+                target()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run, args=(target,)) for target in targets]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        if errors:
+            raise errors[0]
+
+    return run_all
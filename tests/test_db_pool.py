@@ -0,0 +1,74 @@
+import threading
+import time
+from utils.db_pool import ConnectionPool
+
+
+class FakeConnection:
+    """A raw connection whose close() can be made to block."""
+
+    def __init__(self, close_gate=None):
+        self.closed = False
+        self._close_gate = close_gate
+
+    def close(self):
+        if self._close_gate is not None:
+            self._close_gate.wait()
+
+        self.closed = True
+
+
+def make_pool(connect, idle_timeout):
+    return ConnectionPool(
+        connect, min_size=1, max_size=3, timeout=1, idle_timeout=idle_timeout
+    )
+
+
+def test_release_closes_connections_idle_too_long():
+    opened = []
+
+    def connect():
+        opened.append(FakeConnection())
+        return opened[-1]
+
+    pool = make_pool(connect, idle_timeout=0.05)
+    checked_out = [pool.get_connection() for _ in range(3)]
+
+    for connection in checked_out[:2]:
+        connection.close()
+
+    time.sleep(0.1)
+    checked_out[2].close()
+
+    stats = pool.stats()
+
+    assert stats["size"] == 1
+    assert stats["shrunk"] == 2
+    assert sum(connection.closed for connection in opened) == 2
+
+
+def test_slow_close_does_not_block_checkouts():
+    close_gate = threading.Event()
+
+    pool = make_pool(lambda: FakeConnection(close_gate), idle_timeout=0.05)
+    checked_out = [pool.get_connection() for _ in range(3)]
+
+    for connection in checked_out:
+        connection.close()
+
+    time.sleep(0.1)
+
+    # Shrinking the pool blocks on the first close until the gate opens.
+    shrinker = threading.Thread(target=pool.shrink)
+    shrinker.start()
+    time.sleep(0.05)
+
+    try:
+        started = time.monotonic()
+        pool.get_connection(timeout=0.5).close()
+
+        assert time.monotonic() - started < 0.2
+    finally:
+        close_gate.set()
+        shrinker.join()
+
+    assert pool.stats()["size"] == 1
@@ -0,0 +1,72 @@
+import threading
+import pytest
+import api.inventory as inventory
+
+THREADS = 8
+DECREASES_PER_THREAD = 50
+
+
+def test_concurrent_decreases_lose_no_updates(admin, item_name, run_threads):
+    start = THREADS * DECREASES_PER_THREAD + 7
+    item_id = inventory.add_inventory_item(
+        admin, item_name, "Airway", None, start, None, None
+    )
+
+    def decrease():
+        for _ in range(DECREASES_PER_THREAD):
+            inventory.decrease_item(admin, item_id, 1)
+
+    run_threads(*[decrease] * THREADS)
+
+    assert inventory.show_item(admin, item_id)[0].quantity == 7
+    assert sum(lot.quantity for lot in inventory.show_lots(admin, item_id)) == 7
+
+
+def test_concurrent_decreases_never_go_below_zero(admin, item_name, run_threads):
+    start = THREADS * DECREASES_PER_THREAD // 2
+    item_id = inventory.add_inventory_item(
+        admin, item_name, "Airway", None, start, None, None
+    )
+    succeeded = []
+    refused = []
+    lowest = []
+    done = threading.Event()
+
+    def decrease():
+        for _ in range(DECREASES_PER_THREAD):
+            try:
+                inventory.decrease_item(admin, item_id, 1)
+                succeeded.append(1)
+            except ValueError:
+                refused.append(1)
+
+    def watch():
+        # Reads the committed quantity while the decreases run.
+        while not done.is_set():
+            lowest.append(inventory.show_item(admin, item_id)[0].quantity)
+
+    watcher = threading.Thread(target=watch)
+    watcher.start()
+
+    try:
+        run_threads(*[decrease] * THREADS)
+    finally:
+        done.set()
+        watcher.join()
+
+    assert len(succeeded) == start
+    assert len(refused) == THREADS * DECREASES_PER_THREAD - start
+    assert min(lowest) >= 0
+    assert inventory.show_item(admin, item_id)[0].quantity == 0
+    assert inventory.verify_stock_ledger(admin) == []
+
+
+def test_decrease_below_zero_is_refused(admin, item_name):
+    item_id = inventory.add_inventory_item(
+        admin, item_name, "Airway", None, 2, None, None
+    )
+
+    with pytest.raises(ValueError):
+        inventory.decrease_item(admin, item_id, 3)
+
+    assert inventory.show_item(admin, item_id)[0].quantity == 2
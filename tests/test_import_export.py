@@ -0,0 +1,25 @@
+import pytest
+import api.inventory as inventory
+
+
+@pytest.mark.parametrize("extension", [".csv", ".jsonl"])
+def test_export_can_be_imported_again(admin, item_name, tmp_path, extension):
+    item_id = inventory.add_inventory_item(
+        admin, item_name, "Trauma", "Sterile, 4x4", 12, "2031-05-01", 3
+    )
+    [original] = inventory.show_item(admin, item_id)
+
+    path = str(tmp_path / f"inventory{extension}")
+    exported = inventory.export_inventory(admin, path)
+
+    inventory.set_quantity(admin, item_id, 7)
+    inventory.set_description(admin, item_id, "Changed")
+
+    result = inventory.import_inventory(admin, path)
+
+    assert result == {"imported": exported, "failed": 0, "errors": []}
+
+    [restored] = inventory.show_item(admin, item_id)
+
+    for column in inventory.IMPORT_COLUMNS:
+        assert str(getattr(restored, column)) == str(getattr(original, column))
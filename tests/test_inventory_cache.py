@@ -0,0 +1,30 @@
+import time
+import api.inventory as inventory
+import utils.db_connection as db_connection
+
+
+def write_elsewhere(item_id, description):
+    """Updates an item the way another station would, bypassing api.inventory."""
+
+    db_connection.execute_query(
+        "UPDATE inventory SET description = %s WHERE item_id = %s",
+        [description, item_id],
+    )
+
+
+def test_external_writes_in_the_same_second_are_seen(admin, item_name, monkeypatch):
+    monkeypatch.setattr(inventory, "INVENTORY_CACHE_CHECK_INTERVAL", 0)
+
+    item_id = inventory.add_inventory_item(
+        admin, item_name, "Trauma", "Original", 1, None, None
+    )
+    inventory.show_item(admin, item_id)
+
+    # Start at the beginning of a second, so both writes share last_updated.
+    time.sleep(1 - time.time() % 1)
+
+    write_elsewhere(item_id, "First")
+    assert inventory.show_item(admin, item_id)[0].description == "First"
+
+    write_elsewhere(item_id, "Second")
+    assert inventory.show_item(admin, item_id)[0].description == "Second"
@@ -0,0 +1,40 @@
+import pytest
+import utils.migrations as migrations
+from mysql.connector import Error
+from utils.db_backends import SQLiteBackend
+
+POOL_OPTIONS = {"min_size": 1, "max_size": 2, "timeout": 5, "idle_timeout": 60}
+
+
+def columns(backend, table):
+    with backend.get_connection() as connection:
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA table_info({table})")
+            return [row[1] for row in cursor.fetchall()]
+
+
+def test_interrupted_migration_can_run_again(tmp_path, monkeypatch):
+    backend = SQLiteBackend(str(tmp_path / "migrations.db"), POOL_OPTIONS)
+    run_statement = migrations._run_statement
+
+    def fail_after_adding_row_version(cursor, statement):
+        run_statement(cursor, statement)
+
+        if "ADD COLUMN row_version" in statement:
+            raise Error(msg="Interrupted")
+
+    monkeypatch.setattr(migrations, "_run_statement", fail_after_adding_row_version)
+
+    try:
+        with pytest.raises(Error):
+            migrations.migrate(backend)
+
+        assert "row_version" not in columns(backend, "inventory")
+
+        monkeypatch.setattr(migrations, "_run_statement", run_statement)
+        migrations.migrate(backend)
+
+        assert columns(backend, "inventory").count("row_version") == 1
+        assert migrations.migrate(backend) == []
+    finally:
+        backend.close()
@@ -0,0 +1,108 @@
+import pytest
+import api.inventory as inventory
+import utils.db_connection as db_connection
+
+THREADS = 4
+SETS_PER_THREAD = 25
+
+
+def current(admin, item_id):
+    return inventory.show_item(admin, item_id)[0]
+
+
+def quantity_sets(item_name):
+    return db_connection.execute_query(
+        "SELECT COUNT(*) FROM audit_log WHERE updated_object = %s AND details LIKE %s",
+        [item_name, "Quantity set to %"],
+        False,
+    )[0][0]
+
+
+def test_stale_version_raises_with_the_current_row(admin, item_name):
+    item_id = inventory.add_inventory_item(
+        admin, item_name, "Trauma", None, 5, None, None
+    )
+    seen = current(admin, item_id).row_version
+
+    inventory.set_description(admin, item_id, "Changed meanwhile")
+    now = current(admin, item_id)
+
+    for stale in (seen, now.row_version + 1):
+        with pytest.raises(inventory.VersionConflictError) as conflict:
+            inventory.set_quantity(admin, item_id, 9, expected_version=stale)
+
+        assert conflict.value.current.row_version == now.row_version
+        assert conflict.value.current.description == "Changed meanwhile"
+
+    with pytest.raises(inventory.VersionConflictError):
+        inventory.update_item(admin, item_id, expected_version=seen, min_threshold=2)
+
+    assert current(admin, item_id).quantity == 5
+    assert current(admin, item_id).min_threshold is None
+
+
+def test_matching_version_succeeds(admin, item_name):
+    item_id = inventory.add_inventory_item(
+        admin, item_name, "Trauma", None, 5, None, None
+    )
+
+    version = current(admin, item_id).row_version
+    inventory.set_quantity(admin, item_id, 9, expected_version=version)
+
+    version = current(admin, item_id).row_version
+    inventory.update_item(admin, item_id, expected_version=version, min_threshold=2)
+
+    item = current(admin, item_id)
+
+    assert (item.quantity, item.min_threshold) == (9, 2)
+    assert item.row_version != version
+
+
+def test_update_without_version_retries_a_conflict(admin, item_name, monkeypatch):
+    item_id = inventory.add_inventory_item(
+        admin, item_name, "Trauma", None, 5, None, None
+    )
+    read_row = inventory._current_row
+    reads = []
+
+    def read_then_change(item_id, latest=False):
+        row = read_row(item_id, latest)
+        reads.append(latest)
+
+        if len(reads) == 1:
+            # Another write lands between the read and the update.
+            db_connection.execute_query(
+                "UPDATE inventory SET description = 'Changed' WHERE item_id = %s",
+                [item_id],
+            )
+
+        return row
+
+    monkeypatch.setattr(inventory, "_current_row", read_then_change)
+
+    inventory.set_quantity(admin, item_id, 9)
+
+    assert reads.count(False) == 2
+    assert current(admin, item_id).quantity == 9
+
+
+def test_concurrent_sets_lose_no_updates(admin, item_name, run_threads):
+    item_id = inventory.add_inventory_item(
+        admin, item_name, "Trauma", None, 5, None, None
+    )
+
+    def set_repeatedly(quantity):
+        def run():
+            for _ in range(SETS_PER_THREAD):
+                inventory.set_quantity(admin, item_id, quantity)
+
+        return run
+
+    run_threads(*[set_repeatedly(10 * (n + 1)) for n in range(THREADS)])
+
+    quantity = current(admin, item_id).quantity
+
+    assert quantity in {10 * (n + 1) for n in range(THREADS)}
+    assert sum(lot.quantity for lot in inventory.show_lots(admin, item_id)) == quantity
+    assert quantity_sets(item_name) == THREADS * SETS_PER_THREAD
+    assert inventory.verify_stock_ledger(admin) == []
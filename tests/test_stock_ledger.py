@@ -0,0 +1,66 @@
+import time
+import api.inventory as inventory
+import utils.db_connection as db_connection
+
+THREADS = 4
+DECREASES_PER_THREAD = 50
+IMPORTS = 20
+
+
+def ledger_total(item_id):
+    return db_connection.execute_query(
+        "SELECT COALESCE(SUM(delta), 0) FROM stock_movements WHERE item_id = %s",
+        [item_id],
+        False,
+    )[0][0]
+
+
+def test_imports_during_decreases_keep_the_ledger_exact(
+    admin, item_name, run_threads, tmp_path
+):
+    item_id = inventory.add_inventory_item(
+        admin, item_name, "Trauma", None, 5000, None, None
+    )
+
+    def decrease():
+        for _ in range(DECREASES_PER_THREAD):
+            inventory.decrease_item(admin, item_id, 1)
+
+    def reimport():
+        for n in range(IMPORTS):
+            path = tmp_path / f"import_{n}.csv"
+            path.write_text(
+                "item_name,category,quantity,location_id\n"
+                f"{item_name},Trauma,{5000 - n},1\n"
+            )
+
+            assert inventory.import_inventory(admin, str(path))["failed"] == 0
+
+    run_threads(reimport, *[decrease] * THREADS)
+
+    assert inventory.verify_stock_ledger(admin) == []
+
+
+def test_delete_during_decreases_closes_the_ledger(admin, item_name, run_threads):
+    item_id = inventory.add_inventory_item(
+        admin, item_name, "Trauma", None, 1000, None, None
+    )
+
+    def decrease():
+        for _ in range(DECREASES_PER_THREAD):
+            try:
+                inventory.decrease_item(admin, item_id, 1)
+            except Exception as e:
+                assert str(e) == "Item not found"
+                return
+
+    def delete():
+        time.sleep(0.05)
+        inventory.delete_item(admin, item_id)
+
+    run_threads(delete, *[decrease] * THREADS)
+
+    # The stock left at deletion leaves the ledger with the item.
+    assert not inventory.show_item(admin, item_id)
+    assert ledger_total(item_id) == 0
+    assert inventory.verify_stock_ledger(admin) == []
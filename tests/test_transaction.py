@@ -0,0 +1,45 @@
+import threading
+import api.inventory as inventory
+import utils.db_connection as db_connection
+
+
+def count_items(item_name):
+    return db_connection.execute_query(
+        "SELECT COUNT(*) FROM inventory WHERE item_name = %s", [item_name], False
+    )[0][0]
+
+
+def test_read_only_transaction_reads_one_snapshot(admin, item_name):
+    with db_connection.transaction(write=False):
+        before = count_items(item_name)
+
+        # Committed by another connection between the two reads.
+        writer = threading.Thread(
+            target=inventory.add_inventory_item,
+            args=(admin, item_name, "Trauma", None, 1, None, None),
+        )
+        writer.start()
+        writer.join()
+
+        assert count_items(item_name) == before
+
+    assert count_items(item_name) == before + 1
+
+
+def test_stream_inside_transaction_allows_other_statements(admin, item_name):
+    for suffix in "ABC":
+        inventory.add_inventory_item(
+            admin, f"{item_name} {suffix}", "Trauma", None, 1, None, None
+        )
+
+    with db_connection.transaction():
+        rows = db_connection.stream_query(
+            "SELECT item_id FROM inventory WHERE item_name LIKE %s",
+            [f"{item_name} %"],
+            batch_size=1,
+        )
+        first = next(rows)
+
+        # Another statement on the transaction's connection mid-stream.
+        assert count_items(f"{item_name} A") == 1
+        assert len([first, *rows]) == 3
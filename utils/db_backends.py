@@ -0,0 +1,603 @@
+"""
+Module for database storage backends.
+
+Provides a small backend interface used by utils.db_connection, together with a
+MySQL implementation and an embedded SQLite implementation, both served through
+utils.db_pool.ConnectionPool. The SQLite backend translates the MySQL dialect used by the api
+package (%s placeholders, CURDATE(), INSERT IGNORE, FOR UPDATE, ON DUPLICATE KEY
+UPDATE and the GetLastAuditEntries procedure) so the application can run without a
+database server.
+"""
+
+import re
+import sqlite3
+import logging
+import mysql.connector
+import mysql.connector.errors as mysql_errors
+import utils.encryption as encryption
+from datetime import date, datetime
+from mysql.connector import errorcode, Error
+from utils.db_pool import ConnectionPool
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseBackend:
+    """Interface implemented by every storage backend.
+
+    Attributes:
+        name (str): Short identifier of the backend ("mysql" or "sqlite").
+    """
+
+    name = None
+
+    def get_connection(self):
+        """Returns a connection that is released back to the backend on close().
+
+        Connections support the context manager protocol and expose cursor(),
+        commit(), rollback(), is_connected() and close().
+        """
+
+        raise NotImplementedError
+
+    def initialize_database(self):
+        """Creates the database schema and the initial admin user."""
+
+        raise NotImplementedError
+
+    def begin(self, connection, write=True):
+        """Starts a transaction on a connection checked out by transaction().
+
+        MySQL starts a transaction at the first statement, and its locking
+        reads lock rows, so the default does nothing.
+
+        Args:
+            connection (object): The connection of the transaction.
+            write (bool): Whether the transaction may write.
+        """
+
+    def close(self):
+        """Releases every resource held by the backend."""
+
+    def stats(self):
+        """Returns the connection pool statistics of the backend."""
+
+        return {}
+
+
+class MySQLBackend(DatabaseBackend):
+    """Backend storing data on a MySQL server through a connection pool.
+
+    Args:
+        pool_options (dict): Keyword arguments for ConnectionPool (min_size,
+                             max_size, timeout, idle_timeout).
+    """
+
+    name = "mysql"
+
+    def __init__(self, host, user, password, database, pool_options):
+        self.host = host
+        self.user = user
+        self.password = password
+        self.database = database
+        self.pool = self.create_connection_pool(pool_options)
+
+    def create_connection_pool(self, pool_options):
+        """Creates a MySQL connection pool for database operations.
+
+        Returns:
+            ConnectionPool: An instance of the created connection pool.
+
+        Raises:
+            Error: If there is an issue creating the connection pool.
+        """
+
+        pool = ConnectionPool(
+            self._connect,
+            reset=lambda connection: connection.reset_session(),
+            validate=lambda connection: connection.is_connected(),
+            **pool_options,
+        )
+
+        try:
+            pool.open()
+        except Error as err:
+            if "Unknown database" in str(err):
+                logger.error("Database not found. Initializing database...")
+                self.initialize_database()
+                pool.open()
+            else:
+                logger.error(f"Error creating connection pool: {err}")
+                raise
+
+        return pool
+
+    def _connect(self):
+        return mysql.connector.connect(
+            host=self.host,
+            user=self.user,
+            password=self.password,
+            database=self.database,
+        )
+
+    def get_connection(self):
+        return self.pool.get_connection()
+
+    def close(self):
+        self.pool.close()
+
+    def stats(self):
+        return self.pool.stats()
+
+    def initialize_database(self):
+        """Initializes the database and creates necessary tables if they do not exist.
+
+        Creates the 'users', 'inventory', and 'audit_log' tables using SQL commands.
+        Loads initial user 'admin' with password 'pass' into the program.
+        """
+
+        connection = None
+        cursor = None
+
+        try:
+            connection = mysql.connector.connect(
+                host=self.host,
+                user=self.user,
+                password=self.password,
+            )
+            cursor = connection.cursor()
+            cursor.execute("CREATE DATABASE IF NOT EXISTS " + self.database)
+            cursor.execute("USE " + self.database)
+            cursor.execute(
+                """CREATE TABLE IF NOT EXISTS users (
+                        user_id INT PRIMARY KEY AUTO_INCREMENT,
+                        username VARCHAR(50) UNIQUE NOT NULL,
+                        password_encrypted VARCHAR(255) NOT NULL,
+                        role ENUM('Admin', 'Leadership', 'General Responder', 'Community Member') DEFAULT 'General Responder',
+                        email VARCHAR(100) UNIQUE NOT NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+                    );"""
+            )
+            logger.info("Table 'users' created or already initialized")
+
+            cursor.execute(
+                """CREATE TABLE IF NOT EXISTS inventory (
+                        item_id INT PRIMARY KEY AUTO_INCREMENT,
+                        item_name VARCHAR(100) NOT NULL,
+                        category VARCHAR(50) NOT NULL,
+                        description TEXT,
+                        quantity INT NOT NULL CHECK (quantity >= 0),
+                        expiration_date DATE,
+                        min_threshold INT DEFAULT 1,
+                        last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                        UNIQUE(item_name, category)
+                    );"""
+            )
+            logger.info("Table 'inventory' created or already initialized")
+
+            cursor.execute(
+                """CREATE TABLE IF NOT EXISTS audit_log (
+                        log_id INT PRIMARY KEY AUTO_INCREMENT,
+                        username VARCHAR(50),
+                        updated_object VARCHAR(100),
+                        action_type ENUM('ADD', 'UPDATE', 'DELETE', 'LOGIN', 'LOGOUT', 'ACCESS') NOT NULL,
+                        action_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        details TEXT
+                    );"""
+            )
+            logger.info("Table 'audit_log' created or already initialized")
+
+            cursor.execute("""CREATE PROCEDURE IF NOT EXISTS GetLastAuditEntries(IN num_entries INT)
+                BEGIN
+                    SELECT
+                        log_id,
+                        username,
+                        updated_object,
+                        action_type,
+                        action_timestamp,
+                        details
+                    FROM audit_log
+                    ORDER BY action_timestamp DESC
+                    LIMIT num_entries;
+                END;
+                """)
+            logger.info(
+                "Procedure 'GetLastAuditEntries' created or already initialized"
+            )
+
+            cursor.execute(
+                "INSERT IGNORE INTO users(username, password_encrypted, role, email) VALUES(%s, %s, %s, %s)",
+                [
+                    "admin",
+                    encryption.encrypt_data("pass"),
+                    "Admin",
+                    "initialized@mtu.edu",
+                ],
+            )
+            logger.info("Test user 'admin' with password 'pass' created")
+            connection.commit()
+        except Error as err:
+            logger.error("Error initializing database: %s", err)
+        finally:
+            if cursor:
+                cursor.close()
+
+            if connection and connection.is_connected():
+                connection.close()
+
+
+# SQLite has no DATE/TIMESTAMP types; declared column types drive these converters
+# so rows come back with the same Python types mysql.connector returns.
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_converter("DATE", lambda value: date.fromisoformat(value.decode()))
+sqlite3.register_converter(
+    "TIMESTAMP", lambda value: datetime.fromisoformat(value.decode())
+)
+
+SQLITE_NOW = "datetime('now', 'localtime')"
+
+SQLITE_SCHEMA = [
+    f"""CREATE TABLE IF NOT EXISTS users (
+            user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username VARCHAR(50) UNIQUE NOT NULL,
+            password_encrypted VARCHAR(255) NOT NULL,
+            role VARCHAR(20) DEFAULT 'General Responder' CHECK (role IN ('Admin', 'Leadership', 'General Responder', 'Community Member')),
+            email VARCHAR(100) UNIQUE NOT NULL,
+            created_at TIMESTAMP DEFAULT ({SQLITE_NOW}),
+            updated_at TIMESTAMP DEFAULT ({SQLITE_NOW})
+        );""",
+    f"""CREATE TRIGGER IF NOT EXISTS users_updated_at AFTER UPDATE ON users
+        FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+        BEGIN
+            UPDATE users SET updated_at = {SQLITE_NOW} WHERE user_id = NEW.user_id;
+        END;""",
+    f"""CREATE TABLE IF NOT EXISTS inventory (
+            item_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            item_name VARCHAR(100) NOT NULL,
+            category VARCHAR(50) NOT NULL,
+            description TEXT,
+            quantity INT NOT NULL CHECK (quantity >= 0),
+            expiration_date DATE,
+            min_threshold INT DEFAULT 1,
+            last_updated TIMESTAMP DEFAULT ({SQLITE_NOW})
+        );""",
+    # Kept as a separate index (not an inline constraint) so migrations can drop it.
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_inventory_item_name_category ON inventory (item_name, category);",
+    f"""CREATE TRIGGER IF NOT EXISTS inventory_last_updated AFTER UPDATE ON inventory
+        FOR EACH ROW WHEN NEW.last_updated IS OLD.last_updated
+        BEGIN
+            UPDATE inventory SET last_updated = {SQLITE_NOW} WHERE item_id = NEW.item_id;
+        END;""",
+    f"""CREATE TABLE IF NOT EXISTS audit_log (
+            log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username VARCHAR(50),
+            updated_object VARCHAR(100),
+            action_type VARCHAR(10) NOT NULL CHECK (action_type IN ('ADD', 'UPDATE', 'DELETE', 'LOGIN', 'LOGOUT', 'ACCESS')),
+            action_timestamp TIMESTAMP DEFAULT ({SQLITE_NOW}),
+            details TEXT
+        );""",
+]
+
+# Stored procedures are emulated as parameterized SELECT statements.
+SQLITE_PROCEDURES = {
+    "GetLastAuditEntries": """SELECT log_id, username, updated_object, action_type, action_timestamp, details
+        FROM audit_log ORDER BY action_timestamp DESC LIMIT ?""",
+}
+
+# MySQL constructs rewritten to their SQLite equivalents, applied in order.
+SQLITE_REWRITES = [
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"\bCURDATE\(\)", re.IGNORECASE), "date('now', 'localtime')"),
+    (re.compile(r"\bNOW\(\)", re.IGNORECASE), SQLITE_NOW),
+    (re.compile(r"\bINSERT\s+IGNORE\b", re.IGNORECASE), "INSERT OR IGNORE"),
+    # SQLite has no row locks. Every transaction() block starts with BEGIN
+    # IMMEDIATE, which takes the database write lock before the first read, so
+    # a locking read inside one is already protected.
+    (re.compile(r"\s+FOR\s+UPDATE\b", re.IGNORECASE), ""),
+    # Null-safe equality.
+    (re.compile(r"<=>"), "IS"),
+    # An upsert without a conflict target covers every unique index, as in MySQL.
+    (
+        re.compile(
+            r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b(.*)$", re.IGNORECASE | re.DOTALL
+        ),
+        lambda match: "ON CONFLICT DO UPDATE SET"
+        + re.sub(r"\bVALUES\((\w+)\)", r"excluded.\1", match.group(1), flags=re.I),
+    ),
+]
+
+TRANSLATION_CACHE_SIZE = 512
+_translation_cache = {}
+
+
+def translate_query(query):
+    """Translates a MySQL-dialect query into SQLite syntax.
+
+    Args:
+        query (str): The query as written for MySQL.
+
+    Returns:
+        str: The equivalent SQLite query.
+    """
+
+    translated = _translation_cache.get(query)
+
+    if translated is None:
+        translated = query
+
+        for pattern, replacement in SQLITE_REWRITES:
+            translated = pattern.sub(replacement, translated)
+
+        if len(_translation_cache) >= TRANSLATION_CACHE_SIZE:
+            _translation_cache.clear()
+
+        _translation_cache[query] = translated
+
+    return translated
+
+
+def translate_error(err):
+    """Converts a sqlite3 exception into the matching mysql.connector error.
+
+    Callers of utils.db_connection handle mysql.connector.Error, so errors raised
+    by the SQLite backend are re-raised using the same exception hierarchy.
+
+    Args:
+        err (sqlite3.Error): The original SQLite error.
+
+    Returns:
+        Error: The translated mysql.connector error.
+    """
+
+    message = str(err)
+
+    if isinstance(err, sqlite3.IntegrityError):
+        return mysql_errors.IntegrityError(msg=message, errno=errorcode.ER_DUP_ENTRY)
+
+    if isinstance(err, sqlite3.OperationalError):
+        if "locked" in message or "busy" in message:
+            return mysql_errors.OperationalError(
+                msg=message, errno=errorcode.ER_LOCK_WAIT_TIMEOUT
+            )
+
+        return mysql_errors.ProgrammingError(msg=message)
+
+    if isinstance(err, sqlite3.ProgrammingError):
+        return mysql_errors.ProgrammingError(msg=message)
+
+    return mysql_errors.DatabaseError(msg=message)
+
+
+class SQLiteCursor:
+    """Cursor wrapper exposing the subset of the mysql.connector cursor API used by the app."""
+
+    def __init__(self, raw_cursor):
+        self._cursor = raw_cursor
+        self._stored_results = []
+
+    def execute(self, query, params=None):
+        try:
+            self._cursor.execute(translate_query(query), params or ())
+        except sqlite3.Error as err:
+            raise translate_error(err) from err
+
+    def executemany(self, query, seq_params):
+        try:
+            self._cursor.executemany(translate_query(query), seq_params)
+        except sqlite3.Error as err:
+            raise translate_error(err) from err
+
+    def callproc(self, procname, args=()):
+        """Runs an emulated stored procedure and stores its result set."""
+
+        if procname not in SQLITE_PROCEDURES:
+            raise mysql_errors.ProgrammingError(
+                msg=f"PROCEDURE {procname} does not exist",
+                errno=errorcode.ER_SP_DOES_NOT_EXIST,
+            )
+
+        try:
+            result_cursor = self._cursor.connection.cursor()
+            result_cursor.execute(SQLITE_PROCEDURES[procname], list(args))
+        except sqlite3.Error as err:
+            raise translate_error(err) from err
+
+        self._stored_results = [SQLiteCursor(result_cursor)]
+
+        return args
+
+    def stored_results(self):
+        return iter(self._stored_results)
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchmany(self, size=1):
+        return self._cursor.fetchmany(size)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def column_names(self):
+        description = self._cursor.description or ()
+
+        return tuple(column[0] for column in description)
+
+    def close(self):
+        for result in self._stored_results:
+            result.close()
+
+        self._stored_results = []
+        self._cursor.close()
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class SQLiteConnection:
+    """Connection wrapper exposing the subset of the mysql.connector connection API used by the app."""
+
+    def __init__(self, raw_connection):
+        self._connection = raw_connection
+
+    def cursor(self, *args, **kwargs):
+        if self._connection is None:
+            raise mysql_errors.OperationalError(msg="Connection is closed")
+
+        return SQLiteCursor(self._connection.cursor())
+
+    def commit(self):
+        try:
+            self._connection.commit()
+        except sqlite3.Error as err:
+            raise translate_error(err) from err
+
+    def rollback(self):
+        if self._connection is not None and self._connection.in_transaction:
+            self._connection.rollback()
+
+    def begin(self, mode):
+        """Opens a transaction explicitly; mode is DEFERRED or IMMEDIATE."""
+
+        if self._connection is None:
+            raise mysql_errors.OperationalError(msg="Connection is closed")
+
+        try:
+            self._connection.execute(f"BEGIN {mode}")
+        except sqlite3.Error as err:
+            raise translate_error(err) from err
+
+    def is_connected(self):
+        return self._connection is not None
+
+    def consume_results(self):
+        # SQLite cursors hold no unread results on the connection.
+        pass
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class SQLiteBackend(DatabaseBackend):
+    """Embedded backend storing data in a local SQLite file.
+
+    Args:
+        path (str): Database file path, or ":memory:" for a shared in-memory database.
+        pool_options (dict): Keyword arguments for ConnectionPool (min_size,
+                             max_size, timeout, idle_timeout).
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path, pool_options):
+        self._anchor = None
+
+        if path == ":memory:":
+            # Every connection must see the same database, and the database only
+            # lives while at least one connection stays open.
+            self.path = f"file:ems_inventory_{id(self)}?mode=memory&cache=shared"
+            self._uri = True
+            self._anchor = self._connect()
+        else:
+            self.path = path
+            self._uri = False
+
+        self.pool = ConnectionPool(
+            self._connect,
+            reset=lambda connection: connection.rollback(),
+            **pool_options,
+        )
+        self.initialize_database()
+
+    def _connect(self):
+        try:
+            connection = sqlite3.connect(
+                self.path,
+                uri=self._uri,
+                timeout=10,
+                detect_types=sqlite3.PARSE_DECLTYPES,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA foreign_keys = ON")
+
+            if not self._uri:
+                connection.execute("PRAGMA journal_mode = WAL")
+                connection.execute("PRAGMA synchronous = NORMAL")
+        except sqlite3.Error as err:
+            raise translate_error(err) from err
+
+        return SQLiteConnection(connection)
+
+    def get_connection(self):
+        return self.pool.get_connection()
+
+    def stats(self):
+        return self.pool.stats()
+
+    def begin(self, connection, write=True):
+        """Opens the transaction before its first statement.
+
+        sqlite3 would only open it at the first write, leaving the reads before
+        it outside the transaction. A writing transaction takes the write lock
+        up front (BEGIN IMMEDIATE), so what it reads cannot change before it
+        writes; a read-only one (BEGIN DEFERRED) reads a single snapshot.
+        """
+
+        connection.begin("IMMEDIATE" if write else "DEFERRED")
+
+    def initialize_database(self):
+        """Creates the SQLite schema and the initial admin user if they do not exist."""
+
+        with self.get_connection() as connection:
+            with connection.cursor() as cursor:
+                for statement in SQLITE_SCHEMA:
+                    cursor.execute(statement)
+
+                cursor.execute(
+                    "INSERT IGNORE INTO users(username, password_encrypted, role, email) VALUES(%s, %s, %s, %s)",
+                    [
+                        "admin",
+                        encryption.encrypt_data("pass"),
+                        "Admin",
+                        "initialized@mtu.edu",
+                    ],
+                )
+                connection.commit()
+
+        logger.info(f"SQLite database initialized at {self.path}")
+
+    def close(self):
+        self.pool.close()
+
+        if self._anchor is not None:
+            self._anchor.close()
+            self._anchor = None
@@ -1,215 +1,1004 @@
 """
 Module for database connection and operations.
 
-Provides functions to create a connection pool, get individual connections,
-execute SQL queries, and initialize the database (including table creation).
+Provides functions to create the configured storage backend, get individual
+connections, execute SQL queries, and initialize the database (including table
+creation). The backend is selected with DB_BACKEND in the .env file: "mysql"
+uses a MySQL connection pool, "sqlite" an embedded database file.
+
+The backend and its connection pool are created lazily on first use, so importing
+this module never touches the database. Use init_pool()/close_pool() to manage
+the lifecycle explicitly, or warm_up_pool() to connect in the background.
+
+Asyncio callers can use execute_query_async() and friends, or run_async() /
+to_async() for any blocking database function; these run the call on a
+dedicated thread pool so the event loop is never blocked.
+
+Transient failures (lost connections, lock wait timeouts, deadlocks and pool
+timeouts) are retried with jittered exponential backoff where running the
+statement again is safe. Errors that remain are raised as the typed exceptions
+from utils.db_errors.
 """
 
-import mysql.connector
 import os
+import re
 import ast
+import asyncio
+import functools
+import random
 import logging
-import utils.encryption as encryption
+import threading
+import time
+import utils.db_errors as db_errors
+import utils.db_metrics as db_metrics
+import utils.migrations as migrations
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dotenv import load_dotenv
-from mysql.connector import pooling, Error
+from mysql.connector import Error
+from mysql.connector.errors import OperationalError
+from utils.db_backends import MySQLBackend, SQLiteBackend
+from utils.db_rows import row_factory
+from utils.db_errors import (
+    DatabaseOperationError,
+    TransientDatabaseError,
+    ConstraintViolationError,
+    QueryFailedError,
+)
 
 logger = logging.getLogger(__name__)
 
 ENV_FILE_PATH = ".env"
 load_dotenv(ENV_FILE_PATH)
 
+DB_BACKEND = os.getenv("DB_BACKEND", "mysql").lower()
 DB_HOST = os.getenv("DB_HOST")
 DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_NAME = os.getenv("DB_NAME")
+SQLITE_DB_PATH = os.getenv("SQLITE_DB_PATH", "ems_inventory.db")
 CONNECTION_POOL_SIZE = os.getenv("CONNECTION_POOL_SIZE")
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", CONNECTION_POOL_SIZE))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", DB_POOL_MIN_SIZE))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+DB_POOL_IDLE_TIMEOUT = float(os.getenv("DB_POOL_IDLE_TIMEOUT", "300"))
+DB_RETRY_ATTEMPTS = int(os.getenv("DB_RETRY_ATTEMPTS", "3"))
+DB_RETRY_BASE_DELAY = float(os.getenv("DB_RETRY_BASE_DELAY", "0.05"))
+DB_RETRY_MAX_DELAY = float(os.getenv("DB_RETRY_MAX_DELAY", "1.0"))
+DB_ASYNC_WORKERS = int(os.getenv("DB_ASYNC_WORKERS", DB_POOL_MAX_SIZE))
 VALID_USER_ROLES = ast.literal_eval(os.getenv("VALID_USER_ROLES"))
 
+# Upper bound on placeholders in one multi-row statement (SQLite allows 32766).
+MAX_BULK_PARAMS = 30000
 
-def create_connection_pool():
-    """Creates a MySQL connection pool for database operations.
+# Statements that do not modify data and can be re-run after a lost connection.
+READ_ONLY_PREFIXES = ("SELECT", "SHOW", "EXPLAIN", "DESCRIBE")
+
+# Matches the row tuple of "INSERT ... VALUES (%s, %s)" so it can be repeated.
+VALUES_CLAUSE = re.compile(r"\bVALUES\s*(\((?:[^()']|'[^']*')*\))", re.IGNORECASE)
+
+POOL_OPTIONS = {
+    "min_size": DB_POOL_MIN_SIZE,
+    "max_size": DB_POOL_MAX_SIZE,
+    "timeout": DB_POOL_TIMEOUT,
+    "idle_timeout": DB_POOL_IDLE_TIMEOUT,
+}
+
+BACKENDS = {
+    "mysql": lambda: MySQLBackend(DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, POOL_OPTIONS),
+    "sqlite": lambda: SQLiteBackend(SQLITE_DB_PATH, POOL_OPTIONS),
+}
+
+
+def create_backend(name=DB_BACKEND):
+    """Creates the storage backend used for database operations.
+
+    Args:
+        name (str, optional): The backend to create ("mysql" or "sqlite").
+                              Defaults to DB_BACKEND from the .env file.
 
     Returns:
-        MySQLConnectionPool: An instance of the created connection pool.
+        DatabaseBackend: An instance of the created backend.
 
     Raises:
-        Error: If there is an issue creating the connection pool.
+        ValueError: If the backend name is not supported.
+        Error: If there is an issue connecting to the database.
     """
 
-    try:
-        pool = pooling.MySQLConnectionPool(
-            pool_name="db_pool",
-            pool_size=int(CONNECTION_POOL_SIZE),
-            pool_reset_session=True,
-            host=DB_HOST,
-            user=DB_USER,
-            password=DB_PASSWORD,
-            database=DB_NAME,
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Unsupported database backend '{name}'. Use one of: {', '.join(BACKENDS)}"
         )
 
-        return pool
+    try:
+        return BACKENDS[name]()
     except Error as err:
-        if "Unknown database" in str(err):
-            logger.error("Database not found. Initializing database...")
-            initialize_database()
-            pool = pooling.MySQLConnectionPool(
-                pool_name="db_pool",
-                pool_size=int(CONNECTION_POOL_SIZE),
-                pool_reset_session=True,
-                host=DB_HOST,
-                user=DB_USER,
-                password=DB_PASSWORD,
-                database=DB_NAME,
-            )
-            return pool
-        else:
-            logger.error(f"Error creating connection pool: {err}")
-            raise
+        logger.error(f"Error creating {name} database backend: {err}")
+        raise
 
 
 def initialize_database():
     """Initializes the database and creates necessary tables if they do not exist.
 
-    Creates the 'users', 'inventory', and 'audit_log' tables using SQL commands.
+    Creates the 'users', 'inventory', and 'audit_log' tables on the active backend
+    and applies pending schema migrations.
     Loads initial user 'admin' with password 'pass' into the program.
     """
 
-    connection = None
-    cursor = None
+    backend = init_pool()
+    backend.initialize_database()
+    migrations.migrate(backend)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def init_pool():
+    """Creates the backend and its connection pool if they do not exist yet.
+
+    Safe to call from several threads; only the first call connects and applies
+    pending schema migrations.
+
+    Returns:
+        DatabaseBackend: The active backend.
+
+    Raises:
+        Error: If the backend cannot connect to the database.
+        MigrationError: If the recorded schema history does not match.
+    """
+
+    global _backend
+
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                backend = create_backend()
+
+                try:
+                    migrations.migrate(backend)
+                except BaseException:
+                    backend.close()
+                    raise
+
+                _backend = backend
+
+    return _backend
+
+
+def close_pool():
+    """Closes the active backend and its pooled connections.
+
+    Waits for queued asynchronous calls to finish first. The next database
+    operation creates a new pool.
+    """
+
+    global _backend, _executor
+
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
 
+    with _backend_lock:
+        if _backend is not None:
+            _backend.close()
+            _backend = None
+            logger.info("Database connection pool closed")
+
+
+def _warm_up():
     try:
-        connection = mysql.connector.connect(
-            host=DB_HOST,
-            user=DB_USER,
-            password=DB_PASSWORD,
-        )
-        cursor = connection.cursor()
-        cursor.execute("CREATE DATABASE IF NOT EXISTS " + DB_NAME)
-        cursor.execute("USE " + DB_NAME)
-        cursor.execute(
-            """CREATE TABLE IF NOT EXISTS users (
-                    user_id INT PRIMARY KEY AUTO_INCREMENT, 
-                    username VARCHAR(50) UNIQUE NOT NULL, 
-                    password_encrypted VARCHAR(255) NOT NULL, 
-                    role ENUM('Admin', 'Leadership', 'General Responder', 'Community Member') DEFAULT 'General Responder', 
-                    email VARCHAR(100) UNIQUE NOT NULL, 
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, 
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
-                );"""
-        )
-        logger.info("Table 'users' created or already initialized")
-
-        cursor.execute(
-            """CREATE TABLE IF NOT EXISTS inventory (
-                    item_id INT PRIMARY KEY AUTO_INCREMENT,
-                    item_name VARCHAR(100) NOT NULL,
-                    category VARCHAR(50) NOT NULL,
-                    description TEXT,
-                    quantity INT NOT NULL CHECK (quantity >= 0),
-                    expiration_date DATE,
-                    min_threshold INT DEFAULT 1,
-                    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    UNIQUE(item_name, category)
-                );"""
-        )
-        logger.info("Table 'inventory' created or already initialized")
-
-        cursor.execute(
-            """CREATE TABLE IF NOT EXISTS audit_log (
-                    log_id INT PRIMARY KEY AUTO_INCREMENT,
-                    username VARCHAR(50),
-                    updated_object VARCHAR(100),
-                    action_type ENUM('ADD', 'UPDATE', 'DELETE', 'LOGIN', 'LOGOUT', 'ACCESS') NOT NULL,
-                    action_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    details TEXT
-                );"""
-        )
-        logger.info("Table 'audit_log' created or already initialized")
-
-        cursor.execute("""CREATE PROCEDURE IF NOT EXISTS GetLastAuditEntries(IN num_entries INT)
-            BEGIN
-                SELECT 
-                    log_id,
-                    username,
-                    updated_object,
-                    action_type,
-                    action_timestamp,
-                    details
-                FROM audit_log
-                ORDER BY action_timestamp DESC
-                LIMIT num_entries;
-            END;
-            """)
-        logger.info("Procedure 'GetLastAuditEntries' created or already initialized")
-
-        cursor.execute(
-            "INSERT IGNORE INTO users(username, password_encrypted, role, email) VALUES(%s, %s, %s, %s)",
-            ["admin", encryption.encrypt_data("pass"), "Admin", "initialized@mtu.edu"],
-        )
-        logger.info("Test user 'admin' with password 'pass' created")
-        connection.commit()
-    except Error as err:
-        logger.error("Error initializing database: %s", err)
-    finally:
-        if cursor:
-            cursor.close()
+        init_pool()
+        logger.info("Database connection pool warmed up")
+    except Exception as e:
+        # The next foreground database call retries and reports the failure.
+        logger.error(f"Error warming up connection pool: {e}")
 
-        if connection and connection.is_connected():
-            connection.close()
 
+def warm_up_pool():
+    """Starts creating the connection pool on a background thread.
+
+    Returns:
+        threading.Thread: The daemon thread performing the warm-up.
+    """
+
+    thread = threading.Thread(target=_warm_up, name="db-pool-warm-up", daemon=True)
+    thread.start()
 
-connection_pool = create_connection_pool()
+    return thread
+
+
+def _get_executor():
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=DB_ASYNC_WORKERS, thread_name_prefix="db-async"
+            )
+
+        return _executor
+
+
+async def run_async(func, *args, **kwargs):
+    """Runs a blocking database function without blocking the event loop.
+
+    The call runs on a thread pool of DB_ASYNC_WORKERS threads (by default the
+    maximum connection pool size, since more threads would only queue for a
+    connection). It runs on its own connection and never joins a transaction()
+    open on the calling thread; wrap the whole unit of work in one function
+    instead.
+
+    Args:
+        func (callable): The blocking function, e.g. an api function.
+        *args: Positional arguments for func.
+        **kwargs: Keyword arguments for func.
+
+    Returns:
+        object: The return value of func. Exceptions raised by func propagate.
+    """
+
+    loop = asyncio.get_running_loop()
+
+    return await loop.run_in_executor(
+        _get_executor(), functools.partial(func, *args, **kwargs)
+    )
+
+
+def to_async(func):
+    """Returns an asyncio counterpart of a blocking database function.
+
+    Args:
+        func (callable): The blocking function.
+
+    Returns:
+        function: A coroutine function with the same signature that runs func
+                  through run_async().
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await run_async(func, *args, **kwargs)
+
+    return wrapper
 
 
 def get_connection():
-    """Retrieves a connection from the connection pool.
+    """Retrieves a connection from the active backend.
+
+    Transient checkout failures (pool timeouts, refused connections) are retried
+    with backoff.
 
     Returns:
-        MySQLConnection: A valid connection object.
+        object: A valid connection object; closing it returns it to the pool.
 
     Raises:
-        Error: If a valid connection cannot be retrieved.
+        TransientDatabaseError: If no valid connection could be retrieved after
+                                every retry.
+        DatabaseOperationError: If the checkout fails for another reason.
     """
 
+    return _checkout_with_retry()[0]
+
+
+def _checkout():
+    started = time.perf_counter()
+
     try:
-        connection = connection_pool.get_connection()
+        connection = init_pool().get_connection()
         if connection.is_connected():
-            return connection
+            pool_wait = time.perf_counter() - started
+            db_metrics.record_pool_wait(pool_wait)
+
+            return connection, pool_wait
         else:
-            raise Error("Failed to retrieve a valid connection from the pool.")
+            connection.close()
+            raise OperationalError(
+                msg="Failed to retrieve a valid connection from the pool."
+            )
     except Error as e:
         logger.error(f"Error getting connection from pool: {e}")
         raise
 
 
-def execute_query(query, params=None, commit=True):
+def is_read_only(query):
+    """Returns True if the statement only reads data.
+
+    Args:
+        query (str): The SQL statement.
+
+    Returns:
+        bool: Whether the statement is a SELECT, SHOW, EXPLAIN or DESCRIBE.
+    """
+
+    return query.lstrip().upper().startswith(READ_ONLY_PREFIXES)
+
+
+def _retry_delay(attempt):
+    """Returns the backoff before the given retry, with full jitter."""
+
+    return random.uniform(
+        0, min(DB_RETRY_MAX_DELAY, DB_RETRY_BASE_DELAY * 2 ** (attempt - 1))
+    )
+
+
+def _handle_error(err, attempt, sent, read_only):
+    """Decides whether a failed attempt is retried.
+
+    A lost connection is only retried if the statement was never sent or only
+    reads data, because the outcome of a sent write is unknown. Errors after
+    which the server rolled the statement back are always retried.
+
+    Args:
+        err (Error): The error raised by the attempt.
+        attempt (int): The number of retries already made.
+        sent (bool): Whether the statement reached a connection.
+        read_only (bool): Whether the statement only reads data.
+
+    Raises:
+        DatabaseOperationError: The typed error, if the attempt is not retried.
+    """
+
+    kind = db_errors.classify_error(err)
+    retry = (
+        db_errors.is_transient(kind)
+        and attempt < DB_RETRY_ATTEMPTS
+        and not (kind == db_errors.CONNECTION_LOST and sent and not read_only)
+    )
+
+    if not retry:
+        db_metrics.record_failure(kind, getattr(err, "errno", None))
+        raise db_errors.to_typed_error(err) from err
+
+    delay = _retry_delay(attempt + 1)
+    db_metrics.record_retry(kind, getattr(err, "errno", None))
+    logger.warning(
+        f"Retrying database operation after {kind} error (attempt {attempt + 1} "
+        f"of {DB_RETRY_ATTEMPTS}, {delay * 1000:.0f} ms backoff): {err}"
+    )
+    time.sleep(delay)
+
+
+def _checkout_with_retry():
+    attempt = 0
+
+    while True:
+        try:
+            return _checkout()
+        except Error as err:
+            _handle_error(err, attempt, sent=False, read_only=True)
+            attempt += 1
+
+
+def _with_retry(operation, read_only):
+    """Runs operation(connection, pool_wait) on a pooled connection with retries.
+
+    Each attempt checks out a fresh connection, so a broken connection is
+    discarded by the pool and replaced.
+
+    Args:
+        operation (callable): Runs the statement and commits it.
+        read_only (bool): Whether the statement only reads data.
+
+    Returns:
+        object: The result of the operation.
+
+    Raises:
+        DatabaseOperationError: If the operation fails and is not retried.
+    """
+
+    attempt = 0
+
+    while True:
+        sent = False
+
+        try:
+            connection, pool_wait = _checkout()
+
+            with connection:
+                sent = True
+
+                return operation(connection, pool_wait)
+        except Error as err:
+            _handle_error(err, attempt, sent, read_only)
+            attempt += 1
+
+
+def _raise_typed(err):
+    """Counts a failure inside a transaction and raises it as a typed error."""
+
+    if not isinstance(err, DatabaseOperationError):
+        db_metrics.record_failure(
+            db_errors.classify_error(err), getattr(err, "errno", None)
+        )
+
+    raise db_errors.to_typed_error(err) from err
+
+
+def db_stats():
+    """Returns a snapshot of the collected database metrics.
+
+    Per normalized statement: call, error, slow and row counts plus pool-wait,
+    execute, fetch and total latency histograms. Also includes the connection
+    checkout latency histogram and, once the pool exists, its size and
+    saturation counters. The result is JSON-serializable.
+
+    Returns:
+        dict: The metrics snapshot.
+    """
+
+    stats = db_metrics.snapshot()
+    stats["pool"] = _backend.stats() if _backend is not None else {}
+
+    return stats
+
+
+def reset_db_stats():
+    """Discards every collected database metric."""
+
+    db_metrics.reset()
+
+
+_local = threading.local()
+
+
+def current_transaction():
+    """Returns the connection of the transaction open on this thread, if any.
+
+    Returns:
+        object: The transaction's connection, or None outside a transaction.
+    """
+
+    return getattr(_local, "connection", None)
+
+
+def on_commit(callback):
+    """Runs a callback once the current transaction has committed.
+
+    Callbacks run in registration order after the outermost transaction on this
+    thread commits, and are dropped if it rolls back. Outside a transaction the
+    callback runs immediately. Errors raised by callbacks are logged, not raised,
+    since the work they follow is already committed.
+
+    Args:
+        callback (callable): Function called without arguments.
+    """
+
+    if current_transaction() is None:
+        _run_callbacks([callback])
+    else:
+        _local.on_commit.append(callback)
+
+
+def _run_callbacks(callbacks):
+    for callback in callbacks:
+        try:
+            callback()
+        except Exception as e:
+            logger.error(f"Error in on_commit callback: {e}")
+
+
+@contextmanager
+def transaction(write=True):
+    """Runs a unit of work on a single connection with a single commit.
+
+    Every execute_query call made on this thread inside the block (including the
+    audit log insert) shares the same connection. The work is committed when the
+    block exits normally and rolled back if it raises. Nested blocks join the
+    outermost transaction.
+
+    On SQLite a writing transaction holds the database write lock from its
+    start, which stands in for the row locks of SELECT ... FOR UPDATE; keep such
+    blocks short. A read-only transaction sees one snapshot throughout.
+
+    Only the checkout is retried: statements inside the block are not, since
+    the caller's logic between them cannot be replayed.
+
+    Functions registered with on_commit() inside the block run after the commit.
+
+    Args:
+        write (bool): Whether the block may write. Read-only blocks do not block
+                      writers on SQLite. Ignored for nested blocks.
+
+    Yields:
+        object: The connection used by the transaction.
+
+    Raises:
+        DatabaseOperationError: If a connection cannot be retrieved or the commit
+                                fails.
+    """
+
+    connection = current_transaction()
+
+    if connection is not None:
+        yield connection
+        return
+
+    connection = get_connection()
+
+    try:
+        init_pool().begin(connection, write)
+    except Error as err:
+        connection.close()
+        logger.error(f"Error starting transaction: {err}")
+        _raise_typed(err)
+
+    _local.connection = connection
+    _local.on_commit = []
+
+    try:
+        yield connection
+
+        try:
+            connection.commit()
+        except Error as err:
+            logger.error(f"Error committing transaction: {err}")
+            _raise_typed(err)
+
+        callbacks = _local.on_commit
+        _local.connection = None
+        _run_callbacks(callbacks)
+    except BaseException:
+        try:
+            connection.rollback()
+        except Error as err:
+            logger.error(f"Error rolling back transaction: {err}")
+        raise
+    finally:
+        _local.connection = None
+        _local.on_commit = []
+        connection.close()
+
+
+def _to_rows(cursor, rows, row_class):
+    if row_class is None:
+        return rows
+
+    build = row_factory(row_class, tuple(cursor.column_names))
+
+    return [build(row) for row in rows]
+
+
+def _run_query(
+    connection,
+    query,
+    params,
+    commit,
+    pool_wait=0.0,
+    row_class=None,
+    return_id=False,
+):
+    started = time.perf_counter()
+    executed = None
+    rows = 0
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(query, params)
+
+            if is_read_only(query):
+                executed = time.perf_counter()
+                result = _to_rows(cursor, cursor.fetchall(), row_class)
+                rows = len(result)
+            else:
+                if commit:
+                    connection.commit()
+
+                executed = time.perf_counter()
+                result = rows = cursor.rowcount
+
+                if return_id:
+                    result = cursor.lastrowid if rows > 0 else None
+
+        finished = time.perf_counter()
+        db_metrics.record(
+            query, pool_wait, executed - started, finished - executed, rows
+        )
+
+        return result
+    except Error:
+        failed_at = time.perf_counter()
+        db_metrics.record(
+            query,
+            pool_wait,
+            (executed or failed_at) - started,
+            failed_at - (executed or failed_at),
+            rows,
+            failed=True,
+        )
+        raise
+
+
+def execute_query(query, params=None, commit=True, row_class=None):
     """Executes a SQL query on the database.
 
     For SELECT queries, the function returns fetched results; for other queries,
-    it commits the changes and returns the number of affected rows.
+    it commits the changes and returns the number of affected rows. Fetched rows
+    are tuples, or row_class instances (see utils.db_rows) if one is given.
+
+    Transient errors are retried with jittered exponential backoff: always when
+    the server rolled the statement back (deadlock, lock wait timeout), and after
+    a lost connection only for read-only statements, whose outcome cannot
+    depend on the failed attempt.
+
+    Inside a transaction() block the query runs on the transaction's connection,
+    the commit is deferred to the end of the block, and database errors are
+    raised without retrying so the whole unit of work is rolled back.
 
     Args:
         query (str): The SQL query to execute.
         params (list, optional): List of parameters for the query. Defaults to None.
         commit (bool, optional): Whether to commit the transaction. Defaults to True.
+        row_class (type, optional): The Row subclass to build for each fetched
+                                    row. Defaults to None (plain tuples).
 
     Returns:
-        object: The result of the query (fetched data or row count), or None if an error occurs.
+        object: The result of the query (fetched data or row count).
+
+    Raises:
+        TransientDatabaseError: If a transient error persists or is not safe to retry.
+        ConstraintViolationError: If the statement violates a constraint.
+        QueryFailedError: If the statement fails for any other reason.
     """
 
-    try:
-        with get_connection() as connection:
-            with connection.cursor() as cursor:
-                cursor.execute(query, params)
+    connection = current_transaction()
 
-                if query.strip().upper().startswith("SELECT"):
-                    result = cursor.fetchall()
-                else:
-                    connection.commit()
-                    result = cursor.rowcount
+    if connection is not None:
+        try:
+            return _run_query(connection, query, params, False, row_class=row_class)
+        except Error as err:
+            logger.error(f"Database error during query execution: {err}")
+            _raise_typed(err)
 
-                return result
+    try:
+        return _with_retry(
+            lambda connection, pool_wait: _run_query(
+                connection, query, params, commit, pool_wait, row_class
+            ),
+            is_read_only(query),
+        )
     except Error as err:
         logger.error(f"Database error during query execution: {err}")
+        raise
+
+
+def execute_insert(query, params=None):
+    """Executes an INSERT statement and returns the ID of the new row.
+
+    Behaves like execute_query (including transaction handling), but returns
+    the AUTO_INCREMENT ID instead of the row count. Combined with INSERT IGNORE
+    this replaces a separate existence check before inserting.
+
+    Args:
+        query (str): The INSERT statement.
+        params (list, optional): List of parameters for the query. Defaults to None.
+
+    Returns:
+        int: The ID of the inserted row, or None if no row was inserted (e.g. an
+             INSERT IGNORE that hit a duplicate key).
+
+    Raises:
+        DatabaseOperationError: If a database error occurs.
+    """
+
+    connection = current_transaction()
+
+    if connection is not None:
+        try:
+            return _run_query(connection, query, params, False, return_id=True)
+        except Error as err:
+            logger.error(f"Database error during insert: {err}")
+            _raise_typed(err)
+
+    try:
+        return _with_retry(
+            lambda connection, pool_wait: _run_query(
+                connection, query, params, True, pool_wait, return_id=True
+            ),
+            read_only=False,
+        )
+    except Error as err:
+        logger.error(f"Database error during insert: {err}")
+        raise
+
+
+def _run_procedure(
+    connection, procname, args, statement, pool_wait=0.0, row_class=None
+):
+    started = time.perf_counter()
+    executed = None
+    rows = []
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.callproc(procname, args)
+            executed = time.perf_counter()
+
+            for result in cursor.stored_results():
+                rows = _to_rows(result, result.fetchall(), row_class)
+
+                break
+    except Error:
+        failed_at = time.perf_counter()
+        db_metrics.record(
+            statement,
+            pool_wait,
+            (executed or failed_at) - started,
+            failed_at - (executed or failed_at),
+            failed=True,
+        )
+        raise
+
+    db_metrics.record(
+        statement,
+        pool_wait,
+        executed - started,
+        time.perf_counter() - executed,
+        len(rows),
+    )
+
+    return rows
+
+
+def call_procedure(procname, args=None, row_class=None):
+    """Calls a stored procedure and returns its first result set.
+
+    Outside a transaction, errors after which the server rolled the call back
+    are retried; a lost connection is only retried before the call was sent.
+
+    Args:
+        procname (str): The name of the stored procedure.
+        args (list, optional): The procedure arguments. Defaults to None.
+        row_class (type, optional): The Row subclass to build for each row.
+                                    Defaults to None (plain tuples).
+
+    Returns:
+        list: The rows of the first result set, or an empty list if there is none.
+
+    Raises:
+        DatabaseOperationError: If a database error occurs.
+    """
+
+    args = list(args or [])
+    statement = f"CALL {procname}({', '.join(['%s'] * len(args))})"
+    connection = current_transaction()
+
+    try:
+        if connection is not None:
+            try:
+                return _run_procedure(
+                    connection, procname, args, statement, row_class=row_class
+                )
+            except Error as err:
+                _raise_typed(err)
+
+        return _with_retry(
+            lambda connection, pool_wait: _run_procedure(
+                connection, procname, args, statement, pool_wait, row_class
+            ),
+            read_only=False,
+        )
+    except Error as err:
+        logger.error(f"Database error calling procedure {procname}: {err}")
+        raise
+
+
+def _multi_row_query(query, row_count):
+    """Rewrites a single-row INSERT ... VALUES (...) into a multi-row INSERT.
+
+    Args:
+        query (str): The single-row INSERT statement.
+        row_count (int): The number of value tuples the statement should hold.
+
+    Returns:
+        str: The rewritten statement, or None if the query cannot be rewritten.
+    """
+
+    if not query.lstrip().upper().startswith(("INSERT", "REPLACE")):
+        return None
+
+    match = VALUES_CLAUSE.search(query)
 
+    if match is None:
         return None
+
+    values = ", ".join([match.group(1)] * row_count)
+
+    return query[: match.start(1)] + values + query[match.end(1) :]
+
+
+def _run_many(connection, query, rows, commit, pool_wait=0.0):
+    started = time.perf_counter()
+    failed = True
+    rowcount = 0
+
+    try:
+        with connection.cursor() as cursor:
+            multi_row_query = _multi_row_query(query, len(rows))
+
+            if multi_row_query is not None:
+                cursor.execute(
+                    multi_row_query, [param for row in rows for param in row]
+                )
+            else:
+                cursor.executemany(query, rows)
+
+            if commit:
+                connection.commit()
+
+            rowcount = cursor.rowcount
+            failed = False
+
+            return rowcount
+    finally:
+        db_metrics.record(
+            query,
+            pool_wait,
+            time.perf_counter() - started,
+            rows=rowcount,
+            failed=failed,
+        )
+
+
+def execute_many(query, seq_of_params, chunk_size=1000):
+    """Executes one data-modifying statement for many parameter lists.
+
+    INSERT statements are rewritten into multi-row INSERT ... VALUES statements;
+    other statements go through cursor.executemany. The parameters are processed
+    in chunks on a single connection, committing once per chunk. Only the
+    checkout is retried; a failed chunk is not, because earlier chunks are
+    already committed.
+
+    Inside a transaction() block the statements run on the transaction's
+    connection, the commit is deferred to the end of the block, and database
+    errors are re-raised.
+
+    Args:
+        query (str): The SQL statement written for a single parameter list.
+        seq_of_params (iterable): The parameter lists, one per row.
+        chunk_size (int, optional): Rows per statement and commit. Defaults to 1000.
+
+    Returns:
+        int: The total number of affected rows.
+
+    Raises:
+        ValueError: If chunk_size is not a positive integer.
+        DatabaseOperationError: If a database error occurs. Chunks committed
+                                before the error are kept.
+    """
+
+    if not isinstance(chunk_size, int) or chunk_size <= 0:
+        raise ValueError("Chunk size must be a positive integer")
+
+    def chunks():
+        chunk = []
+
+        for params in seq_of_params:
+            chunk.append(list(params))
+            limit = max(1, min(chunk_size, MAX_BULK_PARAMS // max(1, len(chunk[0]))))
+
+            if len(chunk) >= limit:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+    connection = current_transaction()
+
+    if connection is not None:
+        try:
+            return sum(_run_many(connection, query, rows, False) for rows in chunks())
+        except Error as err:
+            logger.error(f"Database error during bulk execution: {err}")
+            _raise_typed(err)
+
+    total = 0
+
+    try:
+        connection, pool_wait = _checkout_with_retry()
+
+        with connection:
+            for rows in chunks():
+                try:
+                    total += _run_many(connection, query, rows, True, pool_wait)
+                except Error as err:
+                    _raise_typed(err)
+
+                pool_wait = 0.0
+
+        return total
+    except Error as err:
+        logger.error(f"Database error during bulk execution after {total} rows: {err}")
+        raise
+
+
+def stream_query(query, params=None, batch_size=500, row_class=None):
+    """Iterates over the rows of a SELECT query without loading them all at once.
+
+    Rows are read from an unbuffered cursor with fetchmany, so memory stays flat
+    regardless of the size of the result. The connection is held only while the
+    iteration runs and is released when the generator is exhausted or closed.
+    Only the checkout is retried, since rows may already have been consumed.
+
+    Inside a transaction the query runs on the transaction's connection, which
+    other statements may use while the generator is suspended. MySQL refuses
+    them while an unbuffered result is unread, so there the rows are read from
+    a buffered cursor instead: iteration still works, but the whole result is
+    held in memory. Stream large results outside a transaction.
+
+    Args:
+        query (str): The SELECT query to execute.
+        params (list, optional): List of parameters for the query. Defaults to None.
+        batch_size (int, optional): Rows fetched per round trip. Defaults to 500.
+        row_class (type, optional): The Row subclass to build for each row.
+                                    Defaults to None (plain tuples).
+
+    Yields:
+        tuple: One row of the result set, or a row_class instance.
+
+    Raises:
+        ValueError: If batch_size is not a positive integer.
+        DatabaseOperationError: If a database error occurs.
+    """
+
+    if not isinstance(batch_size, int) or batch_size <= 0:
+        raise ValueError("Batch size must be a positive integer")
+
+    connection = current_transaction()
+    owns_connection = connection is None
+    pool_wait = execute_time = fetch_time = 0.0
+    row_count = 0
+    failed = False
+
+    try:
+        if owns_connection:
+            connection, pool_wait = _checkout_with_retry()
+
+        cursor = connection.cursor(buffered=not owns_connection)
+        exhausted = False
+
+        try:
+            started = time.perf_counter()
+            cursor.execute(query, params)
+            execute_time = time.perf_counter() - started
+
+            while True:
+                started = time.perf_counter()
+                rows = cursor.fetchmany(batch_size)
+                fetch_time += time.perf_counter() - started
+
+                if not rows:
+                    exhausted = True
+                    break
+
+                row_count += len(rows)
+                yield from _to_rows(cursor, rows, row_class)
+        except Error:
+            failed = True
+            raise
+        finally:
+            if owns_connection and not exhausted:
+                # Unread rows must be drained before the connection can be reused.
+                connection.consume_results()
+
+            cursor.close()
+            db_metrics.record(
+                query, pool_wait, execute_time, fetch_time, row_count, failed
+            )
+    except Error as err:
+        logger.error(f"Database error during streaming query: {err}")
+        _raise_typed(err)
+    finally:
+        if owns_connection and connection is not None:
+            connection.close()
+
+
+execute_query_async = to_async(execute_query)
+execute_insert_async = to_async(execute_insert)
+execute_many_async = to_async(execute_many)
+call_procedure_async = to_async(call_procedure)
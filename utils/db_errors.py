@@ -0,0 +1,136 @@
+"""
+Module for database error classification.
+
+Sorts mysql.connector errors (including the translated SQLite errors) into
+transient and permanent classes, and defines the typed exceptions raised by
+utils.db_connection. The typed exceptions subclass mysql.connector.Error so
+existing handlers keep catching them.
+"""
+
+from mysql.connector import errorcode, Error
+from mysql.connector.errors import (
+    IntegrityError,
+    InterfaceError,
+    OperationalError,
+    PoolError,
+)
+
+# Error classes returned by classify_error().
+POOL_EXHAUSTED = "pool_exhausted"
+CONNECTION_LOST = "connection_lost"
+ROLLED_BACK = "rolled_back"
+CONSTRAINT_VIOLATION = "constraint_violation"
+QUERY_FAILED = "query_failed"
+
+# The connection dropped or could not be opened; the outcome of a statement that
+# was already sent is unknown.
+CONNECTION_ERRNOS = {
+    errorcode.CR_CONNECTION_ERROR,
+    errorcode.CR_CONN_HOST_ERROR,
+    errorcode.CR_SERVER_GONE_ERROR,
+    errorcode.CR_SERVER_LOST,
+    errorcode.ER_CON_COUNT_ERROR,
+}
+
+# The server rolled the statement back, so running it again is always safe.
+ROLLED_BACK_ERRNOS = {
+    errorcode.ER_LOCK_WAIT_TIMEOUT,
+    errorcode.ER_LOCK_DEADLOCK,
+}
+
+
+class DatabaseOperationError(Error):
+    """Base class for the typed errors raised by utils.db_connection."""
+
+    kind = QUERY_FAILED
+
+
+class TransientDatabaseError(DatabaseOperationError):
+    """A temporary failure (lost connection, lock timeout, exhausted pool) that
+    persisted after every retry, or hit a statement that was not safe to retry."""
+
+    kind = CONNECTION_LOST
+
+
+class ConstraintViolationError(DatabaseOperationError):
+    """A statement violated a unique, foreign key or check constraint."""
+
+    kind = CONSTRAINT_VIOLATION
+
+
+class QueryFailedError(DatabaseOperationError):
+    """A statement failed for a reason that retrying cannot fix."""
+
+    kind = QUERY_FAILED
+
+
+def classify_error(err):
+    """Determines the class of a database error.
+
+    Args:
+        err (Error): The error raised by the driver or the pool.
+
+    Returns:
+        str: One of POOL_EXHAUSTED, CONNECTION_LOST, ROLLED_BACK,
+             CONSTRAINT_VIOLATION or QUERY_FAILED.
+    """
+
+    if isinstance(err, DatabaseOperationError):
+        return err.kind
+
+    errno = getattr(err, "errno", None)
+
+    if isinstance(err, PoolError):
+        return POOL_EXHAUSTED
+
+    if errno in ROLLED_BACK_ERRNOS:
+        return ROLLED_BACK
+
+    if errno in CONNECTION_ERRNOS or (
+        isinstance(err, (InterfaceError, OperationalError)) and errno in (None, -1)
+    ):
+        return CONNECTION_LOST
+
+    if isinstance(err, IntegrityError):
+        return CONSTRAINT_VIOLATION
+
+    return QUERY_FAILED
+
+
+def is_transient(kind):
+    """Returns True for error classes that may succeed when retried."""
+
+    return kind in (POOL_EXHAUSTED, CONNECTION_LOST, ROLLED_BACK)
+
+
+def to_typed_error(err):
+    """Wraps a driver error in the matching typed exception.
+
+    Args:
+        err (Error): The original error.
+
+    Returns:
+        DatabaseOperationError: The typed error, or err itself if already typed.
+    """
+
+    if isinstance(err, DatabaseOperationError):
+        return err
+
+    kind = classify_error(err)
+
+    if is_transient(kind):
+        error_class = TransientDatabaseError
+    elif kind == CONSTRAINT_VIOLATION:
+        error_class = ConstraintViolationError
+    else:
+        error_class = QueryFailedError
+
+    typed_error = error_class(
+        msg=getattr(err, "msg", None) or str(err),
+        errno=getattr(err, "errno", None),
+        sqlstate=getattr(err, "sqlstate", None),
+    )
+    typed_error.kind = kind
+    typed_error.__cause__ = err
+
+    return typed_error
@@ -0,0 +1,302 @@
+"""
+Module for database statement metrics.
+
+Aggregates per-statement latency (pool wait, execute and fetch time) and row
+counts into in-process histograms, keyed by the normalized SQL text, and writes
+statements slower than a configurable threshold to a dedicated slow-query log.
+Also counts retried and failed database operations by error class.
+"""
+
+import os
+import re
+import threading
+import logging
+from dotenv import load_dotenv
+
+ENV_FILE_PATH = ".env"
+load_dotenv(ENV_FILE_PATH)
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+SLOW_QUERY_LOG_PATH = os.getenv("SLOW_QUERY_LOG_PATH", "slow_queries.log")
+
+# Upper bounds (in milliseconds) of the latency histogram buckets.
+BUCKET_BOUNDS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+NORMALIZE_RULES = [
+    (re.compile(r"'(?:[^'\\]|\\.)*'"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(?+)"),
+    (re.compile(r"\(\?\+\)(?:\s*,\s*\(\?\+\))+"), "(?+)"),
+    (re.compile(r"\s+"), " "),
+    (
+        re.compile(r"WHEN \? THEN \?(?: WHEN \? THEN \?)*", re.IGNORECASE),
+        "WHEN ? THEN ?+",
+    ),
+]
+
+NORMALIZE_CACHE_SIZE = 512
+_normalize_cache = {}
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+_slow_query_logger = None
+
+
+def normalize_statement(query):
+    """Reduces a SQL statement to a stable key by stripping literals and whitespace.
+
+    Args:
+        query (str): The SQL statement.
+
+    Returns:
+        str: The normalized statement, e.g. "SELECT * FROM inventory WHERE item_name = ?".
+    """
+
+    normalized = _normalize_cache.get(query)
+
+    if normalized is None:
+        normalized = query
+
+        for pattern, replacement in NORMALIZE_RULES:
+            normalized = pattern.sub(replacement, normalized)
+
+        normalized = normalized.strip()
+
+        if len(_normalize_cache) >= NORMALIZE_CACHE_SIZE:
+            _normalize_cache.clear()
+
+        _normalize_cache[query] = normalized
+
+    return normalized
+
+
+class Histogram:
+    """Fixed-bucket latency histogram in milliseconds."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+
+    def observe(self, value_ms):
+        self.count += 1
+        self.total += value_ms
+        self.max = max(self.max, value_ms)
+
+        for index, bound in enumerate(BUCKET_BOUNDS_MS):
+            if value_ms <= bound:
+                self.buckets[index] += 1
+                return
+
+        self.buckets[-1] += 1
+
+    def percentile(self, fraction):
+        """Returns the upper bucket bound containing the given fraction of samples."""
+
+        if self.count == 0:
+            return 0.0
+
+        target = fraction * self.count
+        seen = 0
+
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+
+            if seen >= target:
+                if index < len(BUCKET_BOUNDS_MS):
+                    return float(min(BUCKET_BOUNDS_MS[index], self.max))
+
+                return self.max
+
+        return self.max
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total, 3),
+            "mean_ms": round(self.total / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max, 3),
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "buckets": dict(
+                zip(
+                    [f"<={bound}" for bound in BUCKET_BOUNDS_MS] + ["inf"], self.buckets
+                )
+            ),
+        }
+
+
+_pool_wait = Histogram()
+
+# Retries and final failures per error class and driver error number.
+_retries = {}
+_failures = {}
+
+
+class StatementStats:
+    """Aggregated metrics for one normalized statement."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.slow = 0
+        self.rows = 0
+        self.pool_wait = Histogram()
+        self.execute = Histogram()
+        self.fetch = Histogram()
+        self.total = Histogram()
+
+    def snapshot(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "slow": self.slow,
+            "rows": self.rows,
+            "pool_wait": self.pool_wait.snapshot(),
+            "execute": self.execute.snapshot(),
+            "fetch": self.fetch.snapshot(),
+            "total": self.total.snapshot(),
+        }
+
+
+def _get_slow_query_logger():
+    """Returns the slow-query logger, attaching its file handler on first use."""
+
+    global _slow_query_logger
+
+    if _slow_query_logger is None:
+        slow_logger = logging.getLogger("ems.slow_queries")
+        slow_logger.propagate = False
+
+        if SLOW_QUERY_LOG_PATH and not slow_logger.handlers:
+            handler = logging.FileHandler(SLOW_QUERY_LOG_PATH, mode="a")
+            handler.setFormatter(
+                logging.Formatter(
+                    "%(asctime)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S"
+                )
+            )
+            slow_logger.addHandler(handler)
+
+        slow_logger.setLevel(logging.WARNING)
+        _slow_query_logger = slow_logger
+
+    return _slow_query_logger
+
+
+def record(query, pool_wait=0.0, execute=0.0, fetch=0.0, rows=0, failed=False):
+    """Records the timings of one statement execution.
+
+    Args:
+        query (str): The SQL statement that was executed.
+        pool_wait (float, optional): Seconds spent waiting for a connection.
+        execute (float, optional): Seconds spent executing (and committing).
+        fetch (float, optional): Seconds spent fetching rows.
+        rows (int, optional): Rows fetched or affected.
+        failed (bool, optional): Whether the statement raised a database error.
+    """
+
+    statement = normalize_statement(query)
+    pool_wait_ms = pool_wait * 1000
+    execute_ms = execute * 1000
+    fetch_ms = fetch * 1000
+    total_ms = pool_wait_ms + execute_ms + fetch_ms
+    is_slow = total_ms >= SLOW_QUERY_THRESHOLD_MS
+
+    with _stats_lock:
+        stats = _stats.get(statement)
+
+        if stats is None:
+            stats = _stats[statement] = StatementStats()
+
+        stats.calls += 1
+        stats.rows += rows or 0
+        stats.errors += 1 if failed else 0
+        stats.slow += 1 if is_slow else 0
+        stats.pool_wait.observe(pool_wait_ms)
+        stats.execute.observe(execute_ms)
+        stats.fetch.observe(fetch_ms)
+        stats.total.observe(total_ms)
+
+    if is_slow:
+        _get_slow_query_logger().warning(
+            f"{total_ms:.1f} ms (pool wait {pool_wait_ms:.1f}, execute {execute_ms:.1f}, "
+            f"fetch {fetch_ms:.1f}, rows {rows or 0}{', failed' if failed else ''}): {statement}"
+        )
+
+
+def record_pool_wait(pool_wait):
+    """Records the time one get_connection() call waited for a connection.
+
+    Args:
+        pool_wait (float): Seconds spent waiting for the connection.
+    """
+
+    with _stats_lock:
+        _pool_wait.observe(pool_wait * 1000)
+
+
+def _count_error(counters, kind, errno):
+    key = f"{kind}:{errno}" if errno not in (None, -1) else kind
+
+    with _stats_lock:
+        counters[key] = counters.get(key, 0) + 1
+
+
+def record_retry(kind, errno=None):
+    """Counts one retried database operation.
+
+    Args:
+        kind (str): The error class from utils.db_errors.classify_error().
+        errno (int, optional): The driver error number, if any.
+    """
+
+    _count_error(_retries, kind, errno)
+
+
+def record_failure(kind, errno=None):
+    """Counts one database operation that failed after any retries.
+
+    Args:
+        kind (str): The error class from utils.db_errors.classify_error().
+        errno (int, optional): The driver error number, if any.
+    """
+
+    _count_error(_failures, kind, errno)
+
+
+def snapshot():
+    """Returns a JSON-serializable copy of the collected metrics.
+
+    Returns:
+        dict: "statements" maps each normalized statement to its metrics,
+              "pool_wait" holds the connection checkout latency histogram, and
+              "retries" and "failures" count errors by "class:errno".
+    """
+
+    with _stats_lock:
+        return {
+            "statements": {
+                statement: stats.snapshot() for statement, stats in _stats.items()
+            },
+            "pool_wait": _pool_wait.snapshot(),
+            "retries": dict(_retries),
+            "failures": dict(_failures),
+        }
+
+
+def reset():
+    """Discards every recorded metric."""
+
+    global _pool_wait
+
+    with _stats_lock:
+        _stats.clear()
+        _retries.clear()
+        _failures.clear()
+        _pool_wait = Histogram()
@@ -0,0 +1,404 @@
+"""
+Module for database connection pooling.
+
+Provides a backend-independent connection pool with a blocking, fair (FIFO)
+checkout and timeout, saturation counters, and adaptive sizing: the pool opens
+connections on demand up to a maximum under pressure and closes connections
+that stay idle beyond a timeout, down to a minimum.
+"""
+
+import time
+import threading
+import logging
+from collections import deque
+from mysql.connector.errors import PoolError, Error
+
+logger = logging.getLogger(__name__)
+
+
+class _Waiter:
+    """A thread queued for a connection."""
+
+    __slots__ = ("event", "connection", "retry")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.connection = None
+        self.retry = False
+
+
+class PooledConnection:
+    """Proxy around a raw connection that returns it to the pool on close()."""
+
+    def __init__(self, pool, raw_connection):
+        self._pool = pool
+        self._connection = raw_connection
+
+    def __getattr__(self, name):
+        if self._connection is None:
+            raise PoolError(msg="Connection has been returned to the pool")
+
+        return getattr(self._connection, name)
+
+    def is_connected(self):
+        return self._connection is not None and self._connection.is_connected()
+
+    def close(self):
+        if self._connection is not None:
+            raw_connection, self._connection = self._connection, None
+            self._pool.release(raw_connection)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ConnectionPool:
+    """Thread-safe connection pool with bounded waits and adaptive sizing.
+
+    Args:
+        connect (callable): Opens a new raw connection.
+        min_size (int): Connections kept open even when idle.
+        max_size (int): Upper bound on open connections.
+        timeout (float): Seconds a checkout waits for a free connection.
+        idle_timeout (float): Seconds an idle connection above min_size is kept.
+        reset (callable, optional): Called with a raw connection when it is returned.
+        validate (callable, optional): Returns False for a raw connection that is
+                                       no longer usable. Only called for
+                                       connections idle longer than validate_after.
+        validate_after (float, optional): Idle seconds before a connection is
+                                          validated on checkout. Defaults to 30.
+    """
+
+    def __init__(
+        self,
+        connect,
+        min_size,
+        max_size,
+        timeout,
+        idle_timeout,
+        reset=None,
+        validate=None,
+        validate_after=30,
+    ):
+        min_size = int(min_size)
+        max_size = max(int(max_size), min_size, 1)
+
+        self._connect = connect
+        self._reset = reset
+        self._validate = validate
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = float(timeout)
+        self.idle_timeout = float(idle_timeout)
+        self.validate_after = float(validate_after)
+
+        self._lock = threading.Lock()
+        self._idle = deque()
+        self._waiters = deque()
+        self._size = 0
+        self._in_use = 0
+        self._closed = False
+
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._peak_in_use = 0
+        self._grown = 0
+        self._shrunk = 0
+        self._discarded = 0
+
+    def open(self):
+        """Opens min_size connections up front.
+
+        Raises:
+            Error: If a connection cannot be opened.
+        """
+
+        while True:
+            with self._lock:
+                if self._size >= self.min_size:
+                    return
+
+                self._size += 1
+
+            try:
+                raw_connection = self._connect()
+            except BaseException:
+                with self._lock:
+                    self._size -= 1
+                raise
+
+            with self._lock:
+                self._idle.append((raw_connection, time.monotonic()))
+
+    def get_connection(self, timeout=None):
+        """Checks out a connection, waiting in FIFO order if the pool is saturated.
+
+        Args:
+            timeout (float, optional): Seconds to wait. Defaults to the pool timeout.
+
+        Returns:
+            PooledConnection: The checked out connection.
+
+        Raises:
+            PoolError: If no connection becomes available before the timeout.
+            Error: If a new connection cannot be opened.
+        """
+
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+
+        retrying = False
+
+        while True:
+            raw_connection, idle_for, create, waiter = self._reserve(retrying)
+
+            if waiter is not None:
+                remaining = deadline - time.monotonic()
+
+                if not waiter.event.wait(max(0.0, remaining)):
+                    with self._lock:
+                        if not waiter.event.is_set():
+                            self._waiters.remove(waiter)
+                            self._timeouts += 1
+
+                            raise PoolError(
+                                msg=f"Timed out waiting for a database connection ({self._in_use}/{self.max_size} in use)"
+                            )
+
+                if waiter.retry:
+                    retrying = True
+                    continue
+
+                raw_connection = waiter.connection
+
+            if create:
+                raw_connection = self._open_reserved()
+            elif (
+                self._validate is not None
+                and idle_for > self.validate_after
+                and not self._validate(raw_connection)
+            ):
+                self._discard(raw_connection, checked_out=True)
+                retrying = True
+
+                continue
+
+            return PooledConnection(self, raw_connection)
+
+    def _reserve(self, retrying=False):
+        """Takes an idle connection, a slot for a new one, or a place in the queue.
+
+        A thread retrying after it was woken for a freed slot does not queue
+        behind threads that arrived later.
+        """
+
+        expired = []
+
+        try:
+            with self._lock:
+                if self._closed:
+                    raise PoolError(msg="Connection pool is closed")
+
+                expired = self._take_expired()
+
+                if retrying or not self._waiters:
+                    if self._idle:
+                        raw_connection, released_at = self._idle.pop()
+                        self._mark_checked_out()
+
+                        return (
+                            raw_connection,
+                            time.monotonic() - released_at,
+                            False,
+                            None,
+                        )
+
+                    if self._size < self.max_size:
+                        self._size += 1
+
+                        if self._size > self.min_size:
+                            self._grown += 1
+
+                        self._mark_checked_out()
+
+                        return None, 0.0, True, None
+
+                waiter = _Waiter()
+
+                if retrying:
+                    self._waiters.appendleft(waiter)
+                else:
+                    self._waiters.append(waiter)
+                    self._waits += 1
+
+                return None, 0.0, False, waiter
+        finally:
+            self._close_all(expired)
+
+    def _mark_checked_out(self):
+        self._in_use += 1
+        self._checkouts += 1
+        self._peak_in_use = max(self._peak_in_use, self._in_use)
+
+    def _open_reserved(self):
+        try:
+            return self._connect()
+        except BaseException:
+            with self._lock:
+                self._size -= 1
+                self._in_use -= 1
+                self._wake_for_retry()
+            raise
+
+    def _wake_for_retry(self):
+        """Lets the first waiter try again after a connection slot was freed."""
+
+        if self._waiters:
+            waiter = self._waiters.popleft()
+            waiter.retry = True
+            waiter.event.set()
+
+    def _take_expired(self):
+        """Removes connections idle longer than idle_timeout, keeping min_size open.
+
+        Called with the lock held. The caller closes the returned connections
+        after releasing the lock, so a slow close does not stall other threads.
+
+        Returns:
+            list: The raw connections to close.
+        """
+
+        now = time.monotonic()
+        expired = []
+
+        while (
+            self._idle
+            and self._size > self.min_size
+            and now - self._idle[0][1] > self.idle_timeout
+        ):
+            raw_connection, _ = self._idle.popleft()
+            self._size -= 1
+            self._shrunk += 1
+            expired.append(raw_connection)
+
+        return expired
+
+    def _close_all(self, raw_connections):
+        for raw_connection in raw_connections:
+            self._close_quietly(raw_connection)
+
+    def shrink(self):
+        """Closes connections idle longer than idle_timeout, keeping min_size open.
+
+        Checkouts and returns already do this; call it to trim a pool that has
+        seen no traffic since a burst.
+
+        Returns:
+            int: The number of connections closed.
+        """
+
+        with self._lock:
+            expired = self._take_expired()
+
+        self._close_all(expired)
+
+        return len(expired)
+
+    def release(self, raw_connection):
+        """Returns a raw connection to the pool, handing it to the oldest waiter first.
+
+        Returning a connection also closes connections that have been idle too
+        long, so the pool shrinks after a burst even when checkouts are rare.
+        """
+
+        if self._reset is not None:
+            try:
+                self._reset(raw_connection)
+            except Error as err:
+                logger.error(f"Discarding connection that failed to reset: {err}")
+                self._discard(raw_connection, checked_out=True)
+
+                return
+
+        with self._lock:
+            if self._closed:
+                self._in_use -= 1
+                self._size -= 1
+                expired = [raw_connection]
+            elif self._waiters:
+                waiter = self._waiters.popleft()
+                waiter.connection = raw_connection
+                self._checkouts += 1
+                waiter.event.set()
+
+                return
+            else:
+                self._in_use -= 1
+                self._idle.append((raw_connection, time.monotonic()))
+                expired = self._take_expired()
+
+        self._close_all(expired)
+
+    def _discard(self, raw_connection, checked_out):
+        self._close_quietly(raw_connection)
+
+        with self._lock:
+            self._size -= 1
+            self._discarded += 1
+
+            if checked_out:
+                self._in_use -= 1
+
+            self._wake_for_retry()
+
+    @staticmethod
+    def _close_quietly(raw_connection):
+        try:
+            raw_connection.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled connection: {e}")
+
+    def close(self):
+        """Closes idle connections; checked out ones are closed when returned."""
+
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, deque()
+            self._size -= len(idle)
+            waiters, self._waiters = self._waiters, deque()
+
+        for raw_connection, _ in idle:
+            self._close_quietly(raw_connection)
+
+        for waiter in waiters:
+            waiter.retry = True
+            waiter.event.set()
+
+    def stats(self):
+        """Returns a snapshot of the pool's size and saturation counters.
+
+        Returns:
+            dict: Current size, idle, in-use and waiting counts, configured
+                  bounds, and cumulative checkouts, waits, timeouts, peak in-use,
+                  grown, shrunk and discarded connection counts.
+        """
+
+        with self._lock:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "waiting": len(self._waiters),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "peak_in_use": self._peak_in_use,
+                "grown": self._grown,
+                "shrunk": self._shrunk,
+                "discarded": self._discarded,
+            }
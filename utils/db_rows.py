@@ -0,0 +1,131 @@
+"""
+Module for typed database rows.
+
+Provides compact row classes for the inventory, inventory_lots, locations,
+audit_log and users tables and a row factory that builds them from a cursor's
+column names, so callers read fields by name instead of by position. Rows use
+__slots__, which keeps large listings small in memory. Columns missing from a
+query are set to None.
+"""
+
+from functools import lru_cache
+
+
+class Row:
+    """Base class for typed rows; subclasses list their columns in __slots__."""
+
+    __slots__ = ()
+
+    def __init__(self, **fields):
+        unknown = set(fields) - set(self.__slots__)
+
+        if unknown:
+            raise TypeError(
+                f"{type(self).__name__} has no column(s): {', '.join(sorted(unknown))}"
+            )
+
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+    def as_dict(self):
+        """Returns the row as a dictionary of column name to value."""
+
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+
+        return self.as_dict() == other.as_dict()
+
+    def __repr__(self):
+        fields = ", ".join(
+            f"{name}={value!r}" for name, value in self.as_dict().items()
+        )
+
+        return f"{type(self).__name__}({fields})"
+
+
+class InventoryItem(Row):
+    """A row of the inventory table."""
+
+    __slots__ = (
+        "item_id",
+        "item_name",
+        "category",
+        "description",
+        "quantity",
+        "expiration_date",
+        "min_threshold",
+        "last_updated",
+        "location_id",
+        "row_version",
+    )
+
+
+class InventoryLot(Row):
+    """A row of the inventory_lots table."""
+
+    __slots__ = ("lot_id", "item_id", "quantity", "expiration_date", "received_at")
+
+
+class Location(Row):
+    """A row of the locations table."""
+
+    __slots__ = ("location_id", "location_name", "location_type")
+
+
+class AuditEntry(Row):
+    """A row of the audit_log table."""
+
+    __slots__ = (
+        "log_id",
+        "username",
+        "updated_object",
+        "action_type",
+        "action_timestamp",
+        "details",
+    )
+
+
+class UserRecord(Row):
+    """A row of the users table, without the encrypted password."""
+
+    __slots__ = ("user_id", "username", "role", "email", "created_at", "updated_at")
+
+
+@lru_cache(maxsize=256)
+def row_factory(row_class, column_names):
+    """Returns a function that converts a result tuple into a row object.
+
+    Args:
+        row_class (type): The Row subclass to build.
+        column_names (tuple): The column names of the result, in order.
+
+    Returns:
+        function: Takes one result tuple and returns a row_class instance.
+
+    Raises:
+        ValueError: If the result has a column the row class does not define.
+    """
+
+    column_names = tuple(column_names)
+    unknown = [name for name in column_names if name not in row_class.__slots__]
+
+    if unknown:
+        raise ValueError(f"{row_class.__name__} has no column(s): {', '.join(unknown)}")
+
+    missing = [name for name in row_class.__slots__ if name not in column_names]
+
+    def build(values):
+        row = object.__new__(row_class)
+
+        for name, value in zip(column_names, values):
+            setattr(row, name, value)
+
+        for name in missing:
+            setattr(row, name, None)
+
+        return row
+
+    return build
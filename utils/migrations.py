@@ -0,0 +1,419 @@
+"""
+Module for versioned schema migrations.
+
+Applies numbered schema changes on top of the base schema created by
+initialize_database(). Applied versions are recorded in a schema_version table
+together with a checksum of their statements, so each step runs exactly once per
+database and an edited step that was already applied is detected. Steps hold one
+statement list per backend, since the MySQL and SQLite dialects differ.
+
+Add new steps at the end of MIGRATIONS with the next version number; never edit
+or reorder a step that has shipped.
+"""
+
+import hashlib
+import logging
+from mysql.connector import errorcode, Error
+from utils.db_backends import SQLITE_NOW
+
+logger = logging.getLogger(__name__)
+
+# Name of the MySQL advisory lock serializing migrations across stations.
+MIGRATION_LOCK_NAME = "ems_inventory_schema_migrations"
+MIGRATION_LOCK_TIMEOUT = 30
+
+SCHEMA_VERSION_TABLE = {
+    "mysql": """CREATE TABLE IF NOT EXISTS schema_version (
+            version INT PRIMARY KEY,
+            description VARCHAR(255) NOT NULL,
+            checksum CHAR(64) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );""",
+    "sqlite": f"""CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description VARCHAR(255) NOT NULL,
+            checksum CHAR(64) NOT NULL,
+            applied_at TIMESTAMP DEFAULT ({SQLITE_NOW})
+        );""",
+}
+
+# MySQL DDL is not transactional, so a step interrupted half way leaves some of
+# its objects behind. Re-running it ignores these "already exists" and "already
+# dropped" errors. SQLite DDL is transactional, so there each step and its
+# schema_version row are applied in one transaction.
+IGNORED_ERRNOS = {
+    errorcode.ER_DUP_KEYNAME,
+    errorcode.ER_DUP_FIELDNAME,
+    errorcode.ER_CANT_DROP_FIELD_OR_KEY,
+}
+
+MIGRATIONS = [
+    {
+        # item_name lookups are already served by the leftmost column of the
+        # UNIQUE(item_name, category) index, so they need no index of their own.
+        "version": 1,
+        "description": "Index expiration, low stock and audit log ordering",
+        "statements": {
+            "mysql": [
+                # Covers the expired items alert (range on expiration_date).
+                "CREATE INDEX idx_inventory_expiration ON inventory (expiration_date, item_name, quantity)",
+                # quantity < min_threshold cannot use a range, but the alert can
+                # scan this narrow covering index instead of the table.
+                "CREATE INDEX idx_inventory_low_stock ON inventory (min_threshold, quantity, item_name)",
+                # GetLastAuditEntries reads the newest entries backwards from here.
+                "CREATE INDEX idx_audit_log_action_timestamp ON audit_log (action_timestamp)",
+            ],
+            "sqlite": [
+                "CREATE INDEX IF NOT EXISTS idx_inventory_expiration ON inventory (expiration_date, item_name, quantity)",
+                "CREATE INDEX IF NOT EXISTS idx_inventory_low_stock ON inventory (min_threshold, quantity, item_name)",
+                "CREATE INDEX IF NOT EXISTS idx_audit_log_action_timestamp ON audit_log (action_timestamp)",
+            ],
+        },
+    },
+    {
+        # Sorting by name pages along the UNIQUE(item_name, category) index.
+        # Secondary indexes end in the primary key on both backends, so the
+        # quantity index also orders by item_id as query_inventory() expects.
+        "version": 2,
+        "description": "Index inventory listing sort orders",
+        "statements": {
+            "mysql": [
+                "CREATE INDEX idx_inventory_category_name ON inventory (category, item_name)",
+                "CREATE INDEX idx_inventory_quantity ON inventory (quantity)",
+            ],
+            "sqlite": [
+                "CREATE INDEX IF NOT EXISTS idx_inventory_category_name ON inventory (category, item_name)",
+                "CREATE INDEX IF NOT EXISTS idx_inventory_quantity ON inventory (quantity)",
+            ],
+        },
+    },
+    {
+        # The ngram parser splits text into two-character tokens, so partial
+        # words and codes such as "14g" are found. SQLite searches go through
+        # the in-memory index in utils.search_index instead.
+        "version": 3,
+        "description": "Full-text index over item names and descriptions",
+        "statements": {
+            "mysql": [
+                "ALTER TABLE inventory ADD FULLTEXT INDEX ft_inventory_name_description (item_name, description) WITH PARSER ngram",
+            ],
+            "sqlite": [],
+        },
+    },
+    {
+        # api.inventory polls MAX(last_updated) and the rows changed since, to
+        # notice changes made by other stations.
+        "version": 4,
+        "description": "Index inventory last_updated for cache invalidation",
+        "statements": {
+            "mysql": [
+                "CREATE INDEX idx_inventory_last_updated ON inventory (last_updated)",
+            ],
+            "sqlite": [
+                "CREATE INDEX IF NOT EXISTS idx_inventory_last_updated ON inventory (last_updated)",
+            ],
+        },
+    },
+    {
+        # Tombstones of deleted items, so inventory_changes_since() can report
+        # deletions next to the rows found through last_updated.
+        "version": 5,
+        "description": "Record deleted inventory items",
+        "statements": {
+            "mysql": [
+                """CREATE TABLE IF NOT EXISTS deleted_items (
+                        item_id INT PRIMARY KEY,
+                        item_name VARCHAR(100) NOT NULL,
+                        category VARCHAR(50) NOT NULL,
+                        deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        INDEX idx_deleted_items_deleted_at (deleted_at)
+                    )""",
+            ],
+            "sqlite": [
+                f"""CREATE TABLE IF NOT EXISTS deleted_items (
+                        item_id INTEGER PRIMARY KEY,
+                        item_name VARCHAR(100) NOT NULL,
+                        category VARCHAR(50) NOT NULL,
+                        deleted_at TIMESTAMP DEFAULT ({SQLITE_NOW})
+                    )""",
+                "CREATE INDEX IF NOT EXISTS idx_deleted_items_deleted_at ON deleted_items (deleted_at)",
+            ],
+        },
+    },
+    {
+        # Append-only record of every quantity change; inventory.quantity stays
+        # the materialized total. There is no foreign key, so the history of a
+        # deleted item is kept. Existing stock is entered as opening balances.
+        "version": 6,
+        "description": "Add the stock movement ledger",
+        "statements": {
+            "mysql": [
+                """CREATE TABLE IF NOT EXISTS stock_movements (
+                        movement_id BIGINT PRIMARY KEY AUTO_INCREMENT,
+                        item_id INT NOT NULL,
+                        delta INT NOT NULL,
+                        reason VARCHAR(20) NOT NULL,
+                        username VARCHAR(50),
+                        moved_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        INDEX idx_stock_movements_item (item_id, moved_at),
+                        INDEX idx_stock_movements_moved_at (moved_at)
+                    )""",
+                "INSERT INTO stock_movements (item_id, delta, reason) SELECT item_id, quantity, 'opening' FROM inventory WHERE quantity <> 0",
+            ],
+            "sqlite": [
+                f"""CREATE TABLE IF NOT EXISTS stock_movements (
+                        movement_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        item_id INTEGER NOT NULL,
+                        delta INT NOT NULL,
+                        reason VARCHAR(20) NOT NULL,
+                        username VARCHAR(50),
+                        moved_at TIMESTAMP DEFAULT ({SQLITE_NOW})
+                    )""",
+                "CREATE INDEX IF NOT EXISTS idx_stock_movements_item ON stock_movements (item_id, moved_at)",
+                "CREATE INDEX IF NOT EXISTS idx_stock_movements_moved_at ON stock_movements (moved_at)",
+                "INSERT INTO stock_movements (item_id, delta, reason) SELECT item_id, quantity, 'opening' FROM inventory WHERE quantity <> 0",
+            ],
+        },
+    },
+    {
+        # Stock of an item split by expiration date; the lot quantities add up
+        # to inventory.quantity and inventory.expiration_date holds the earliest
+        # lot date. Existing stock becomes one lot per item. An item has at most
+        # one lot per date; the undated lot is kept unique by api.inventory, as
+        # unique indexes allow repeated NULLs.
+        "version": 7,
+        "description": "Track inventory stock in lots by expiration date",
+        "statements": {
+            "mysql": [
+                """CREATE TABLE IF NOT EXISTS inventory_lots (
+                        lot_id INT PRIMARY KEY AUTO_INCREMENT,
+                        item_id INT NOT NULL,
+                        quantity INT NOT NULL CHECK (quantity >= 0),
+                        expiration_date DATE,
+                        received_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        UNIQUE KEY uq_inventory_lots_item_expiration (item_id, expiration_date),
+                        INDEX idx_inventory_lots_expiration (expiration_date, item_id, quantity)
+                    )""",
+                "INSERT INTO inventory_lots (item_id, quantity, expiration_date) SELECT item_id, quantity, expiration_date FROM inventory WHERE quantity > 0",
+            ],
+            "sqlite": [
+                f"""CREATE TABLE IF NOT EXISTS inventory_lots (
+                        lot_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        item_id INTEGER NOT NULL,
+                        quantity INT NOT NULL CHECK (quantity >= 0),
+                        expiration_date DATE,
+                        received_at TIMESTAMP DEFAULT ({SQLITE_NOW})
+                    )""",
+                "CREATE UNIQUE INDEX IF NOT EXISTS uq_inventory_lots_item_expiration ON inventory_lots (item_id, expiration_date)",
+                "CREATE INDEX IF NOT EXISTS idx_inventory_lots_expiration ON inventory_lots (expiration_date, item_id, quantity)",
+                "INSERT INTO inventory_lots (item_id, quantity, expiration_date) SELECT item_id, quantity, expiration_date FROM inventory WHERE quantity > 0",
+            ],
+        },
+    },
+    {
+        # Stations and vehicles holding stock. Existing items belong to location
+        # 1, the main station. Item names are unique per location, so the old
+        # UNIQUE(item_name, category) index becomes a plain index still serving
+        # unscoped name sorting and lookups by name; in MySQL it is named after
+        # its first column. The location_id indexes serve the scoped listings,
+        # sorts and alerts.
+        "version": 8,
+        "description": "Partition inventory by location",
+        "statements": {
+            "mysql": [
+                """CREATE TABLE IF NOT EXISTS locations (
+                        location_id INT PRIMARY KEY AUTO_INCREMENT,
+                        location_name VARCHAR(100) UNIQUE NOT NULL,
+                        location_type VARCHAR(20) NOT NULL DEFAULT 'Station'
+                    )""",
+                "INSERT IGNORE INTO locations (location_id, location_name) VALUES (1, 'Main station')",
+                "ALTER TABLE inventory ADD COLUMN location_id INT NOT NULL DEFAULT 1",
+                "CREATE UNIQUE INDEX uq_inventory_location_name_category ON inventory (location_id, item_name, category)",
+                "CREATE INDEX idx_inventory_name_category ON inventory (item_name, category)",
+                "ALTER TABLE inventory DROP INDEX item_name",
+                "CREATE INDEX idx_inventory_location_category_name ON inventory (location_id, category, item_name)",
+                "CREATE INDEX idx_inventory_location_quantity ON inventory (location_id, quantity)",
+                "CREATE INDEX idx_inventory_location_low_stock ON inventory (location_id, min_threshold, quantity, item_name)",
+            ],
+            "sqlite": [
+                """CREATE TABLE IF NOT EXISTS locations (
+                        location_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        location_name VARCHAR(100) UNIQUE NOT NULL,
+                        location_type VARCHAR(20) NOT NULL DEFAULT 'Station'
+                    )""",
+                "INSERT OR IGNORE INTO locations (location_id, location_name) VALUES (1, 'Main station')",
+                "ALTER TABLE inventory ADD COLUMN location_id INTEGER NOT NULL DEFAULT 1",
+                "CREATE UNIQUE INDEX IF NOT EXISTS uq_inventory_location_name_category ON inventory (location_id, item_name, category)",
+                "CREATE INDEX IF NOT EXISTS idx_inventory_name_category ON inventory (item_name, category)",
+                "DROP INDEX IF EXISTS uq_inventory_item_name_category",
+                "CREATE INDEX IF NOT EXISTS idx_inventory_location_category_name ON inventory (location_id, category, item_name)",
+                "CREATE INDEX IF NOT EXISTS idx_inventory_location_quantity ON inventory (location_id, quantity)",
+                "CREATE INDEX IF NOT EXISTS idx_inventory_location_low_stock ON inventory (location_id, min_threshold, quantity, item_name)",
+            ],
+        },
+    },
+    {
+        # Counts the changes of each item, for compare-and-swap updates in
+        # api.inventory. The database bumps it on every update, whichever
+        # statement makes it, as it sets last_updated. On SQLite the update
+        # made by the last_updated trigger bumps it again, so versions must
+        # only be compared for equality.
+        "version": 9,
+        "description": "Add inventory row versions",
+        "statements": {
+            "mysql": [
+                "ALTER TABLE inventory ADD COLUMN row_version INT NOT NULL DEFAULT 1",
+                "CREATE TRIGGER IF NOT EXISTS inventory_row_version BEFORE UPDATE ON inventory FOR EACH ROW SET NEW.row_version = OLD.row_version + 1",
+            ],
+            "sqlite": [
+                "ALTER TABLE inventory ADD COLUMN row_version INTEGER NOT NULL DEFAULT 1",
+                """CREATE TRIGGER IF NOT EXISTS inventory_row_version AFTER UPDATE ON inventory
+                    FOR EACH ROW WHEN NEW.row_version = OLD.row_version
+                    BEGIN
+                        UPDATE inventory SET row_version = OLD.row_version + 1 WHERE item_id = NEW.item_id;
+                    END""",
+            ],
+        },
+    },
+    {
+        # quantity < min_threshold compares two columns, so no index can range
+        # over it and the low stock alert scanned every item. The database now
+        # keeps the comparison in a generated column, so the alert reads only
+        # the low items from the index, one location's or all of them. It
+        # replaces the covering indexes the alert scanned before.
+        "version": 10,
+        "description": "Index low stock items",
+        "statements": {
+            "mysql": [
+                "ALTER TABLE inventory ADD COLUMN low_stock TINYINT AS (min_threshold IS NOT NULL AND quantity < min_threshold) VIRTUAL",
+                "CREATE INDEX idx_inventory_low_stock_location ON inventory (low_stock, location_id, quantity, item_name, min_threshold)",
+                "ALTER TABLE inventory DROP INDEX idx_inventory_low_stock",
+                "ALTER TABLE inventory DROP INDEX idx_inventory_location_low_stock",
+            ],
+            "sqlite": [
+                "ALTER TABLE inventory ADD COLUMN low_stock INTEGER GENERATED ALWAYS AS (min_threshold IS NOT NULL AND quantity < min_threshold) VIRTUAL",
+                "CREATE INDEX IF NOT EXISTS idx_inventory_low_stock_location ON inventory (low_stock, location_id, quantity, item_name, min_threshold)",
+                "DROP INDEX IF EXISTS idx_inventory_low_stock",
+                "DROP INDEX IF EXISTS idx_inventory_location_low_stock",
+            ],
+        },
+    },
+]
+
+
+class MigrationError(Exception):
+    """Raised when the recorded schema history does not match MIGRATIONS."""
+
+
+def checksum(statements):
+    """Returns the SHA-256 checksum of a migration's statements.
+
+    Args:
+        statements (list): The SQL statements of the migration for one backend.
+
+    Returns:
+        str: The hexadecimal checksum.
+    """
+
+    return hashlib.sha256("\n;\n".join(statements).encode("utf-8")).hexdigest()
+
+
+def applied_migrations(cursor):
+    """Returns the recorded migrations as a dictionary of version to checksum."""
+
+    cursor.execute("SELECT version, checksum FROM schema_version")
+
+    return {version: recorded for version, recorded in cursor.fetchall()}
+
+
+def _run_statement(cursor, statement):
+    try:
+        cursor.execute(statement)
+    except Error as err:
+        if err.errno not in IGNORED_ERRNOS:
+            raise
+
+        logger.warning(f"Skipping statement of a partially applied migration: {err}")
+
+
+def migrate(backend):
+    """Applies every migration that has not been applied to the database yet.
+
+    Args:
+        backend (DatabaseBackend): The backend whose database is migrated.
+
+    Returns:
+        list: The versions applied by this call, in order.
+
+    Raises:
+        MigrationError: If an applied migration was changed after it ran.
+        Error: If a migration statement fails.
+    """
+
+    applied = []
+
+    with backend.get_connection() as connection:
+        with connection.cursor() as cursor:
+            if backend.name == "mysql":
+                cursor.execute(
+                    "SELECT GET_LOCK(%s, %s)",
+                    [MIGRATION_LOCK_NAME, MIGRATION_LOCK_TIMEOUT],
+                )
+
+                if cursor.fetchall()[0][0] != 1:
+                    raise MigrationError("Timed out waiting for the migration lock")
+
+            try:
+                cursor.execute(SCHEMA_VERSION_TABLE[backend.name])
+                recorded = applied_migrations(cursor)
+
+                for migration in MIGRATIONS:
+                    version = migration["version"]
+                    statements = migration["statements"][backend.name]
+                    expected = checksum(statements)
+
+                    if version in recorded:
+                        if recorded[version] != expected:
+                            raise MigrationError(
+                                f"Migration {version} was modified after it was applied"
+                            )
+
+                        continue
+
+                    logger.info(
+                        f"Applying migration {version}: {migration['description']}"
+                    )
+
+                    # sqlite3 would run the DDL in autocommit mode, so an
+                    # interrupted step could keep an added column without being
+                    # recorded, and fail with "duplicate column" when re-run.
+                    backend.begin(connection)
+
+                    for statement in statements:
+                        _run_statement(cursor, statement)
+
+                    cursor.execute(
+                        "INSERT INTO schema_version (version, description, checksum) VALUES (%s, %s, %s)",
+                        [version, migration["description"], expected],
+                    )
+                    connection.commit()
+                    applied.append(version)
+
+                unknown = set(recorded) - {m["version"] for m in MIGRATIONS}
+
+                if unknown:
+                    logger.warning(
+                        f"Database has migrations unknown to this version: {sorted(unknown)}"
+                    )
+            except BaseException:
+                connection.rollback()
+                raise
+            finally:
+                if backend.name == "mysql":
+                    cursor.execute("SELECT RELEASE_LOCK(%s)", [MIGRATION_LOCK_NAME])
+                    cursor.fetchall()
+
+    if applied:
+        logger.info(f"Applied schema migrations: {applied}")
+
+    return applied
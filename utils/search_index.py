@@ -0,0 +1,214 @@
+"""
+Module for the in-memory inventory search index.
+
+Provides a small inverted index over item names and descriptions, used for
+relevance-ranked search where the database has no full-text index (the SQLite
+backend). Every word of a query must match the start of a word in the item's
+name or description; matches in the name rank higher, and rare words weigh more
+than common ones.
+"""
+
+import bisect
+import heapq
+import math
+import re
+import threading
+
+# Letters and digits form words, so "14g" and "IV-14g" both index "14g".
+WORD = re.compile(r"[^\W_]+")
+
+# Query words shorter than this are ignored, as by the MySQL ngram parser.
+MIN_TERM_LENGTH = 2
+
+# A word found in the item name counts this much more than one in the description.
+NAME_WEIGHT = 3.0
+
+
+def tokenize(text):
+    """Splits text into lowercase words.
+
+    Args:
+        text (str): The text to split; None is treated as empty.
+
+    Returns:
+        list: The words of the text, in order.
+    """
+
+    return WORD.findall(text.lower()) if text else []
+
+
+def query_terms(query):
+    """Returns the distinct search words of a query, ignoring very short ones."""
+
+    return list(dict.fromkeys(t for t in tokenize(query) if len(t) >= MIN_TERM_LENGTH))
+
+
+class SearchIndex:
+    """Inverted index mapping words to the items that contain them.
+
+    The index is safe to use from several threads. Items are added or replaced
+    with add(), removed with remove(), and ranked by search().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # word -> {item_id: weight}
+        self._postings = {}
+        # item_id -> set of words, to remove an item's postings when it changes.
+        self._documents = {}
+        # item_id -> (category, location_id), for filtered searches.
+        self._filters = {}
+        # Sorted vocabulary for prefix lookups; rebuilt lazily after changes.
+        self._vocabulary = None
+
+    def __len__(self):
+        return len(self._documents)
+
+    def clear(self):
+        """Removes every item from the index."""
+
+        with self._lock:
+            self._postings.clear()
+            self._documents.clear()
+            self._filters.clear()
+            self._vocabulary = None
+
+    def add(self, item_id, name, description, category=None, location_id=None):
+        """Indexes an item, replacing any earlier version of it.
+
+        Args:
+            item_id (int): The ID of the item.
+            name (str): The item name.
+            description (str): The item description, or None.
+            category (str, optional): The item category, for filtered searches.
+            location_id (int, optional): The item location, for filtered searches.
+        """
+
+        weights = {}
+
+        for word in tokenize(description):
+            weights[word] = weights.get(word, 0.0) + 1.0
+
+        for word in tokenize(name):
+            weights[word] = weights.get(word, 0.0) + NAME_WEIGHT
+
+        with self._lock:
+            self._remove(item_id)
+
+            for word, weight in weights.items():
+                postings = self._postings.get(word)
+
+                if postings is None:
+                    postings = self._postings[word] = {}
+                    self._vocabulary = None
+
+                postings[item_id] = weight
+
+            self._documents[item_id] = set(weights)
+            self._filters[item_id] = (category, location_id)
+
+    def remove(self, item_id):
+        """Removes an item from the index if it is indexed."""
+
+        with self._lock:
+            self._remove(item_id)
+
+    def _remove(self, item_id):
+        self._filters.pop(item_id, None)
+
+        for word in self._documents.pop(item_id, ()):
+            postings = self._postings[word]
+            del postings[item_id]
+
+            if not postings:
+                del self._postings[word]
+                self._vocabulary = None
+
+    def _matching_words(self, term):
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+
+        start = bisect.bisect_left(self._vocabulary, term)
+        end = bisect.bisect_left(self._vocabulary, term + "\U0010ffff")
+
+        return self._vocabulary[start:end]
+
+    @staticmethod
+    def _idf(postings, total):
+        return math.log(1.0 + total / len(postings))
+
+    def search(self, query, limit, category=None, location_id=None):
+        """Finds the items matching every word of a query, best first.
+
+        Args:
+            query (str): The search text.
+            limit (int): Maximum number of results.
+            category (str, optional): Only return items of this category.
+            location_id (int, optional): Only return items of this location.
+
+        Returns:
+            list: (item_id, score) pairs ordered by descending score, then item_id.
+        """
+
+        terms = query_terms(query)
+
+        if not terms:
+            return []
+
+        with self._lock:
+            total = len(self._documents)
+            matches = []
+
+            for term in terms:
+                postings = [self._postings[word] for word in self._matching_words(term)]
+
+                if not postings:
+                    return []
+
+                matches.append(
+                    (
+                        sum(len(p) for p in postings),
+                        [(p, self._idf(p, total)) for p in postings],
+                    )
+                )
+
+            # The rarest term goes first, so the others only check its matches.
+            matches.sort(key=lambda match: match[0])
+            scores = {}
+
+            for postings, idf in matches[0][1]:
+                for item_id, weight in postings.items():
+                    item_category, item_location_id = self._filters[item_id]
+
+                    if category is not None and item_category != category:
+                        continue
+
+                    if location_id is not None and item_location_id != location_id:
+                        continue
+
+                    if weight * idf > scores.get(item_id, 0.0):
+                        scores[item_id] = weight * idf
+
+            for _, term_postings in matches[1:]:
+                narrowed = {}
+
+                for item_id, score in scores.items():
+                    best = 0.0
+
+                    for postings, idf in term_postings:
+                        weight = postings.get(item_id)
+
+                        if weight is not None and weight * idf > best:
+                            best = weight * idf
+
+                    if best:
+                        narrowed[item_id] = score + best
+
+                scores = narrowed
+
+                if not scores:
+                    return []
+
+        return heapq.nsmallest(
+            limit, scores.items(), key=lambda entry: (-entry[1], entry[0])
+        )
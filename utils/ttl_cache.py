@@ -0,0 +1,136 @@
+"""
+Module for a size-bounded in-process cache.
+
+Provides an LRU cache whose entries also expire after a time-to-live, with hit,
+miss and eviction counters and an estimate of the memory held by the cached
+values. Used by api.inventory to avoid re-reading unchanged items.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+def estimate_size(value):
+    """Roughly estimates the memory held by a cached value, in bytes.
+
+    Counts the value itself plus one level of contents: the elements of lists
+    and tuples, and the fields of rows with __slots__ (such as db_rows.Row).
+    """
+
+    size = sys.getsizeof(value)
+
+    if isinstance(value, (list, tuple)):
+        return size + sum(estimate_size(element) for element in value)
+
+    for name in getattr(type(value), "__slots__", ()):
+        size += sys.getsizeof(getattr(value, name, None))
+
+    return size
+
+
+class TTLCache:
+    """Least-recently-used cache with a maximum size and per-entry expiry.
+
+    Safe to use from several threads. Cached values are shared between callers
+    and must be treated as read-only.
+
+    Args:
+        max_entries (int): Entries kept before the least recently used is evicted.
+        ttl (float): Seconds an entry stays valid after it was stored.
+    """
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # key -> (expires_at, size, value), least recently used first.
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key):
+        """Returns the cached value for key, or None if it is missing or expired."""
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self._misses += 1
+                return None
+
+            if entry[0] <= time.monotonic():
+                self._discard(key)
+                self._expirations += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+
+            return entry[2]
+
+    def put(self, key, value):
+        """Stores a value, evicting the least recently used entries if full."""
+
+        size = estimate_size(value)
+
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (time.monotonic() + self.ttl, size, value)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+                self._evictions += 1
+
+    def invalidate(self, key):
+        """Removes the entry for key if it is cached."""
+
+        with self._lock:
+            self._discard(key)
+
+    def clear(self):
+        """Removes every entry; the counters are kept."""
+
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def stats(self):
+        """Returns the cache counters.
+
+        Returns:
+            dict: entries, max_entries, bytes (estimated), hits, misses,
+                  hit_rate, evictions and expirations.
+        """
+
+        with self._lock:
+            lookups = self._hits + self._misses
+
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
+
+    def reset_stats(self):
+        """Resets the hit, miss, eviction and expiration counters."""
+
+        with self._lock:
+            self._hits = self._misses = self._evictions = self._expirations = 0